@@ -4,12 +4,12 @@
 build.py — Starsector 한글화 단일 진입점 CLI
 
 사용법:
-    python build.py <pipeline> [pipeline2 ...] [--no-restore]
+    python build.py <pipeline> [pipeline2 ...] [--no-restore] [--version X]
 
 파이프라인 목록 (config.json에 정의):
     patch       — 양쪽 JAR 재패치 (output/ 에 생성)
     apply       — starsector-core + mod 적용
-    restore     — 영어 원본 복원 (.bak 사용)
+    restore     — 영어 원본 복원 (백업 저장소 backups/, 스냅샷 없으면 .bak)
     verify      — spot-check 검증
     status      — 현재 적용 상태 확인
     update_mod  — mod 파일만 갱신 (JAR 재패치 없이)
@@ -18,8 +18,10 @@ build.py — Starsector 한글화 단일 진입점 CLI
     rebuild     — restore → patch → apply → verify
 
 옵션:
-    --no-restore    패치/빌드 전 .bak 복원 단계를 건너뜀.
-                    기본값: .bak가 있으면 복원 후 패치/빌드.
+    --no-restore    패치/빌드 전 원본 복원 단계를 건너뜀.
+                    기본값: 원본(백업 저장소 또는 .bak)이 있으면 복원 후 패치/빌드.
+    --version X     restore 에서 복원할 원본 스냅샷 (기본: 현재 스냅샷).
+                    복원한 스냅샷이 이후 patch/build_mod 의 원본이 됨.
 
 예시:
     python build.py all
@@ -28,6 +30,7 @@ build.py — Starsector 한글화 단일 진입점 CLI
     python build.py update_mod --no-restore
     python build.py rebuild
     python build.py restore
+    python build.py restore --version 0.97a-RC11
     python build.py verify
 """
 
@@ -41,6 +44,9 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 
+sys.path.insert(0, str(SCRIPT_DIR / "scripts"))
+from patch_utils import install_file, restore_file  # noqa: E402
+
 
 def _abs(paths_dict, base_dir):
     """상대경로 값을 절대경로로 변환. 절대경로는 그대로 유지."""
@@ -89,10 +95,29 @@ def run_command(cmd_list, paths):
 
 
 def do_copy(src, dst, paths):
+    """
+    src → dst 트랜잭션 설치: dst.kr_new 에 복사·fsync 후 rename 으로 교체,
+    이전 dst 는 dst.kr_prev 로 보존 (restore 시 원본과 같으면 rename 으로 복원).
+    """
     src = resolve(src, paths)
     dst = resolve(dst, paths)
-    print(f"  [copy] {src} → {dst}")
-    shutil.copy2(src, dst)
+    if install_file(src, dst):
+        print(f"  [copy] {src} → {dst}")
+    else:
+        print(f"  [copy] {dst} 이미 일치 (skip)")
+
+
+def do_restore(src, dst, paths):
+    """
+    src(원본) → dst 복원. 이미 일치하면(크기+mtime 또는 JAR 중앙 디렉토리) 복사 생략,
+    dst.kr_prev(직전 copy 이전 상태)가 원본과 같으면 복사 없이 rename.
+    """
+    src = resolve(src, paths)
+    dst = resolve(dst, paths)
+    if restore_file(src, dst):
+        print(f"  [restore] {src} → {dst}")
+    else:
+        print(f"  [restore] {dst} 이미 일치 (skip)")
 
 
 def do_sync(src_dir, dst_dir, paths):
@@ -122,6 +147,8 @@ def execute_step(step, paths, python_cmd):
         run_command(step["command"], paths)
     elif "copy" in step:
         do_copy(step["copy"], step["to"], paths)
+    elif "restore" in step:
+        do_restore(step["restore"], step["to"], paths)
     elif "sync" in step:
         do_sync(step["sync"], step["to"], paths)
     else:
@@ -166,6 +193,14 @@ def main():
 
     raw_args = sys.argv[1:]
     no_restore = '--no-restore' in raw_args
+    backup_version = None
+    if '--version' in raw_args:
+        i = raw_args.index('--version')
+        if i + 1 >= len(raw_args):
+            print("--version 값이 필요합니다.", file=sys.stderr)
+            sys.exit(1)
+        backup_version = raw_args[i + 1]
+        del raw_args[i:i + 2]
     pipelines_to_run = [a for a in raw_args if not a.startswith('--')]
 
     if not pipelines_to_run:
@@ -174,6 +209,8 @@ def main():
 
     if no_restore:
         os.environ['STARSECTOR_NO_RESTORE'] = '1'
+    if backup_version:
+        os.environ['STARSECTOR_BACKUP_VERSION'] = backup_version
 
     config = load_config()
 
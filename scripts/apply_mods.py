@@ -2,18 +2,259 @@
 """
 apply_mods.py - output/mods/ → game/mods/ 복사 (활성화된 모드만)
 
-적용 전 .bak 백업 (game_mods/{id}.bak/ 이미 있으면 skip).
+적용 전 원본 백업: 백업 저장소(backup_store.py) CURRENT 스냅샷에 mods/{id} 가 없으면
+현재 게임 모드 폴더를 원본으로 기록 (최초 1회, 기존 game_mods/{id}.bak/ 이 있으면 그쪽을 기록).
+
+차등 적용: game_mods/{id}/.kr_manifest.json 에 지난 적용 결과(파일별 해시·크기·mtime)를
+기록해 두고, 바뀐 파일만 복사하고 더 이상 생성되지 않는 파일은 삭제함.
+  - output 파일이 게임 파일과 같은 inode(하드링크 스테이징)면 복사 생략
+  - output 파일 stat 이 기록과 같거나, 해시가 기록과 같으면 복사 생략
+    (단, 게임 쪽 파일 stat 이 기록과 다르면 — 원본 복원 등 — 다시 복사)
+  - manifest 에 있었지만 이번 output 에 없는 파일만 삭제 (모드가 만든 다른 파일은 유지)
+
+트랜잭션 적용: 새 트리를 game_mods/{id}.kr_new/ 에 만들고 (바뀌지 않은 파일은 현재
+트리에서 하드링크, 바뀐 파일만 복사 + fsync) rename 으로 교체. 직전 트리는
+game_mods/{id}.kr_prev/ 로 남아 --rollback 으로 즉시 되돌릴 수 있음.
+중단된 적용은 다음 실행 시 자동 복구.
+
+옵션:
+  --rollback   game_mods/{id} ↔ game_mods/{id}.kr_prev 교환 (직전 적용 취소)
+  --in-place   스테이징 없이 제자리 차등 동기화 (디스크 여유가 없을 때)
 """
 
+import argparse
+import hashlib
+import json
+import os
 import shutil
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from patch_utils import load_config, resolve_path
+from backup_store import BackupStore, game_version
+from patch_utils import (NEW_SUFFIX, PREV_SUFFIX, copy_private, fsync_dir, fsync_file,
+                         load_config, resolve_path)
+
+
+MANIFEST_NAME = '.kr_manifest.json'
+_MANIFEST_VERSION = 1
+
+
+def _link_or_copy(src, dst) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _file_sha1(path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(mod_dir: Path) -> dict:
+    """
+    상대경로 → {sha1, size, src_mtime, dst_mtime}. 없거나 형식이 다르면 빈 dict.
+    sha1 이 None 이면 적용 당시 하드링크(같은 파일)였던 항목.
+    """
+    try:
+        with open(mod_dir / MANIFEST_NAME, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != _MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(mod_dir: Path, files: dict) -> None:
+    tmp = mod_dir / (MANIFEST_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': _MANIFEST_VERSION, 'files': files}, f, ensure_ascii=False)
+    os.replace(tmp, mod_dir / MANIFEST_NAME)
+
+
+def _unchanged(s_path: Path, s_stat, d_path: Path, d_stat, entry) -> tuple:
+    """
+    게임 쪽 파일(d_path)이 이번 output 파일(s_path)과 같은지 판정.
+    반환: (같음 여부, output 파일 sha1 — 계산하지 않았으면 None)
+    """
+    if d_stat is None:
+        return False, None
+    if os.path.samestat(s_stat, d_stat):
+        return True, None  # 하드링크 스테이징 — 같은 파일
+    if (entry and entry['sha1']
+            and entry['size'] == s_stat.st_size == d_stat.st_size
+            and entry['dst_mtime'] == d_stat.st_mtime_ns):
+        # 게임 쪽 파일은 지난 적용 그대로 — output 쪽만 확인
+        if entry['src_mtime'] == s_stat.st_mtime_ns:
+            return True, entry['sha1']
+        digest = _file_sha1(s_path)
+        return digest == entry['sha1'], digest
+    if not entry and d_stat.st_size == s_stat.st_size:
+        # manifest 없는 첫 적용: 내용 비교
+        digest = _file_sha1(s_path)
+        return digest == _file_sha1(d_path), digest
+    return False, None
+
+
+def sync_mod_dir(src: Path, dst: Path, stage: Path = None) -> dict:
+    """
+    src(output/mods/{id}) → dst(game_mods/{id}) 차등 동기화.
+
+    stage=None: dst 를 제자리에서 갱신 (바뀐 파일만 임시 파일 + os.replace)
+    stage 지정: dst 는 건드리지 않고 stage 에 새 트리를 만듦 — 바뀌지 않은 파일과
+                모드가 만든 기타 파일은 dst 에서 하드링크, 바뀐 파일만 복사 후 fsync.
+                교체는 호출자가 _swap_in 으로 수행.
+    반환: {'copied', 'bytes', 'skipped', 'deleted'}
+    """
+    old = load_manifest(dst)
+    new = {}
+    stats = {'copied': 0, 'bytes': 0, 'skipped': 0, 'deleted': 0}
+    out = stage or dst
+
+    for root, _dirs, files in os.walk(src):
+        rel_dir = Path(root).relative_to(src)
+        (out / rel_dir).mkdir(parents=True, exist_ok=True)
+        for fname in files:
+            s_path = Path(root) / fname
+            d_path = dst / rel_dir / fname
+            o_path = out / rel_dir / fname
+            rel = (rel_dir / fname).as_posix()
+            s_stat = s_path.stat()
+            try:
+                d_stat = d_path.stat()
+            except FileNotFoundError:
+                d_stat = None
+
+            same, digest = _unchanged(s_path, s_stat, d_path, d_stat, old.get(rel))
+            if same:
+                stats['skipped'] += 1
+                if stage is not None:
+                    _link_or_copy(d_path, o_path)
+            else:
+                if stage is not None:
+                    shutil.copy2(s_path, o_path)
+                    fsync_file(o_path)
+                else:
+                    copy_private(s_path, o_path)
+                stats['copied'] += 1
+                stats['bytes'] += s_stat.st_size
+            o_stat = o_path.stat()
+            if digest is None and not os.path.samestat(s_stat, o_stat):
+                digest = _file_sha1(s_path)
+            new[rel] = {
+                'sha1': digest, 'size': s_stat.st_size,
+                'src_mtime': s_stat.st_mtime_ns, 'dst_mtime': o_stat.st_mtime_ns,
+            }
+
+    # 지난번에 적용했지만 이번 output 에 없는 파일 삭제 (스테이징이면 옮기지 않음)
+    removed = old.keys() - new.keys()
+    if stage is None:
+        for rel in removed:
+            try:
+                (dst / rel).unlink()
+                stats['deleted'] += 1
+            except FileNotFoundError:
+                pass
+    elif dst.is_dir():
+        stats['deleted'] = sum(1 for rel in removed if (dst / rel).exists())
+        # manifest 에도 output 에도 없는 파일 (모드가 실행 중 만든 파일 등) 은 유지
+        for root, _dirs, files in os.walk(dst):
+            rel_dir = Path(root).relative_to(dst)
+            for fname in files:
+                rel = (rel_dir / fname).as_posix()
+                if rel in new or rel in removed or rel == MANIFEST_NAME:
+                    continue
+                (stage / rel_dir).mkdir(parents=True, exist_ok=True)
+                _link_or_copy(Path(root) / fname, stage / rel_dir / fname)
+
+    save_manifest(out, new)
+    if stage is not None:
+        fsync_file(out / MANIFEST_NAME)
+    return stats
+
+
+def _mod_paths(dst: Path) -> tuple:
+    """(스테이징 경로, 이전 트리 경로) — dst 옆 형제 디렉토리."""
+    return dst.with_name(dst.name + NEW_SUFFIX), dst.with_name(dst.name + PREV_SUFFIX)
+
+
+def _swap_in(stage: Path, dst: Path, prev: Path) -> None:
+    """stage → dst 교체, 기존 dst 는 prev 로 보존 (rename 2회, 실패 시 되돌림)."""
+    if prev.exists():
+        shutil.rmtree(prev)
+    if dst.exists():
+        os.rename(dst, prev)
+    try:
+        os.rename(stage, dst)
+    except OSError:
+        if prev.exists() and not dst.exists():
+            os.rename(prev, dst)
+        raise
+    fsync_dir(dst.parent)
+
+
+def recover_mod_dir(dst: Path) -> None:
+    """
+    이전 적용이 두 rename 사이에서 중단된 경우 복구.
+    dst 가 없으면: manifest 까지 기록된 스테이징 → dst, 아니면 prev → dst.
+    남은 스테이징은 삭제.
+    """
+    stage, prev = _mod_paths(dst)
+    if not dst.exists():
+        if (stage / MANIFEST_NAME).exists():
+            os.rename(stage, dst)
+            print(f"  복구: 중단된 적용 완료 ({stage.name} → {dst.name})")
+        elif prev.exists():
+            os.rename(prev, dst)
+            print(f"  복구: 이전 트리 복원 ({prev.name} → {dst.name})")
+    if stage.exists():
+        shutil.rmtree(stage)
+
+
+def rollback_mod_dir(dst: Path) -> bool:
+    """dst ↔ dst.kr_prev 교환 (직전 적용 취소). prev 가 없으면 False."""
+    _stage, prev = _mod_paths(dst)
+    if not prev.is_dir():
+        return False
+    tmp = dst.with_name(dst.name + '.kr_swap')
+    os.rename(dst, tmp)
+    os.rename(prev, dst)
+    os.rename(tmp, prev)
+    fsync_dir(dst.parent)
+    return True
+
+
+def apply_mod(src: Path, dst: Path, transactional: bool = True) -> dict:
+    """
+    트랜잭션 적용: 형제 디렉토리에 새 트리를 만들고 rename 으로 교체.
+    디렉토리 rename 이 불가능하면 (Windows 에서 게임이 파일을 잡고 있는 경우 등)
+    제자리 차등 동기화로 대체.
+    """
+    recover_mod_dir(dst)
+    if not transactional or not dst.is_dir():
+        return sync_mod_dir(src, dst)
+    stage, prev = _mod_paths(dst)
+    stats = sync_mod_dir(src, dst, stage=stage)
+    try:
+        _swap_in(stage, dst, prev)
+    except OSError as e:
+        print(f"  WARN: 디렉토리 교체 실패 ({e}) — 제자리 적용으로 대체")
+        shutil.rmtree(stage, ignore_errors=True)
+        return sync_mod_dir(src, dst)
+    return stats
 
 
 def main():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--rollback', action='store_true')
+    parser.add_argument('--in-place', action='store_true')
+    args, _ = parser.parse_known_args()
+
     cfg = load_config()
     paths = cfg['paths']
     game_mods = Path(resolve_path(paths['game_mods']))
@@ -21,7 +262,10 @@ def main():
     mods = cfg.get('mods', [])
 
     enabled = [m for m in mods if m.get('enabled', True)]
-    print(f"적용 대상 모드: {[m['id'] for m in enabled]}")
+    print(f"{'롤백' if args.rollback else '적용'} 대상 모드: {[m['id'] for m in enabled]}")
+    store = BackupStore.from_paths(paths)
+    current = store.current()
+    backed_up = set(store.load_snapshot(current)['items']) if current else set()
 
     for mod_cfg in enabled:
         mod_id = mod_cfg['id']
@@ -31,22 +275,40 @@ def main():
 
         print(f"\n[{mod_id}]")
 
+        if args.rollback:
+            recover_mod_dir(dst)
+            if rollback_mod_dir(dst):
+                print(f"  롤백: {dst.name} ↔ {dst.name}{PREV_SUFFIX}")
+            else:
+                print(f"  롤백 불가: {dst.name}{PREV_SUFFIX} 없음")
+            continue
+
         if not src.is_dir():
             print(f"  WARN: output/{mod_id} 없음 — 건너뜀")
             continue
 
-        # 백업 (최초 1회)
-        if dst.is_dir() and not bak.exists():
-            shutil.copytree(str(dst), str(bak))
-            print(f"  백업: {dst} → {bak}")
-        elif bak.exists():
-            print(f"  백업 이미 존재: {bak} (skip)")
+        # 원본 백업 (최초 1회): 저장소에 없으면 .bak 또는 현재 게임 폴더를 기록
+        key = f'mods/{mod_id}'
+        if key in backed_up:
+            print(f"  원본 백업 이미 존재: {current} (skip)")
+        elif bak.is_dir() or (dst.is_dir() and not (dst / MANIFEST_NAME).exists()):
+            origin = bak if bak.is_dir() else dst
+            current, _, new_bytes = store.snapshot({key: origin},
+                                                   current or game_version(paths))
+            backed_up.add(key)
+            print(f"  원본 백업: {origin} → 저장소 {current} "
+                  f"(새 청크 {new_bytes / 1048576:.1f} MB)")
+        elif dst.is_dir():
+            print(f"  WARN: 원본 백업 없음 — {dst} 는 이미 패치 적용 상태 "
+                  f"(영어 원본 설치 후 backup_store.py snapshot 실행)")
 
-        # 적용 (덮어쓰기, dirs_exist_ok=True로 Windows 파일 잠금 방지)
-        shutil.copytree(str(src), str(dst), dirs_exist_ok=True)
+        # 차등 + 트랜잭션 적용
+        stats = apply_mod(src, dst, transactional=not args.in_place)
         print(f"  적용: {src} → {dst}")
+        print(f"    복사 {stats['copied']}개 ({stats['bytes'] / 1048576:.1f} MB), "
+              f"변경 없음 {stats['skipped']}개, 삭제 {stats['deleted']}개")
 
-    print("\napply_mods 완료.")
+    print("\napply_mods 롤백 완료." if args.rollback else "\napply_mods 완료.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+backup_store.py - 내용 주소(content-addressed) 원본 백업 저장소 (.bak 대체)
+
+게임 JAR(starfarer.api.jar, starfarer_obf.jar)과 모드 디렉토리의 영어 원본을
+버전별 스냅샷으로 보관. 파일은 내용 해시(sha256)로 나눈 zlib 압축 청크로 저장하고,
+JAR(ZIP)은 엔트리별 압축 데이터 청크 + 나머지 바이트(로컬 헤더·중앙 디렉토리) 골격
+청크로 쪼개 저장하므로 게임/모드 업데이트 사이에 바뀌지 않은 클래스·리소스는 한 번만
+저장되고, 실체화 결과는 원본과 바이트 단위로 같음 (전체 sha256 으로 검증).
+
+저장소 구조 (config.json paths.backups, 기본 ./backups):
+    objects/ab/cdef…          청크 (zlib, 이름 = 원본 바이트 sha256)
+    snapshots/{버전}.json     스냅샷: 항목 키 → 파일/ZIP/디렉토리 기록
+    CURRENT                   현재 원본으로 쓰는 스냅샷 이름
+    work/{버전}/{항목 키}     패치 스크립트용 실체화 캐시 (삭제해도 다시 생성)
+
+항목 키:
+    core/starfarer.api.jar, core/starfarer_obf.jar     게임 JAR
+    mods/{id}                                          모드 디렉토리 (내부 JAR 도 엔트리 단위)
+
+사용법:
+    python scripts/backup_store.py snapshot [--version X] [--from-bak] [--force]
+    python scripts/backup_store.py list
+    python scripts/backup_store.py prune
+    python scripts/backup_store.py restore [--version X] [--mods]
+
+    snapshot   현재 게임 원본(영어)을 스냅샷으로 기록 — 게임/모드 업데이트 직후 실행.
+               --from-bak: 기존 *.bak 파일/디렉토리에서 가져옴 (이전 방식 마이그레이션)
+               버전 이름 기본값: starfarer_obf.jar 의 게임 버전
+    restore    스냅샷(기본: CURRENT, build.py --version X 로도 지정)을 게임 폴더에 복원하고
+               CURRENT 로 지정. 스냅샷이 없으면 기존 .bak 으로 복원.
+               기본은 게임 JAR 만. --mods: 모드 디렉토리도 스냅샷 트리로 교체 (형제 디렉토리에
+               만든 뒤 rename — 스냅샷에 없는 파일은 남지 않음)
+    prune      CURRENT 외 버전의 work/ 실체화 캐시 삭제 (스냅샷·청크는 그대로)
+
+공개 API:
+    BackupStore(root)
+    BackupStore.from_paths(paths) -> BackupStore
+    original_path(paths, key) -> Optional[Path]   CURRENT 원본 실체화 경로 (없으면 None)
+    game_version(paths) -> str                    게임 폴더 starfarer_obf.jar 의 버전
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import struct
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from loose_json import LooseJSONError, load as load_loose_json
+from patch_utils import (PREV_SUFFIX, files_match, load_config, resolve_path, restore_file,
+                         stage_tree, write_bytes_private)
+
+CORE_JARS = ('starfarer.api.jar', 'starfarer_obf.jar')
+MANIFEST_NAME = '.kr_manifest.json'   # apply_mods 가 게임 모드 폴더에 남기는 적용 기록
+_SKIP_SUFFIXES = ('.kr_tmp', '.kr_new', '.kr_prev', '.kr_swap')
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _is_zip_name(name: str) -> bool:
+    return name.lower().endswith(('.jar', '.zip'))
+
+
+class BackupStore:
+    """
+    원본 백업 저장소. 스냅샷 항목 기록 형식:
+        {"type": "file", "sha": …, "size": …, "mtime_ns": …}
+        {"type": "zip",  "sha": 전체 파일 sha, "size": …, "mtime_ns": …, "skeleton": 골격 청크 sha,
+         "layout": [[골격 바이트 수, 엔트리 압축 데이터 청크 sha], …, [골격 바이트 수, null]],
+         "central": [[이름, crc, 원본 크기], …]}
+        (이전 형식 zip 기록 {"comment": …, "entries": [[이름, sha, crc, …], …]} 도 읽기는 지원)
+        {"type": "tree", "files": {상대경로(posix): file/zip 기록, …}}
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects = self.root / 'objects'
+        self.snapshots = self.root / 'snapshots'
+        self.work = self.root / 'work'
+        self._new_objects = 0
+        self._new_bytes = 0
+
+    @classmethod
+    def from_paths(cls, paths: dict) -> 'BackupStore':
+        return cls(resolve_path(paths.get('backups', './backups')))
+
+    # ── 청크 ────────────────────────────────────────────────────────────────
+
+    def _object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha[2:]
+
+    def put(self, data: bytes) -> str:
+        """청크 저장 (이미 있으면 생략). 반환: sha256"""
+        sha = _sha256(data)
+        path = self._object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            packed = zlib.compress(data, 6)
+            tmp = path.with_name(path.name + '.kr_tmp')
+            tmp.write_bytes(packed)
+            os.replace(tmp, path)
+            self._new_objects += 1
+            self._new_bytes += len(packed)
+        return sha
+
+    def get(self, sha: str) -> bytes:
+        data = zlib.decompress(self._object_path(sha).read_bytes())
+        if _sha256(data) != sha:
+            raise ValueError(f"손상된 청크: {sha}")
+        return data
+
+    # ── 스냅샷 ──────────────────────────────────────────────────────────────
+
+    def versions(self) -> list:
+        if not self.snapshots.is_dir():
+            return []
+        return sorted((p.stem for p in self.snapshots.glob('*.json')),
+                      key=lambda v: (self.snapshots / f'{v}.json').stat().st_mtime_ns)
+
+    def current(self) -> Optional[str]:
+        try:
+            name = (self.root / 'CURRENT').read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            return None
+        return name if (self.snapshots / f'{name}.json').exists() else None
+
+    def set_current(self, version: str) -> None:
+        write_bytes_private(self.root / 'CURRENT', (version + '\n').encode('utf-8'))
+
+    def load_snapshot(self, version: str) -> dict:
+        path = self.snapshots / f'{version}.json'
+        if not path.exists():
+            raise FileNotFoundError(f"스냅샷 없음: {version} (있는 버전: {self.versions()})")
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_snapshot(self, snap: dict) -> None:
+        self.snapshots.mkdir(parents=True, exist_ok=True)
+        write_bytes_private(self.snapshots / f"{snap['version']}.json",
+                            json.dumps(snap, ensure_ascii=False).encode('utf-8'))
+
+    # ── 기록 ────────────────────────────────────────────────────────────────
+
+    def _record_zip(self, data: bytes) -> Optional[dict]:
+        """
+        ZIP 바이트 → zip 기록. 엔트리별 압축 데이터 구간을 잘라 청크로 저장하고, 그 사이
+        바이트(로컬 헤더·데이터 디스크립터·중앙 디렉토리 …)는 이어 붙여 골격 청크 1개로 저장.
+        로컬 헤더가 중앙 디렉토리와 맞지 않는 등 구간을 나눌 수 없으면 None (통째로 기록).
+        """
+        try:
+            with zipfile.ZipFile(io.BytesIO(data), 'r') as zf:
+                infos = zf.infolist()
+        except zipfile.BadZipFile:
+            return None
+        spans, pos = [], 0
+        for info in sorted(infos, key=lambda i: i.header_offset):
+            off = info.header_offset
+            if off < pos or data[off:off + 4] != b'PK\x03\x04':
+                return None
+            name_len, extra_len = struct.unpack_from('<HH', data, off + 26)
+            start = off + 30 + name_len + extra_len
+            end = start + info.compress_size
+            if end > len(data):
+                return None
+            spans.append((pos, start, end))
+            pos = end
+        skeleton = [data[lo:start] for lo, start, _end in spans] + [data[pos:]]
+        layout = [[start - lo, self.put(data[start:end])] for lo, start, end in spans]
+        layout.append([len(data) - pos, None])
+        return {'type': 'zip', 'sha': _sha256(data), 'skeleton': self.put(b''.join(skeleton)),
+                'layout': layout,
+                'central': [[i.filename, i.CRC, i.file_size] for i in infos]}
+
+    def _record_file(self, path: Path, prev: dict = None) -> dict:
+        """파일 1개 기록. prev(직전 스냅샷 기록)와 크기·mtime 이 같으면 읽지 않고 재사용."""
+        st = path.stat()
+        # 이전 형식 zip 기록은 바이트 단위로 복원되지 않으므로 재사용하지 않고 다시 기록
+        if (prev and prev.get('size') == st.st_size and prev.get('mtime_ns') == st.st_mtime_ns
+                and not (prev['type'] == 'zip' and 'layout' not in prev)):
+            return prev
+        data = path.read_bytes()
+        item = None
+        if _is_zip_name(path.name) and zipfile.is_zipfile(path):
+            item = self._record_zip(data)
+        if item is None:
+            item = {'type': 'file', 'sha': self.put(data)}
+        return {**item, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def _record_tree(self, root: Path, prev: dict = None) -> dict:
+        prev_files = (prev or {}).get('files', {})
+        files = {}
+        for dirpath, _dirs, names in os.walk(root):
+            for name in names:
+                if name == MANIFEST_NAME or name.endswith(_SKIP_SUFFIXES):
+                    continue
+                p = Path(dirpath) / name
+                rel = p.relative_to(root).as_posix()
+                files[rel] = self._record_file(p, prev_files.get(rel))
+        return {'type': 'tree', 'files': files}
+
+    def snapshot(self, sources: dict, version: str, meta: dict = None) -> tuple:
+        """
+        sources: {항목 키: 원본 경로} 를 기록. CURRENT 스냅샷의 나머지 항목은 그대로 이어받음.
+
+        같은 이름의 스냅샷이 있으면: 공통 항목이 모두 같을 때만 병합(항목 추가),
+        다르면 '{version}+N' 으로 새 스냅샷을 만듦 (이전 버전 원본은 그대로 보존).
+        반환: (스냅샷 이름, 새 청크 수, 새 청크 압축 바이트)
+        """
+        self._new_objects = self._new_bytes = 0
+        base_name = self.current()
+        base = self.load_snapshot(base_name) if base_name else {'items': {}, 'meta': {}}
+        items = dict(base['items'])
+        for key, src in sources.items():
+            src = Path(src)
+            prev = base['items'].get(key)
+            items[key] = (self._record_tree(src, prev) if src.is_dir()
+                          else self._record_file(src, prev))
+
+        name, n = version, 1
+        while (self.snapshots / f'{name}.json').exists():
+            existing = self.load_snapshot(name)
+            common = set(existing['items']) & set(items)
+            if all(existing['items'][k] == items[k] for k in common):
+                items = {**existing['items'], **items}
+                break
+            n += 1
+            name = f'{version}+{n}'
+        snap = {'version': name, 'items': items,
+                'meta': {**base.get('meta', {}), **(meta or {})}}
+        self._save_snapshot(snap)
+        self.set_current(name)
+        return name, self._new_objects, self._new_bytes
+
+    # ── 실체화 ──────────────────────────────────────────────────────────────
+
+    def _matches(self, item: dict, path: Path) -> bool:
+        """path 가 기록과 같은 내용인지 (크기+mtime → ZIP 중앙 디렉토리/파일 해시)."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        if item['type'] == 'zip':
+            if 'layout' in item:
+                if st.st_size != item['size']:
+                    return False
+                if st.st_mtime_ns == item['mtime_ns']:
+                    return True
+            # 중앙 디렉토리(엔트리 수·이름·CRC·크기)만 읽어 비교 (본문은 읽지 않음)
+            # — 이전 형식 실체화본은 재압축이라 크기가 원본과 다를 수 있음
+            try:
+                with zipfile.ZipFile(path, 'r') as zf:
+                    central = [[i.filename, i.CRC, i.file_size] for i in zf.infolist()]
+            except (zipfile.BadZipFile, OSError):
+                return False
+            return central == item.get('central',
+                                       [[e[0], e[2], e[3]] for e in item.get('entries', [])])
+        if st.st_size != item['size']:
+            return False
+        return st.st_mtime_ns == item['mtime_ns'] or _sha256(path.read_bytes()) == item['sha']
+
+    def _write_item(self, item: dict, dst: Path) -> None:
+        """
+        file/zip 기록 → dst (임시 파일 + os.replace, mtime 은 원본 값으로).
+        zip 은 골격·엔트리 청크를 원래 순서로 이어 쓰고 전체 sha256 을 기록과 대조.
+        """
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(dst.name + '.kr_tmp')
+        try:
+            if 'layout' in item:
+                skeleton = self.get(item['skeleton'])
+                h = hashlib.sha256()
+                pos = 0
+                with open(tmp, 'wb') as f:
+                    for skel_len, data_sha in item['layout']:
+                        for piece in (skeleton[pos:pos + skel_len],
+                                      self.get(data_sha) if data_sha else b''):
+                            f.write(piece)
+                            h.update(piece)
+                        pos += skel_len
+                if h.hexdigest() != item['sha']:
+                    raise ValueError(f"실체화 결과가 기록된 원본과 다름: {dst}")
+            elif item['type'] == 'zip':
+                # 이전 형식 기록: 엔트리 내용으로 재압축 (원본과 바이트 단위로는 다를 수 있음)
+                with zipfile.ZipFile(tmp, 'w', allowZip64=True) as zf:
+                    for name, sha, _crc, _size, date_time, ctype, attr in item['entries']:
+                        info = zipfile.ZipInfo(name, tuple(date_time))
+                        info.compress_type = ctype
+                        info.external_attr = attr
+                        zf.writestr(info, self.get(sha))
+                    zf.comment = bytes.fromhex(item['comment'])
+            else:
+                tmp.write_bytes(self.get(item['sha']))
+            os.utime(tmp, ns=(item['mtime_ns'], item['mtime_ns']))
+            os.replace(tmp, dst)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def materialize(self, version: str, key: str) -> Optional[Path]:
+        """
+        스냅샷 항목을 work/{version}/{key} 에 실체화 (이미 일치하는 파일은 생략).
+        다른 버전의 work 캐시는 건드리지 않음 (prune_work). 항목이 없으면 None.
+        """
+        item = self.load_snapshot(version)['items'].get(key)
+        if item is None:
+            return None
+        dst = self.work / version / key
+        if item['type'] == 'tree':
+            for rel, sub in item['files'].items():
+                p = dst / rel
+                if not self._matches(sub, p):
+                    self._write_item(sub, p)
+            dst.mkdir(parents=True, exist_ok=True)
+        elif not self._matches(item, dst):
+            self._write_item(item, dst)
+        return dst
+
+    def prune_work(self, keep: str) -> list:
+        """keep 외 버전의 work/ 실체화 캐시 삭제. 반환: 삭제한 버전 이름 목록"""
+        removed = []
+        if self.work.is_dir():
+            for other in sorted(self.work.iterdir()):
+                if other.name != keep:
+                    shutil.rmtree(other, ignore_errors=True)
+                    removed.append(other.name)
+        return removed
+
+
+def original_path(paths: dict, key: str) -> Optional[Path]:
+    """
+    CURRENT 스냅샷의 원본 항목 경로 (필요 시 work/ 에 실체화).
+    저장소·스냅샷·항목이 없으면 None — 호출 측은 기존 .bak 경로로 대체.
+    """
+    store = BackupStore.from_paths(paths)
+    version = store.current()
+    if version is None:
+        return None
+    return store.materialize(version, key)
+
+
+def game_version(paths: dict) -> str:
+    """게임 폴더의 starfarer_obf.jar(.bak 우선)에서 버전 감지. 실패 시 'unknown'."""
+    from update_mod_version import detect_game_version
+    game_core = Path(resolve_path(paths['game_core']))
+    for name in ('starfarer_obf.jar.bak', 'starfarer_obf.jar'):
+        try:
+            return detect_game_version(str(game_core / name))
+        except (OSError, ValueError, zipfile.BadZipFile):
+            continue
+    return 'unknown'
+
+
+def _live_targets(paths: dict, mods: list) -> dict:
+    """항목 키 → 게임 쪽 라이브 경로."""
+    game_core = Path(resolve_path(paths['game_core']))
+    game_mods = Path(resolve_path(paths['game_mods']))
+    targets = {f'core/{name}': game_core / name for name in CORE_JARS}
+    for m in mods:
+        targets[f"mods/{m['id']}"] = game_mods / m['id']
+    return targets
+
+
+def cmd_snapshot(store: BackupStore, paths: dict, mods: list, args) -> int:
+    sources = {}
+    for key, live in _live_targets(paths, mods).items():
+        src = Path(str(live) + '.bak') if args.from_bak else live
+        if not src.exists():
+            continue
+        if not args.from_bak and not args.force:
+            # 패치가 적용된 상태의 라이브 파일은 원본으로 기록하지 않음 (기존 기록 유지)
+            if Path(str(live) + PREV_SUFFIX).exists() or (live / MANIFEST_NAME).exists():
+                print(f"  건너뜀: {key} — 한글 패치 적용 상태로 보임 "
+                      f"(기존 기록 유지, 새 원본이면 --force)")
+                continue
+            # 이전 방식(.bak)으로 패치된 상태: .bak 이 원본이고 라이브는 패치본
+            bak = Path(str(live) + '.bak')
+            if bak.exists() and (live.is_dir() or not files_match(bak, live)):
+                print(f"  건너뜀: {key} — {bak.name} 와 내용이 달라 패치 적용 상태로 보임 "
+                      f"(.bak 이 원본이면 --from-bak, 새 원본이면 --force)")
+                continue
+        sources[key] = src
+
+    if not sources:
+        print("ERROR: 기록할 원본이 없습니다. (build.py restore 후 다시 실행)", file=sys.stderr)
+        return 1
+
+    meta = {}
+    for key, src in sources.items():
+        if key.startswith('mods/') and (src / 'mod_info.json').exists():
+            try:
+                meta[key] = str(load_loose_json(src / 'mod_info.json').get('version', ''))
+            except (LooseJSONError, OSError, AttributeError):
+                pass
+
+    version = args.version or game_version(paths)
+
+    name, new_objects, new_bytes = store.snapshot(sources, version, meta)
+    print(f"스냅샷: {name} (항목 {len(sources)}개: {', '.join(sources)})")
+    print(f"  새 청크 {new_objects}개 ({new_bytes / 1048576:.1f} MB 압축), 나머지는 기존 청크 재사용")
+    return 0
+
+
+def cmd_list(store: BackupStore) -> int:
+    current = store.current()
+    versions = store.versions()
+    if not versions:
+        print("스냅샷 없음 — python scripts/backup_store.py snapshot 으로 생성")
+        return 0
+    for v in versions:
+        snap = store.load_snapshot(v)
+        mark = '*' if v == current else ' '
+        print(f"{mark} {v}: {', '.join(sorted(snap['items']))}")
+    return 0
+
+
+def _tree_matches(store: BackupStore, item: dict, live: Path) -> bool:
+    """live 디렉토리가 tree 기록과 같은 파일 집합·내용인지 (파일마다 크기+mtime → 해시)."""
+    if not live.is_dir():
+        return False
+    present = set()
+    for dirpath, _dirs, names in os.walk(live):
+        for name in names:
+            if name == MANIFEST_NAME or name.endswith(_SKIP_SUFFIXES):
+                continue
+            present.add((Path(dirpath) / name).relative_to(live).as_posix())
+    files = item['files']
+    return present == set(files) and all(store._matches(files[rel], live / rel) for rel in files)
+
+
+def _swap_tree(src: Path, live: Path) -> int:
+    """
+    src(실체화된 스냅샷 트리)로 live 디렉토리 교체: live.kr_new 에 하드링크로 새 트리를 만든 뒤
+    apply_mods 와 같은 rename 교체. 교체 후 이전(패치된) 트리는 삭제. 반환: 파일 수
+    """
+    # apply_mods 가 이 모듈을 import 하므로 지연 import
+    from apply_mods import _mod_paths, _swap_in, recover_mod_dir
+    recover_mod_dir(live)
+    stage, prev = _mod_paths(live)
+    linked, copied = stage_tree(src, stage)
+    try:
+        _swap_in(stage, live, prev)
+    except OSError:
+        shutil.rmtree(stage, ignore_errors=True)
+        raise
+    shutil.rmtree(prev, ignore_errors=True)
+    return linked + copied
+
+
+def cmd_prune(store: BackupStore) -> int:
+    current = store.current()
+    removed = store.prune_work(current)
+    print(f"work/ 캐시 삭제: {', '.join(removed) if removed else '없음'} (유지: {current})")
+    return 0
+
+
+def cmd_restore(store: BackupStore, paths: dict, mods: list, version: str = None,
+                include_mods: bool = False) -> int:
+    version = version or store.current()
+    targets = _live_targets(paths, mods if include_mods else [])
+
+    if version is None:
+        # 저장소 도입 전: 기존 .bak 으로 복원
+        print("스냅샷 없음 — .bak 으로 복원")
+        for key, live in targets.items():
+            bak = Path(str(live) + '.bak')
+            if key.startswith('core/') and bak.exists():
+                print(f"  [restore] {live.name}: "
+                      f"{'복원' if restore_file(bak, live) else '이미 일치 (skip)'}")
+        return 0
+
+    items = store.load_snapshot(version)['items']
+    print(f"스냅샷 {version} 복원")
+    for key, live in targets.items():
+        if key not in items:
+            continue
+        if items[key]['type'] == 'tree':
+            if _tree_matches(store, items[key], live):
+                print(f"  [restore] {key}: 이미 일치 (skip)")
+                continue
+            src = store.materialize(version, key)
+            try:
+                n = _swap_tree(src, live)
+            except OSError as e:
+                print(f"  ERROR: {key}: 디렉토리 교체 실패 ({e}) — 게임을 종료한 뒤 다시 실행",
+                      file=sys.stderr)
+                return 1
+            print(f"  [restore] {key}: 스냅샷 트리로 교체 (파일 {n}개)")
+        else:
+            src = store.materialize(version, key)
+            print(f"  [restore] {key}: "
+                  f"{'복원' if restore_file(src, live) else '이미 일치 (skip)'}")
+    store.set_current(version)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='원본 백업 저장소')
+    parser.add_argument('command', choices=['snapshot', 'list', 'restore', 'prune'])
+    parser.add_argument('--version', default=os.environ.get('STARSECTOR_BACKUP_VERSION'))
+    parser.add_argument('--from-bak', action='store_true')
+    parser.add_argument('--force', action='store_true')
+    parser.add_argument('--mods', action='store_true', help='restore: 모드 디렉토리도 복원')
+    args = parser.parse_args()
+
+    cfg = load_config()
+    paths = cfg['paths']
+    mods = [m for m in cfg.get('mods', []) if m.get('enabled', True)]
+    store = BackupStore.from_paths(paths)
+
+    if args.command == 'snapshot':
+        sys.exit(cmd_snapshot(store, paths, mods, args))
+    if args.command == 'list':
+        sys.exit(cmd_list(store))
+    if args.command == 'prune':
+        sys.exit(cmd_prune(store))
+    try:
+        sys.exit(cmd_restore(store, paths, mods, args.version, args.mods))
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,15 +3,26 @@
 build_mods.py - config.json의 mods 배열을 기반으로 모드 빌드
 
 흐름 (모드별):
-  1. 복원 (기본값): game_mods/{id}.bak/ → game_mods/{id}/ (이중 패치 방지)
-  2. 원본 모드 복사: game_mods/{id}/ → output/mods/{id}/
+  1. 복원 (기본값): 원본 → game_mods/{id}/ (이중 패치 방지)
+     원본은 백업 저장소(backup_store.py) CURRENT 스냅샷, 없으면 game_mods/{id}.bak/
+     이미 원본과 일치하는 파일은 복사 생략
+  2. 원본 모드 스테이징: game_mods/{id}/ → output/mods/{id}/
+     기본은 하드링크 (--stage copy 로 전체 복사). 번역/오버레이/post_build가
+     수정하는 파일만 임시 파일 + os.replace 로 개별 사본이 됨 → 게임 원본 불변
+     오버레이가 대체할 파일은 먼저 계획해 두고 스테이징·번역하지 않음
   3. 번역 사전 적용: patches/{id}/translations.json → 출력 디렉토리 텍스트 파일
-     (비어있으면 skip)
+     (비어있으면 skip, 파일 단위로 프로세스 풀에 분배)
   4. 파일 오버레이: patches/{id}/data/, patches/{id}/graphics/ → output/{id}/
-  5. post_build 스크립트 실행
+  5. post_build 훅 실행: 스크립트에 run(ctx) 가 있으면 같은 프로세스에서 호출
+     (ctx = HookContext: 모드 사전·제외목록·출력 파일 목록을 빌드에서 그대로 전달),
+     없으면 기존처럼 python <script> --mod <id> 하위 프로세스로 실행
 
 옵션:
-  --no-restore    .bak → live 복원 단계 건너뜀. live 디렉토리를 그대로 소스로 사용.
+  --no-restore    원본 → live 복원 단계 건너뜀. live 디렉토리를 그대로 소스로 사용.
+  --stage MODE    link (기본: 하드링크, 실패 시 복사) | copy (전체 복사)
+  --no-cache      파일 단위 번역 캐시(intermediate/build_cache/{id}/) 사용 안 함
+  --jobs N        모드 동시 빌드 수 (기본: min(모드 수, CPU 수), 1 이면 직렬)
+                  병렬 시 모드별 로그를 모아 완료 순서대로 출력, 한 모드라도 실패하면 중단
 
 CSV 번역 규칙:
   - 셀 단위 정확 일치
@@ -19,11 +30,16 @@ CSV 번역 규칙:
 
 JSON 번역 규칙:
   - 재귀적 string 값 교체 (키는 건드리지 않음)
+  - 원문 형식(주석·들여쓰기) 유지, 교체된 문자열 리터럴 구간만 다시 씀
   - mod_info.json은 번역 제외
 """
 
 import argparse
+import ast
+import contextlib
 import csv
+import hashlib
+import importlib.util
 import io
 import json
 import os
@@ -31,10 +47,18 @@ import re
 import shutil
 import subprocess
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from patch_utils import load_config, load_exclusions_file, resolve_path
+from backup_store import original_path
+from dict_compiler import effective_dictionary
+from loose_json import loads as loads_loose_json, translate_string_spans
+from patch_utils import (HookContext, copy_private, load_config, load_exclusions_file,
+                         resolve_path, restore_tree, stage_tree, write_bytes_private,
+                         write_text_private)
 
 _SCRIPT_ROOT = Path(__file__).parent.parent  # scripts/ → kr_work/
 
@@ -76,76 +100,38 @@ CSV_SKIP_COLUMNS = {
 
 def _load_json_lazy(text: str):
     """
-    Starsector 비표준 JSON 파서 (3단계 시도).
-
-    1. 표준 json.loads
-    2. # 주석 + 후행 쉼표 제거
-    3. 추가로 unquoted 키 자동 인용 (tips.json 등 대응)
+    Starsector 비표준 JSON 파서 (loose_json.loads — # 주석, 후행 쉼표,
+    unquoted 키, Java float 리터럴을 한 번의 순회로 처리).
     """
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # 단계 2: # 주석 + 후행 쉼표
-    cleaned = re.sub(r'(?m)#[^\n]*', '', text)
-    cleaned = re.sub(r',(\s*[}\]])', r'\1', cleaned)
-    try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
-
-    # 단계 3: unquoted 키 자동 인용 (예: tips:[ → "tips":[)
-    # 문자열 리터럴 안이 아닌 위치의 bareword key 만 처리
-    cleaned2 = re.sub(r'(?<!["\w])([a-zA-Z_][a-zA-Z0-9_]*)(\s*:)(?!\s*:)', r'"\1"\2', cleaned)
-    return json.loads(cleaned2)
+    return loads_loose_json(text)
 
 
-def translate_json_value(obj, translations: dict,
-                          blocked_json_keys: set = None, _parent_key: str = None):
+def translate_json_file(filepath: Path, translations: dict,
+                         blocked_json_keys: set = None, lookups: set = None) -> bool:
     """
-    JSON 객체를 재귀적으로 순회하며 string 값 교체.
+    JSON 파일에 번역 적용. 변경 있으면 True. lookups: 조회 대상 문자열 수집 (선택).
 
-    blocked_json_keys 에 속하는 키 아래의 값은 코드 식별자로 간주하여 번역 건너뜀.
-    예: "specializations": ["saboteur"] → "saboteur" 번역 안 함
+    재직렬화하지 않고 사전에 걸린 문자열 값의 구간만 교체 (loose_json.translate_string_spans)
+    → Starsector 주석·들여쓰기·키 순서 유지, 파싱/비교도 원문 1회 순회로 끝남.
     """
-    if isinstance(obj, str):
-        if blocked_json_keys and _parent_key in blocked_json_keys:
-            return obj  # 코드 식별자 키 — 번역 건너뜀
-        return translations.get(obj, obj)
-    if isinstance(obj, dict):
-        return {k: translate_json_value(v, translations,
-                                        blocked_json_keys=blocked_json_keys, _parent_key=k)
-                for k, v in obj.items()}
-    if isinstance(obj, list):
-        # 리스트 항목은 부모 키를 계속 전달 (예: "specializations": ["saboteur"])
-        return [translate_json_value(item, translations,
-                                     blocked_json_keys=blocked_json_keys, _parent_key=_parent_key)
-                for item in obj]
-    return obj
-
-
-def translate_json_file(filepath: Path, translations: dict,
-                         blocked_json_keys: set = None) -> bool:
-    """JSON 파일에 번역 적용. 변경 있으면 True."""
     try:
         text = filepath.read_text(encoding='utf-8')
-        obj = _load_json_lazy(text)
+        new_text, replaced = translate_string_spans(text, translations,
+                                                    blocked_json_keys=blocked_json_keys,
+                                                    lookups=lookups)
     except Exception as e:
         print(f"    JSON 읽기 실패 {filepath.name}: {e}")
         return False
 
-    new_obj = translate_json_value(obj, translations, blocked_json_keys=blocked_json_keys)
-    if new_obj == obj:
+    if not replaced:
         return False
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(new_obj, f, ensure_ascii=False, indent=2)
+    write_text_private(filepath, new_text)
     return True
 
 
-def translate_csv_file(filepath: Path, translations: dict) -> bool:
-    """CSV 파일에 번역 적용. 변경 있으면 True."""
+def translate_csv_file(filepath: Path, translations: dict, lookups: set = None) -> bool:
+    """CSV 파일에 번역 적용. 변경 있으면 True. lookups: 조회 대상 셀 수집 (선택)."""
     try:
         text = filepath.read_text(encoding='utf-8')
     except UnicodeDecodeError:
@@ -175,6 +161,8 @@ def translate_csv_file(filepath: Path, translations: dict) -> bool:
         for i in translatable_cols:
             if i < len(new_row):
                 cell = new_row[i]
+                if lookups is not None:
+                    lookups.add(cell)
                 if cell in translations:
                     new_row[i] = translations[cell]
                     changed = True
@@ -186,32 +174,306 @@ def translate_csv_file(filepath: Path, translations: dict) -> bool:
     out = io.StringIO()
     writer = csv.writer(out, lineterminator='\n')
     writer.writerows(new_rows)
-    filepath.write_text(out.getvalue(), encoding='utf-8')
+    write_text_private(filepath, out.getvalue())
     return True
 
 
+# 프리필터 probe 에서 제외할 문자: 원문 파일에서 이스케이프되어 다르게 보일 수 있는 문자
+# (JSON: \" \\ \/ \n, CSV: "" 및 셀 내 개행).
+# 비 ASCII 는 JSON 에서 \uXXXX 로 쓰일 수 있으므로 \u 가 있는 파일은 프리필터를 적용하지 않음.
+_PROBE_SPLIT = re.compile(r'["\\/\x00-\x1f\x7f]+')
+
+# probe 최대 길이 — 필요조건만 확인하면 되므로 앞부분으로 충분 (정규식 크기 제한)
+_PROBE_MAX_LEN = 24
+
+
+def _trie_regex(words) -> str:
+    """
+    단어 집합 → trie 형태 정규식 (예: abc|abd|b → (?:ab[cd]|b)).
+    sre 는 단순 alternation 을 위치마다 전부 시도하므로 수천 개 키에서는
+    첫 글자부터 분기하는 trie 형태가 훨씬 빠름.
+    어떤 단어가 끝나는 노드 이후는 존재 여부 판정에 불필요하므로 잘라냄.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            if node.get('') is True:
+                break  # 더 짧은 probe 가 이미 이 접두사를 커버
+            node = node.setdefault(ch, {})
+        else:
+            node.clear()
+            node[''] = True
+
+    def emit(node) -> str:
+        if node.get('') is True:
+            return ''
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+
+    return emit(trie)
+
+
+def build_prefilter(translations: dict):
+    """
+    원문 텍스트 프리필터 정규식 (bytes). 파일에 어떤 사전 키도 있을 수 없으면
+    search() 가 None → 파싱 없이 건너뜀.
+
+    각 키에서 이스케이프 영향이 없는 가장 긴 구간(probe)을 뽑아,
+    키가 파일에 있으면 probe 도 원문 바이트에 반드시 존재하도록 함 (필요조건).
+    probe 를 만들 수 없는 키가 있으면 None (프리필터 비활성).
+    """
+    probes = set()
+    for key in translations:
+        probe = max(_PROBE_SPLIT.split(key), key=len)
+        if not probe:
+            return None
+        probes.add(probe[:_PROBE_MAX_LEN])
+    if not probes:
+        return None
+    return re.compile(_trie_regex(probes).encode('utf-8'))
+
+
+# 병렬 번역 워커 상태 — 워커 프로세스마다 initializer 로 1회만 전달 (파일마다 pickle 방지)
+_WORKER_STATE = {}
+
+# 대상 파일이 이 수 미만이면 프로세스 풀 기동 비용이 더 커서 직렬 처리
+_PARALLEL_MIN_FILES = 32
+
+
+def _init_translate_worker(translations: dict, blocked_json_keys: set, prefilter=None):
+    # 컴파일된 사전은 경로로 전달받아 작업자마다 dict 로 한 번 펼침 (문자열마다 조회)
+    if hasattr(translations, 'to_dict'):
+        translations = translations.to_dict()
+    _WORKER_STATE['translations'] = translations
+    _WORKER_STATE['blocked_json_keys'] = blocked_json_keys
+    _WORKER_STATE['prefilter'] = prefilter
+
+
+def _translate_one(fpath: str):
+    """
+    워커: 파일 1개 번역.
+    반환: (suffix, changed, elapsed, log, rejected, lookups)
+          log 는 워커 출력 (부모에서 순서대로 출력),
+          rejected 는 프리필터로 파싱 없이 건너뛰었으면 True,
+          lookups 는 사전 조회 대상 문자열 목록 (프리필터로 건너뛰면 None)
+    """
+    path = Path(fpath)
+    buf = io.StringIO()
+    start = time.perf_counter()
+    prefilter = _WORKER_STATE.get('prefilter')
+    if prefilter is not None:
+        try:
+            raw = path.read_bytes()
+            if b'\\u' not in raw and prefilter.search(raw) is None:
+                return path.suffix, False, time.perf_counter() - start, '', True, None
+        except OSError:
+            pass  # 읽기 오류는 아래 번역 함수가 보고
+    lookups = set()
+    with contextlib.redirect_stdout(buf):
+        if path.suffix == '.json':
+            changed = translate_json_file(path, _WORKER_STATE['translations'],
+                                          blocked_json_keys=_WORKER_STATE['blocked_json_keys'],
+                                          lookups=lookups)
+        else:
+            changed = translate_csv_file(path, _WORKER_STATE['translations'], lookups=lookups)
+    return (path.suffix, changed, time.perf_counter() - start, buf.getvalue(), False,
+            sorted(lookups))
+
+
+# ── 파일 단위 번역 결과 캐시 ──────────────────────────────────────────────────
+#
+# intermediate/build_cache/{mod_id}/index.json : 상대경로 → 항목
+#   src     원본 파일 sha1
+#   rules   번역 규칙 해시 (blocked_json_keys, CSV_SKIP_COLUMNS, 캐시 버전)
+#   lookups 사전 조회 대상 문자열 목록 (파일 내용 + 규칙으로 결정됨)
+#   dict    lookups 로 제한한 사전({k: v for k in lookups if k in 사전})의 해시
+#   changed 번역으로 파일이 바뀌었는지
+#   out     변경된 출력의 sha1 (blobs/{sha1} 에 저장), 변경 없으면 None
+#   log     번역 시 출력 (캐시 적중 시 그대로 재출력)
+#
+# src·rules 가 같으면 lookups 도 같으므로, 현재 사전에서 dict 해시만 다시 계산해
+# 일치하면 파싱 없이 blob 을 그대로 씀.
+
+# 번역 로직(파서/직렬화)이 바뀌면 올려서 기존 캐시 무효화
+_TRANSLATE_CACHE_VERSION = 2
+
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _rules_hash(blocked_json_keys: set) -> str:
+    payload = [_TRANSLATE_CACHE_VERSION, sorted(blocked_json_keys or ()),
+               sorted(CSV_SKIP_COLUMNS)]
+    return _sha1(json.dumps(payload).encode('utf-8'))
+
+
+def _restricted_dict_hash(translations: dict, lookups) -> str:
+    hits = [[k, translations[k]] for k in lookups if k in translations]
+    return _sha1(json.dumps(hits, ensure_ascii=False).encode('utf-8'))
+
+
+class TranslationCache:
+    """모드별 파일 번역 결과 캐시 (index.json + blobs/)."""
+
+    def __init__(self, cache_dir: Path):
+        self.dir = Path(cache_dir)
+        self.blobs = self.dir / 'blobs'
+        self.index_path = self.dir / 'index.json'
+        self.index = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+        self.new_index = {}
+
+    def lookup(self, rel: str, src_hash: str, rules: str, translations: dict):
+        """적중 시 항목 반환 (이번 빌드 인덱스에 유지), 아니면 None."""
+        entry = self.index.get(rel)
+        if not entry or entry['src'] != src_hash or entry['rules'] != rules:
+            return None
+        if entry['dict'] != _restricted_dict_hash(translations, entry['lookups']):
+            return None
+        if entry['out'] and not (self.blobs / entry['out']).exists():
+            return None
+        self.new_index[rel] = entry
+        return entry
+
+    def read_blob(self, entry) -> bytes:
+        return (self.blobs / entry['out']).read_bytes()
+
+    def store(self, rel: str, src_hash: str, rules: str, translations: dict,
+              lookups, changed: bool, out_bytes: bytes, log: str):
+        out = None
+        if changed:
+            out = _sha1(out_bytes)
+            self.blobs.mkdir(parents=True, exist_ok=True)
+            blob = self.blobs / out
+            if not blob.exists():
+                blob.write_bytes(out_bytes)
+        self.new_index[rel] = {
+            'src': src_hash, 'rules': rules, 'lookups': lookups,
+            'dict': _restricted_dict_hash(translations, lookups),
+            'changed': changed, 'out': out, 'log': log,
+        }
+
+    def save(self):
+        """이번 빌드에서 쓰인 항목만 남기고 저장, 참조 없는 blob 정리."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name('index.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.new_index, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+        if self.blobs.is_dir():
+            live = {e['out'] for e in self.new_index.values() if e['out']}
+            for blob in self.blobs.iterdir():
+                if blob.name not in live:
+                    blob.unlink()
+
+
+def collect_translatable_files(mod_dir: Path) -> list:
+    """번역 대상 JSON/CSV 파일 목록 (mod_info.json 제외, 경로순)."""
+    return sorted(
+        f for f in mod_dir.rglob('*')
+        if f.suffix in ('.json', '.csv') and f.name != 'mod_info.json' and f.is_file()
+    )
+
+
 def apply_translations_to_dir(mod_dir: Path, translations: dict,
-                               blocked_json_keys: set = None):
-    """모드 출력 디렉토리의 모든 텍스트 파일에 번역 적용."""
+                               blocked_json_keys: set = None, jobs: int = None,
+                               cache_dir: Path = None):
+    """
+    모드 출력 디렉토리의 모든 텍스트 파일에 번역 적용.
+
+    파일 목록을 한 번 수집한 뒤 프로세스 풀로 분배 (jobs=1 또는 파일 수가 적으면 직렬).
+    워커 출력은 파일 순서대로 모아서 출력하므로 직렬 실행과 같은 로그가 나옴.
+    사전 키가 하나도 있을 수 없는 파일은 원문 프리필터로 파싱 전에 제외.
+    cache_dir 가 주어지면 원본·관련 사전 항목·규칙이 그대로인 파일은 캐시에서 바로 기록.
+    """
     if not translations:
         return
 
-    json_changed = 0
-    csv_changed = 0
-    for fpath in mod_dir.rglob('*'):
-        if not fpath.is_file():
+    # 작업자에는 원래 사전(컴파일된 사전이면 경로만 pickle)을 넘기고, 이 프로세스의
+    # 캐시 판정·직렬 번역은 dict 로 펼친 사본으로 조회
+    shared = translations
+    if hasattr(translations, 'to_dict'):
+        translations = translations.to_dict()
+    prefilter = build_prefilter(translations)
+    files = [str(f) for f in collect_translatable_files(mod_dir)]
+
+    start = time.perf_counter()
+    cache = TranslationCache(cache_dir) if cache_dir else None
+    rules = _rules_hash(blocked_json_keys)
+    results = [None] * len(files)
+    src_hashes = {}
+    pending = []
+    for i, f in enumerate(files):
+        if cache is None:
+            pending.append(i)
             continue
-        if fpath.name == 'mod_info.json':
+        rel = Path(f).relative_to(mod_dir).as_posix()
+        src_hashes[i] = _sha1(Path(f).read_bytes())
+        entry = cache.lookup(rel, src_hashes[i], rules, translations)
+        if entry is None:
+            pending.append(i)
             continue
+        if entry['changed']:
+            write_bytes_private(f, cache.read_blob(entry))
+        results[i] = (Path(f).suffix, entry['changed'], 0.0, entry['log'], False, None)
+    todo = [files[i] for i in pending]
+
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, max(1, len(todo)))
+    if jobs == 1 or len(todo) < _PARALLEL_MIN_FILES:
+        jobs = 1
+        _init_translate_worker(translations, blocked_json_keys, prefilter)
+        done = [_translate_one(f) for f in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_translate_worker,
+                                 initargs=(shared, blocked_json_keys, prefilter)) as pool:
+            done = list(pool.map(_translate_one, todo,
+                                 chunksize=max(1, len(todo) // (jobs * 4))))
+
+    for i, result in zip(pending, done):
+        results[i] = result
+        _suffix, changed, _t, log, _rejected, lookups = result
+        if cache is not None and lookups is not None:
+            rel = Path(files[i]).relative_to(mod_dir).as_posix()
+            out_bytes = Path(files[i]).read_bytes() if changed else b''
+            cache.store(rel, src_hashes[i], rules, translations,
+                        lookups, changed, out_bytes, log)
+    if cache is not None:
+        cache.save()
+    elapsed = time.perf_counter() - start
 
-        if fpath.suffix == '.json':
-            if translate_json_file(fpath, translations, blocked_json_keys=blocked_json_keys):
+    json_changed = 0
+    csv_changed = 0
+    rejected = 0
+    for suffix, changed, _t, log, was_rejected, _lookups in results:
+        rejected += was_rejected
+        if log:
+            print(log, end='')
+        if changed:
+            if suffix == '.json':
                 json_changed += 1
-        elif fpath.suffix == '.csv':
-            if translate_csv_file(fpath, translations):
+            else:
                 csv_changed += 1
 
     print(f"  번역 적용: JSON {json_changed}개, CSV {csv_changed}개 파일 변경")
+    if cache is not None and files:
+        print(f"  번역 캐시: {len(files) - len(todo)}/{len(files)}개 적중")
+    if prefilter is None:
+        print("  프리필터: 비활성 (probe 를 만들 수 없는 키 존재)")
+    elif todo:
+        print(f"  프리필터: {rejected}/{len(todo)}개 파일 파싱 생략 "
+              f"({rejected * 100 / len(todo):.0f}%)")
+    if done:
+        slowest = max(range(len(done)), key=lambda i: done[i][2])
+        print(f"  번역 소요: {elapsed:.2f}s (파일 {len(todo)}개, 작업자 {jobs}개, "
+              f"최장 {Path(todo[slowest]).name} {done[slowest][2]:.2f}s)")
 
 
 def _load_mod_blocked_json_keys(patch_dir: Path) -> set:
@@ -228,8 +490,93 @@ def _load_mod_blocked_json_keys(patch_dir: Path) -> set:
     return set()
 
 
+# patches/{mod_id}/ 아래 모드 출력에 덮어쓰는 오버레이 하위 디렉토리
+OVERLAY_SUBDIRS = ('data', 'graphics')
+
+
+def plan_overlay(src: Path, patch_dir: Path) -> tuple:
+    """
+    오버레이 병합 계획 — 최종 파일 집합에서 오버레이가 차지할 경로를 미리 계산.
+
+    반환: (overlay, replaced)
+      overlay   오버레이 파일 상대경로 집합 (posix, normcase)
+      replaced  그중 원본 모드에도 있어 대체되는 경로 (스테이징·번역 불필요)
+    """
+    overlay = set()
+    for sub in OVERLAY_SUBDIRS:
+        p = patch_dir / sub
+        if p.is_dir():
+            overlay.update(os.path.normcase(f.relative_to(patch_dir).as_posix())
+                           for f in p.rglob('*') if f.is_file())
+    replaced = {rel for rel in overlay if (src / rel).is_file()}
+    return overlay, replaced
+
+
+class ModBuildError(RuntimeError):
+    """모드 빌드 실패 (post_build 스크립트 실패 등). exit_code 는 프로세스 종료 코드."""
+
+    def __init__(self, msg: str, exit_code: int = 1):
+        super().__init__(msg)
+        self.exit_code = exit_code
+
+
+def _run_post_build(cmd: list, capture: bool) -> int:
+    """
+    post_build 스크립트 실행. capture=True 면 출력을 받아 현재 stdout 으로 다시 출력
+    (병렬 빌드 시 모드별 로그 버퍼에 들어가도록).
+    """
+    if not capture:
+        return subprocess.run(cmd, capture_output=False).returncode
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    result = subprocess.run(cmd, capture_output=True, env=env)
+    for stream in (result.stdout, result.stderr):
+        if stream:
+            print(stream.decode('utf-8', errors='replace'), end='')
+    return result.returncode
+
+
+# 훅 스크립트 경로 → run 함수 (없으면 None). 프로세스당 한 번만 import.
+_HOOKS = {}
+
+
+def _load_hook(script: Path):
+    """
+    post_build 스크립트를 모듈로 로드해 run(ctx) 반환. run 이 없으면 None.
+    최상위 def run 이 없는 스크립트는 import 하지 않음 (모듈 최상위 코드가 실행되므로).
+    """
+    key = str(script)
+    if key not in _HOOKS:
+        tree = ast.parse(script.read_text(encoding='utf-8'), filename=key)
+        if not any(isinstance(node, ast.FunctionDef) and node.name == 'run'
+                   for node in tree.body):
+            _HOOKS[key] = None
+            return None
+        spec = importlib.util.spec_from_file_location(f"_post_build_{script.stem}", script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _HOOKS[key] = getattr(module, 'run', None)
+    return _HOOKS[key]
+
+
+def _run_hook(hook, ctx: HookContext, script_rel: str) -> None:
+    """run(ctx) 호출. sys.exit(n≠0) 또는 예외는 ModBuildError 로 변환."""
+    try:
+        hook(ctx)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            code = e.code if isinstance(e.code, int) else 1
+            raise ModBuildError(f"{script_rel} 실패 (exit {code})", code) from None
+    except Exception as e:
+        traceback.print_exc()
+        raise ModBuildError(f"{script_rel} 실패 ({type(e).__name__}: {e})") from e
+
+
 def build_mod(mod_cfg: dict, paths: dict, python_cmd: str,
-              blocked_strings: set = None, restore: bool = True):
+              exclusions: tuple = None, restore: bool = True, stage: str = 'link',
+              use_cache: bool = True, translate_jobs: int = None, capture: bool = False):
+    """
+    모드 1개 빌드. exclusions: 전역 (blocked_classes, blocked_strings, blocked_jar_strings)
+    """
     mod_id = mod_cfg['id']
     game_mods = Path(resolve_path(paths['game_mods']))
     patches = Path(resolve_path(paths['patches']))
@@ -237,18 +584,20 @@ def build_mod(mod_cfg: dict, paths: dict, python_cmd: str,
 
     patch_dir = patches / mod_id
     dst = output_mods / mod_id
-    bak = game_mods / (mod_id + '.bak')
+    # 원본: 백업 저장소 CURRENT 스냅샷 → 없으면 기존 {id}.bak
+    bak = original_path(paths, f'mods/{mod_id}') or game_mods / (mod_id + '.bak')
     src = game_mods / mod_id
 
     print(f"\n[{mod_id}]")
 
-    # 1. 복원: .bak → live (기본값, 이중 패치 방지)
-    # dirs_exist_ok=True로 삭제 없이 덮어쓰기 — Windows 파일 잠금(WinError 32) 방지
+    # 1. 복원: 원본 → live (기본값, 이중 패치 방지)
+    # 삭제 없이 파일 단위 덮어쓰기 — Windows 파일 잠금(WinError 32) 방지
+    # 이미 원본과 일치하는 파일(크기+mtime 또는 JAR 중앙 디렉토리)은 복사 생략
     if restore and bak.is_dir():
-        shutil.copytree(str(bak), str(src), dirs_exist_ok=True)
-        print(f"  복원: {mod_id}.bak → {mod_id}")
+        copied, skipped = restore_tree(bak, src)
+        print(f"  복원: 원본({bak.name}) → {mod_id} (복사 {copied}개, 일치 생략 {skipped}개)")
     elif restore:
-        print(f"  복원 건너뜀: {mod_id}.bak 없음")
+        print(f"  복원 건너뜀: 원본 스냅샷/{mod_id}.bak 없음")
     else:
         print(f"  복원 건너뜀: --no-restore")
 
@@ -256,64 +605,96 @@ def build_mod(mod_cfg: dict, paths: dict, python_cmd: str,
         print(f"  WARN: 원본 모드 없음: {src} — 건너뜀")
         return
 
-    # 2. 원본 모드 → output
+    # 2. 원본 모드 → output (하드링크 스테이징, rmtree 는 링크만 해제 — 원본 안전)
+    # 오버레이가 대체할 파일은 스테이징하지 않음 → 3단계 번역 대상에서도 빠짐
+    overlay, replaced = plan_overlay(src, patch_dir)
+    avoided = sum(1 for rel in replaced
+                  if rel.endswith(('.json', '.csv')) and not rel.endswith('mod_info.json'))
     if dst.exists():
         shutil.rmtree(dst)
-    shutil.copytree(src, dst)
-    print(f"  원본 복사: {mod_id} → {dst}")
+    linked, copied = stage_tree(src, dst, link=(stage == 'link'), skip=replaced)
+    print(f"  원본 스테이징: {mod_id} → {dst} (하드링크 {linked}개, 복사 {copied}개)")
+    if replaced:
+        print(f"  오버레이 계획: 원본 {len(replaced)}개 파일 대체 → 번역 {avoided}건 생략")
+
+    # 전역 + 모드별 exclusions 합산 (번역 단계와 post_build 훅이 공유)
+    gc, gs, gjs = exclusions or (set(), set(), set())
+    mc, ms, mjs = load_exclusions_file(patch_dir / 'exclusions.json')
+    ctx = HookContext(mod_cfg, paths, output_dir=dst)
+    ctx.exclusions = (gc | mc, gs | ms, gjs | mjs)
 
     # 3. 번역 사전 적용 (translations.json 비어있으면 skip)
+    #    모드 사전 − blocked_strings 는 dict_compiler 가 컴파일 (소스가 그대로면 재사용)
     trans_file = patch_dir / 'translations.json'
     if trans_file.exists():
         try:
-            with open(trans_file, encoding='utf-8') as f:
-                mod_translations = json.load(f)
+            mod_translations = effective_dictionary(paths, 'mod', mod_id)
+            ctx.mod_translations = mod_translations
+            if mod_translations.excluded:
+                print(f"  제외: blocked_strings {mod_translations.excluded}개")
             if mod_translations:
-                # 전역 + 모드별 blocked_strings 합산
-                _, mod_bs, _ = load_exclusions_file(patch_dir / 'exclusions.json')
-                mod_blocked = (blocked_strings or set()) | mod_bs
-                if mod_blocked:
-                    before = len(mod_translations)
-                    mod_translations = {k: v for k, v in mod_translations.items()
-                                        if k not in mod_blocked}
-                    removed = before - len(mod_translations)
-                    if removed:
-                        print(f"  제외: blocked_strings {removed}개")
                 # 전역 + 모드별 blocked_json_keys 합산
                 mod_blocked_json_keys = BLOCKED_JSON_KEYS | _load_mod_blocked_json_keys(patch_dir)
                 print(f"  번역 사전 {len(mod_translations)}개 항목 적용 중...")
+                cache_dir = _SCRIPT_ROOT / 'intermediate' / 'build_cache' / mod_id
                 apply_translations_to_dir(dst, mod_translations,
-                                          blocked_json_keys=mod_blocked_json_keys)
+                                          blocked_json_keys=mod_blocked_json_keys,
+                                          jobs=translate_jobs,
+                                          cache_dir=cache_dir if use_cache else None)
             else:
                 print(f"  번역 사전: 비어있음 (skip)")
         except Exception as e:
             print(f"  WARN: translations.json 읽기 실패: {e}")
 
-    # 4. 파일 오버레이
-    overlaid = 0
-    for sub in ['data', 'graphics']:
+    # 4. 파일 오버레이 (계획 단계에서 대체 대상은 스테이징되지 않았음)
+    for sub in OVERLAY_SUBDIRS:
         p = patch_dir / sub
         if p.is_dir():
-            shutil.copytree(str(p), str(dst / sub), dirs_exist_ok=True)
-            overlaid += sum(1 for _ in p.rglob('*') if _.is_file())
-    if overlaid:
-        print(f"  오버레이: {overlaid}개 파일")
+            shutil.copytree(str(p), str(dst / sub), dirs_exist_ok=True,
+                            copy_function=copy_private)
+    if overlay:
+        print(f"  오버레이: {len(overlay)}개 파일")
 
-    # 5. post_build 스크립트
+    # 5. post_build 훅: run(ctx) 는 같은 프로세스에서 (사전·제외목록 재로딩 없음),
+    #    run 이 없는 스크립트는 하위 프로세스로
     for script_rel in mod_cfg.get('post_build', []):
         script = _SCRIPT_ROOT / script_rel
-        cmd = [python_cmd, str(script), '--mod', mod_id]
         print(f"  post_build: {script_rel}")
-        result = subprocess.run(cmd, capture_output=False)
-        if result.returncode != 0:
-            print(f"  ERROR: {script_rel} 실패 (exit {result.returncode})", file=sys.stderr)
-            sys.exit(result.returncode)
+        hook = _load_hook(script)
+        if hook is not None:
+            _run_hook(hook, ctx, script_rel)
+            continue
+        cmd = [python_cmd, str(script), '--mod', mod_id]
+        returncode = _run_post_build(cmd, capture)
+        if returncode != 0:
+            raise ModBuildError(f"{script_rel} 실패 (exit {returncode})", returncode)
+
+
+def _build_mod_worker(mod_cfg: dict, paths: dict, python_cmd: str, exclusions: tuple,
+                      options: dict):
+    """
+    병렬 빌드 워커: 모드 1개 빌드, 출력은 버퍼에 모아 반환 (다른 모드 로그와 섞이지 않게).
+    반환: (mod_id, log, error, exit_code) — 성공 시 error None
+    """
+    buf = io.StringIO()
+    error, exit_code = None, 0
+    with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+        try:
+            build_mod(mod_cfg, paths, python_cmd, exclusions, capture=True, **options)
+        except ModBuildError as e:
+            error, exit_code = str(e), e.exit_code
+        except Exception as e:
+            error, exit_code = f"{type(e).__name__}: {e}", 1
+    return mod_cfg['id'], buf.getvalue(), error, exit_code
 
 
 def main():
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--no-restore', action='store_true',
                         default=os.environ.get('STARSECTOR_NO_RESTORE') == '1')
+    parser.add_argument('--stage', choices=('link', 'copy'), default='link')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--jobs', type=int, default=None)
     args, _ = parser.parse_known_args()
     restore = not args.no_restore
 
@@ -325,14 +706,46 @@ def main():
     output_mods = Path(resolve_path(paths['output_mods']))
     output_mods.mkdir(parents=True, exist_ok=True)
 
-    # 전역 blocked_strings 로드
-    _, blocked_strings, _ = load_exclusions_file(resolve_path(paths.get('exclusions', '')))
+    # 전역 exclusions 로드 (모드별 exclusions 는 build_mod 에서 합산)
+    exclusions = load_exclusions_file(resolve_path(paths.get('exclusions', '')))
 
     enabled = [m for m in mods if m.get('enabled', True)]
     print(f"빌드 대상 모드: {[m['id'] for m in enabled]}")
 
-    for mod_cfg in enabled:
-        build_mod(mod_cfg, paths, python_cmd, blocked_strings, restore=restore)
+    cpus = os.cpu_count() or 1
+    jobs = max(1, min(args.jobs or cpus, len(enabled)))
+    options = {'restore': restore, 'stage': args.stage, 'use_cache': not args.no_cache}
+
+    if jobs == 1:
+        for mod_cfg in enabled:
+            try:
+                build_mod(mod_cfg, paths, python_cmd, exclusions, **options)
+            except ModBuildError as e:
+                print(f"  ERROR: [{mod_cfg['id']}] {e}", file=sys.stderr)
+                sys.exit(e.exit_code)
+    else:
+        # 모드 간 입력/출력이 겹치지 않으므로 모드 단위로 병렬 빌드.
+        # 모드 내부 번역 풀은 CPU 를 나눠 씀, post_build 순서는 모드 안에서 그대로 유지.
+        options['translate_jobs'] = max(1, cpus // jobs)
+        print(f"  병렬 빌드: 모드 {len(enabled)}개, 작업자 {jobs}개")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_build_mod_worker, m, paths, python_cmd,
+                                   exclusions, options)
+                       for m in enabled]
+            printed = set()
+            for future in as_completed(futures):
+                mod_id, log, error, exit_code = future.result()
+                print(log, end='')
+                printed.add(future)
+                if error is not None:
+                    print(f"  ERROR: [{mod_id}] {error}", file=sys.stderr)
+                    # 대기 중인 모드는 취소, 이미 실행 중인 모드는 끝까지 기다려 로그 출력
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    for other in futures:
+                        if other not in printed and other.done() and not other.cancelled():
+                            print(other.result()[1], end='')
+                    print(f"\nbuild_mods 실패: {mod_id}", file=sys.stderr)
+                    sys.exit(exit_code)
 
     print("\nbuild_mods 완료.")
 
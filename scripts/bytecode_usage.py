@@ -0,0 +1,750 @@
+#!/usr/bin/env python3
+"""
+bytecode_usage.py - 바이트코드 수준 문자열 리터럴 용도 분석 (CFR 디컴파일 불필요)
+
+JAR 의 각 메서드 Code 속성을 명령어 단위로 따라가며 피연산자 스택을 흉내 내어,
+ldc/ldc_w 로 올린 CONSTANT_String 이 어느 명령어에서 소비되는지 추적하고
+리터럴마다 용도를 분류.
+
+    ui       UI 출력 호출(addPara, setText, addOption …)에 인자로 들어감
+    key      ID/키로 쓰임: equals/equalsIgnoreCase/hashCode(문자열 switch)/compareTo …,
+             java.util 컬렉션 get/put(키)/containsKey/remove/contains, MemoryAPI,
+             SettingsAPI.get*, 태그·스펙·사운드·스프라이트 조회, Enum.valueOf, Class.forName
+    unknown  그 외 (필드 저장, return, 기타 호출만) — 사람이 판단
+
+하나라도 key 용도가 있으면 key (번역 위험), 아니면 ui 가 있으면 ui.
+
+추적 범위 (메서드 안, 경로 비민감 근사):
+    - 지역 변수 저장/로드, checkcast, dup 계열, 배열 저장(aastore → 배열 값에 합침)
+    - StringBuilder/StringBuffer append·<init>·toString, String.format/concat/valueOf 등은
+      결과 값이 리터럴을 그대로 이어 받음 → "You have " + n + " credits" 도 최종 소비처로 분류
+    - 앞쪽 분기 대상에서는 분기 시점 스택을 합침 (삼항 연산자 cond ? "a" : "b")
+    - 예외 처리기 시작점은 [예외] 스택
+    - static final 문자열 상수(필드 ConstantValue)는 'field:이름' 용도로 기록
+    - 알 수 없는 명령어·깨진 코드를 만난 메서드는 거기서 중단하고 개수를 경고
+
+결과는 JAR 내용 해시별로 intermediate/literal_usage/{jar}-{해시}.pickle 에 캐시.
+캐시가 없을 때의 분석은 ZIP 엔트리 구간별로 작업자 프로세스에 나눔.
+
+사용법:
+    python scripts/bytecode_usage.py [--jar JAR …] [--out FILE] [--jobs N] [--show N]
+        기본 JAR: 원본(백업 저장소 → .bak) starfarer.api.jar, starfarer_obf.jar
+        기본 출력: intermediate/literal_usage.json
+            {"리터럴": {"usage": "ui|key|unknown", "sinks": {"Owner.method": n, …},
+                        "classes": ["jar:클래스", …]}, …}
+
+공개 API:
+    analyze_class(data, stats=None) -> dict[str, Counter]    {리터럴: Counter(소비처)}
+    load_usage(jar_path, jobs=None) -> LiteralUsage
+    classify(sinks) -> 'ui' | 'key' | 'unknown'
+"""
+
+import argparse
+import json
+import os
+import pickle
+import struct
+import sys
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from java_literals import UI_CALLS
+from jar_corpus import corpus_key
+from patch_utils import decode_java_utf8, parse_constant_pool
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+CACHE_DIR = _BASE / 'intermediate' / 'literal_usage'
+USAGE_VERSION = 3
+_PARALLEL_MIN_CLASSES = 2000
+
+_U2 = struct.Struct('>H')
+_U4 = struct.Struct('>I')
+_S2 = struct.Struct('>h')
+_S4 = struct.Struct('>i')
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 소비처 분류
+# ──────────────────────────────────────────────────────────────────────────────
+
+# 결과 값이 인자/수신자 리터럴을 이어 받는 메서드 (소비처로 기록하지 않음)
+_TRANSPARENT = {
+    'java/lang/StringBuilder': {'<init>', 'append', 'insert', 'toString'},
+    'java/lang/StringBuffer': {'<init>', 'append', 'insert', 'toString'},
+    'java/lang/String': {'<init>', 'format', 'concat', 'valueOf', 'toUpperCase', 'toLowerCase',
+                         'trim', 'strip', 'replace', 'substring', 'intern', 'toString'},
+}
+_BUILDERS = {'java/lang/StringBuilder', 'java/lang/StringBuffer'}
+_KEY_ANY_OWNER = {
+    'equals', 'equalsIgnoreCase', 'compareTo', 'compareToIgnoreCase', 'hashCode',
+    'startsWith', 'endsWith', 'contentEquals', 'forName',
+    'hasTag', 'addTag', 'removeTag', 'getEntityById', 'getFaction', 'getSprite',
+    'getSpriteName', 'loadTexture', 'playSound', 'playUISound', 'getCommoditySpec',
+    'getHullSpec', 'getWeaponSpec', 'getFighterWingSpec', 'getSkillSpec', 'getAbilitySpec',
+    'getIndustrySpec', 'getSpecialItemSpec', 'getVariant', 'getStarSystem', 'getMarket',
+}
+_KEY_COLLECTION = {'get', 'containsKey', 'remove', 'contains', 'getOrDefault', 'put'}
+_UI_SINKS = UI_CALLS - {'getString'}   # SettingsAPI.getString("분류", "id") 의 인자는 키
+
+
+def _sink_kind(owner: str, name: str, arg: int) -> str:
+    """'key' | 'ui' | '' (알 수 없음) — arg: 수신자 -1, 인자 0부터."""
+    if name in _KEY_ANY_OWNER:
+        return 'key'
+    simple = owner.rsplit('/', 1)[-1]
+    if owner.startswith('java/util/') and name in _KEY_COLLECTION:
+        return 'key' if name != 'put' or arg == 0 else ''
+    if simple.endswith('MemoryAPI'):
+        return 'key'
+    if simple.endswith('SettingsAPI') and name.startswith('get'):
+        return 'key'
+    if name == 'valueOf' and owner != 'java/lang/String':
+        return 'key'                    # Enum.valueOf 등
+    if name in _UI_SINKS:
+        return 'ui'
+    return ''
+
+
+def classify(sinks) -> str:
+    """소비처 Counter/dict → 'key' (하나라도 키 용도) | 'ui' | 'unknown'."""
+    kinds = {kind for sink in sinks for kind in (sink.split(':', 1)[0],)}
+    if 'key' in kinds:
+        return 'key'
+    if 'ui' in kinds:
+        return 'ui'
+    return 'unknown'
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 명령어 표
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _Value:
+    """스택/지역 변수 값: lits = 이 값에 흘러든 리터럴 집합, cat = 슬롯 수(1, 2)."""
+    __slots__ = ('lits', 'cat')
+
+    def __init__(self, lits=None, cat=1):
+        self.lits = lits if lits is not None else set()
+        self.cat = cat
+
+
+_V1 = _Value(frozenset(), 1)        # 리터럴 없는 값 (공유, 변경 금지)
+_V2 = _Value(frozenset(), 2)
+
+# opcode → (길이, 꺼내는 값 수, 넣는 값 종류 (0 없음, 1, 2)) — 단순 명령어만
+_SIMPLE = {}
+
+
+def _def(ops, length, pops, push):
+    for op in ops:
+        _SIMPLE[op] = (length, pops, push)
+
+
+_def([0], 1, 0, 0)                                   # nop
+_def([1, 2, 3, 4, 5, 6, 7, 8, 11, 12, 13], 1, 0, 1)  # aconst_null, iconst, fconst
+_def([9, 10, 14, 15], 1, 0, 2)                       # lconst, dconst
+_def([16], 2, 0, 1)                                  # bipush
+_def([17], 3, 0, 1)                                  # sipush
+_def([20], 3, 0, 2)                                  # ldc2_w
+_def([21, 23], 2, 0, 1)                              # iload, fload
+_def([22, 24], 2, 0, 2)                              # lload, dload
+_def(range(26, 30), 1, 0, 1)                         # iload_n
+_def(range(30, 34), 1, 0, 2)                         # lload_n
+_def(range(34, 38), 1, 0, 1)                         # fload_n
+_def(range(38, 42), 1, 0, 2)                         # dload_n
+_def([46, 48, 51, 52, 53], 1, 2, 1)                  # iaload, faload, baload, caload, saload
+_def([47, 49], 1, 2, 2)                              # laload, daload
+_def([54, 56], 2, 1, 0)                              # istore, fstore
+_def([55, 57], 2, 1, 0)                              # lstore, dstore
+_def(range(59, 75), 1, 1, 0)                         # istore_n … dstore_n
+_def([79, 80, 81, 82, 84, 85, 86], 1, 3, 0)          # xastore (aastore 제외)
+for _base in (96, 100, 104, 108, 112):               # add, sub, mul, div, rem
+    _def([_base, _base + 2], 1, 2, 1)
+    _def([_base + 1, _base + 3], 1, 2, 2)
+_def([116, 118], 1, 1, 1)                            # ineg, fneg
+_def([117, 119], 1, 1, 2)                            # lneg, dneg
+_def([120, 122, 124], 1, 2, 1)                       # ishl, ishr, iushr
+_def([121, 123, 125], 1, 2, 2)                       # lshl, lshr, lushr
+_def([126, 128, 130], 1, 2, 1)                       # iand, ior, ixor
+_def([127, 129, 131], 1, 2, 2)                       # land, lor, lxor
+_def([132], 3, 0, 0)                                 # iinc
+_def([133, 135, 138, 140, 141, 143], 1, 1, 2)        # i2l, i2d, l2d, f2l, f2d, d2l
+_def([134, 136, 137, 139, 142, 144, 145, 146, 147], 1, 1, 1)
+_def([148, 149, 150, 151, 152], 1, 2, 1)             # lcmp, fcmpl …
+_def([190], 1, 1, 1)                                 # arraylength
+_def([193], 3, 1, 1)                                 # instanceof
+_def([194, 195], 1, 1, 0)                            # monitorenter/exit
+_def([188], 2, 1, 1)                                 # newarray (배열 값은 아래에서 새로 만듦)
+
+_IF1 = set(range(153, 159)) | {198, 199}             # ifeq … ifle, ifnull, ifnonnull
+_IF2 = set(range(159, 167))                          # if_icmp*, if_acmp*
+_RETURNS = set(range(172, 178))                      # ireturn … return
+
+
+def _param_cats(desc: str) -> tuple:
+    """메서드 디스크립터 → (인자 슬롯 수 목록, 반환 값 종류 0/1/2)."""
+    cats = []
+    i = 1
+    while desc[i] != ')':
+        c = desc[i]
+        while c == '[':
+            i += 1
+            c = desc[i]
+            if c != '[':
+                if c == 'L':
+                    i = desc.index(';', i)
+                cats.append(1)
+                c = None
+                break
+        if c is None:
+            i += 1
+            continue
+        if c == 'L':
+            i = desc.index(';', i)
+            cats.append(1)
+        else:
+            cats.append(2 if c in 'JD' else 1)
+        i += 1
+    ret = desc[i + 1]
+    return cats, 0 if ret == 'V' else (2 if ret in 'JD' else 1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 클래스 분석
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _Pool:
+    def __init__(self, entries):
+        self.entries = entries
+        self._utf8 = {}
+
+    def utf8(self, idx: int) -> str:
+        s = self._utf8.get(idx)
+        if s is None:
+            raw = self.entries[idx][1]
+            try:
+                s = decode_java_utf8(raw)
+            except Exception:
+                s = raw.decode('utf-8', errors='replace')
+            self._utf8[idx] = s
+        return s
+
+    def u2(self, idx: int, off: int = 0) -> int:
+        return _U2.unpack_from(self.entries[idx][1], off)[0]
+
+    def member(self, idx: int) -> tuple:
+        """Fieldref/Methodref/InterfaceMethodref/InvokeDynamic → (소유 클래스, 이름, 디스크립터)."""
+        entry = self.entries[idx]
+        nat = _U2.unpack_from(entry[1], 2)[0]
+        owner = '' if entry[0] == 18 else self.utf8(self.u2(_U2.unpack_from(entry[1], 0)[0]))
+        return owner, self.utf8(self.u2(nat)), self.utf8(self.u2(nat, 2))
+
+
+def _code_attributes(data: bytes, rest_start: int, pool: _Pool, constants: list = None):
+    """메서드마다 Code 속성 (code 바이트, 예외 처리기 시작 pc 집합) 생성기.
+    constants: 주면 ConstantValue 가 문자열인 필드 (필드 이름, 리터럴)를 채움 — static final
+    상수는 ldc 없이 필드 속성에만 있음."""
+    pos = rest_start + 6
+    icount = _U2.unpack_from(data, pos)[0]
+    pos += 2 + icount * 2
+    fcount = _U2.unpack_from(data, pos)[0]; pos += 2
+    for _ in range(fcount):
+        field_name = _U2.unpack_from(data, pos + 2)[0]
+        pos += 6
+        acount = _U2.unpack_from(data, pos)[0]; pos += 2
+        for _ in range(acount):
+            if constants is not None and pool.utf8(_U2.unpack_from(data, pos)[0]) == 'ConstantValue':
+                entry = pool.entries[_U2.unpack_from(data, pos + 6)[0]]
+                if entry is not None and entry[0] == 8:
+                    constants.append((pool.utf8(field_name),
+                                      pool.utf8(_U2.unpack_from(entry[1])[0])))
+            pos += 6 + _U4.unpack_from(data, pos + 2)[0]
+    mcount = _U2.unpack_from(data, pos)[0]; pos += 2
+    for _ in range(mcount):
+        pos += 6
+        acount = _U2.unpack_from(data, pos)[0]; pos += 2
+        for _ in range(acount):
+            name_idx = _U2.unpack_from(data, pos)[0]
+            length = _U4.unpack_from(data, pos + 2)[0]
+            if pool.utf8(name_idx) == 'Code':
+                p = pos + 6 + 4                       # max_stack, max_locals
+                code_len = _U4.unpack_from(data, p)[0]; p += 4
+                code = data[p:p + code_len]; p += code_len
+                ecount = _U2.unpack_from(data, p)[0]; p += 2
+                handlers = {_U2.unpack_from(data, p + 8 * k + 4)[0] for k in range(ecount)}
+                yield code, handlers
+            pos += 6 + length
+
+
+def _merge(a: list, b: list) -> list:
+    if len(a) != len(b):
+        return a
+    out = []
+    for x, y in zip(a, b):
+        if x is y or not y.lits:
+            out.append(x)
+        elif not x.lits:
+            out.append(y)
+        else:
+            out.append(_Value(set(x.lits) | y.lits, x.cat))
+    return out
+
+
+def _analyze_method(code: bytes, handlers: set, pool: _Pool, literals: dict, uses: dict) -> bool:
+    """메서드 1개 분석. 알 수 없는 명령어에서 중단했으면 False."""
+    stack = []
+    local = {}
+    pending = {}        # 앞쪽 분기 대상 pc → 분기 시점 스택
+    dead = False
+    pc = 0
+    n = len(code)
+
+    def use(value, sink):
+        for lit in value.lits:
+            c = uses.get(lit)
+            if c is None:
+                c = uses[lit] = Counter()
+            c[sink] += 1
+
+    def pop():
+        return stack.pop() if stack else _V1
+
+    def branch(target):
+        if target > pc:
+            prev = pending.get(target)
+            pending[target] = list(stack) if prev is None else _merge(prev, stack)
+
+    while pc < n:
+        if pc in handlers:
+            stack = [_V1]
+            pending.pop(pc, None)
+        elif dead:
+            stack = pending.pop(pc, [])
+        elif pc in pending:
+            stack = _merge(stack, pending.pop(pc))
+        dead = False
+        op = code[pc]
+
+        simple = _SIMPLE.get(op)
+        if simple is not None:
+            length, pops, push = simple
+            for _ in range(pops):
+                pop()
+            if push:
+                stack.append(_Value(set(), 1) if op == 188 else (_V2 if push == 2 else _V1))
+            pc += length
+            continue
+
+        if op == 18 or op == 19:                        # ldc, ldc_w
+            idx = code[pc + 1] if op == 18 else _U2.unpack_from(code, pc + 1)[0]
+            entry = pool.entries[idx]
+            if entry is not None and entry[0] == 8:
+                text = pool.utf8(_U2.unpack_from(entry[1])[0])
+                lit = literals.setdefault(text, len(literals))
+                stack.append(_Value({lit}))
+            else:
+                stack.append(_V1)
+            pc += 2 if op == 18 else 3
+        elif op == 25 or 42 <= op <= 45:                # aload, aload_n
+            slot = code[pc + 1] if op == 25 else op - 42
+            stack.append(local.get(slot, _V1))
+            pc += 2 if op == 25 else 1
+        elif op == 58 or 75 <= op <= 78:                # astore, astore_n
+            slot = code[pc + 1] if op == 58 else op - 75
+            local[slot] = pop()
+            pc += 2 if op == 58 else 1
+        elif op == 50:                                  # aaload
+            pop()
+            arr = pop()
+            stack.append(_Value(set(arr.lits)) if arr.lits else _V1)
+            pc += 1
+        elif op == 83:                                  # aastore
+            value = pop()
+            pop()
+            arr = pop()
+            if value.lits and isinstance(arr.lits, set):
+                arr.lits |= value.lits
+            pc += 1
+        elif op == 87:                                  # pop
+            pop()
+            pc += 1
+        elif op == 88:                                  # pop2
+            if pop().cat == 1:
+                pop()
+            pc += 1
+        elif op == 89:                                  # dup
+            if stack:
+                stack.append(stack[-1])
+            pc += 1
+        elif 90 <= op <= 95:                            # dup_x1 … swap
+            _stack_shuffle(stack, op)
+            pc += 1
+        elif op in _IF1:
+            pop()
+            branch(pc + _S2.unpack_from(code, pc + 1)[0])
+            pc += 3
+        elif op in _IF2:
+            pop()
+            pop()
+            branch(pc + _S2.unpack_from(code, pc + 1)[0])
+            pc += 3
+        elif op == 167 or op == 200:                    # goto, goto_w
+            off = _S2.unpack_from(code, pc + 1)[0] if op == 167 else _S4.unpack_from(code, pc + 1)[0]
+            branch(pc + off)
+            dead = True
+            pc += 3 if op == 167 else 5
+        elif op == 168 or op == 201:                    # jsr, jsr_w
+            stack.append(_V1)
+            pc += 3 if op == 168 else 5
+        elif op == 169:                                 # ret
+            dead = True
+            pc += 2
+        elif op == 170 or op == 171:                    # tableswitch, lookupswitch
+            pop()
+            base = pc
+            p = (pc + 4) & ~3
+            targets = [base + _S4.unpack_from(code, p)[0]]
+            if op == 170:
+                low, high = _S4.unpack_from(code, p + 4)[0], _S4.unpack_from(code, p + 8)[0]
+                p += 12
+                for k in range(high - low + 1):
+                    targets.append(base + _S4.unpack_from(code, p + 4 * k)[0])
+                p += 4 * (high - low + 1)
+            else:
+                npairs = _S4.unpack_from(code, p + 4)[0]
+                p += 8
+                for k in range(npairs):
+                    targets.append(base + _S4.unpack_from(code, p + 8 * k + 4)[0])
+                p += 8 * npairs
+            for t in targets:
+                branch(t)
+            dead = True
+            pc = p
+        elif op in _RETURNS:
+            if op == 176:                               # areturn
+                use(pop(), 'return')
+            elif op != 177:
+                pop()
+            dead = True
+            pc += 1
+        elif op == 191:                                 # athrow
+            pop()
+            dead = True
+            pc += 1
+        elif 178 <= op <= 181:                          # get/putstatic, get/putfield
+            _owner, name, desc = pool.member(_U2.unpack_from(code, pc + 1)[0])
+            cat = 2 if desc[0] in 'JD' else 1
+            if op == 178:
+                stack.append(_V2 if cat == 2 else _V1)
+            elif op == 179:
+                use(pop(), 'field:' + name)
+            elif op == 180:
+                pop()
+                stack.append(_V2 if cat == 2 else _V1)
+            else:
+                use(pop(), 'field:' + name)
+                pop()
+            pc += 3
+        elif 182 <= op <= 186:                          # invoke*
+            owner, name, desc = pool.member(_U2.unpack_from(code, pc + 1)[0])
+            cats, ret = _param_cats(desc)
+            args = [pop() for _ in cats][::-1]
+            receiver = pop() if op not in (184, 186) else None
+            transparent = name in _TRANSPARENT.get(owner, ()) or op == 186
+            if transparent:
+                flow = set()
+                for v in args:
+                    flow |= v.lits
+                if receiver is not None:
+                    flow |= receiver.lits
+                    if owner in _BUILDERS and isinstance(receiver.lits, set):
+                        # sb.append("…") — 지역 변수·dup 으로 공유된 같은 빌더 값에 누적
+                        receiver.lits |= flow
+                        if name != 'toString':
+                            flow = None
+            else:
+                simple_owner = owner.rsplit('/', 1)[-1]
+                sink = f"{simple_owner}.{name}"
+                for i, v in enumerate(args):
+                    if v.lits:
+                        kind = _sink_kind(owner, name, i)
+                        use(v, f"{kind}:{sink}" if kind else sink)
+                if receiver is not None and receiver.lits:
+                    kind = _sink_kind(owner, name, -1)
+                    use(receiver, f"{kind}:{sink}" if kind else sink)
+            if ret:
+                if transparent and flow is None:
+                    stack.append(receiver)              # append/insert 는 빌더 자신을 돌려줌
+                elif transparent and flow:
+                    stack.append(_Value(flow, ret))
+                else:
+                    stack.append(_V2 if ret == 2 else _V1)
+            pc += 5 if op >= 185 else 3
+        elif op == 187:                                 # new
+            stack.append(_Value(set()))
+            pc += 3
+        elif op == 189:                                 # anewarray
+            pop()
+            stack.append(_Value(set()))
+            pc += 3
+        elif op == 192:                                 # checkcast
+            pc += 3
+        elif op == 196:                                 # wide
+            inner = code[pc + 1]
+            if inner == 132:
+                pc += 6
+            else:
+                slot = _U2.unpack_from(code, pc + 2)[0]
+                if inner == 25:
+                    stack.append(local.get(slot, _V1))
+                elif inner == 58:
+                    local[slot] = pop()
+                elif inner in (21, 23):
+                    stack.append(_V1)
+                elif inner in (22, 24):
+                    stack.append(_V2)
+                elif inner == 169:
+                    dead = True
+                else:
+                    pop()
+                pc += 4
+        elif op == 197:                                 # multianewarray
+            for _ in range(code[pc + 3]):
+                pop()
+            stack.append(_Value(set()))
+            pc += 4
+        else:
+            return False                                # 알 수 없는 명령어 — 이 메서드 중단
+    return True
+
+
+def _stack_shuffle(stack: list, op: int) -> None:
+    """dup_x1, dup_x2, dup2, dup2_x1, dup2_x2, swap (값 종류에 따른 형식 구분)."""
+    if len(stack) < 2 and op != 92:
+        return
+    if op == 95:                                        # swap
+        stack[-1], stack[-2] = stack[-2], stack[-1]
+    elif op == 90:                                      # dup_x1
+        stack.insert(-2, stack[-1])
+    elif op == 91:                                      # dup_x2
+        depth = 2 if stack[-2].cat == 2 else 3
+        stack.insert(-depth, stack[-1])
+    elif op == 92:                                      # dup2
+        if stack and stack[-1].cat == 2:
+            stack.append(stack[-1])
+        elif len(stack) >= 2:
+            stack.extend(stack[-2:])
+    elif op == 93:                                      # dup2_x1
+        if stack[-1].cat == 2:
+            stack.insert(-2, stack[-1])
+        elif len(stack) >= 3:
+            top = stack[-2:]
+            stack[-3:-3] = top
+    elif op == 94:                                      # dup2_x2
+        if stack[-1].cat == 2:
+            depth = 2 if stack[-2].cat == 2 else 3
+            stack.insert(-depth, stack[-1])
+        elif len(stack) >= 3:
+            top = stack[-2:]
+            depth = 3 if stack[-3].cat == 2 else 4
+            stack[-depth:-depth] = top
+
+
+def analyze_class(data: bytes, stats: Counter = None) -> dict:
+    """.class 바이트 → {리터럴: Counter(소비처)}. 소비처: 'key:Owner.m', 'ui:Owner.m', 'Owner.m',
+    'return', 'field:이름' — 소비되지 않은 리터럴은 빈 Counter.
+    stats: 주면 'methods' (분석한 메서드), 'incomplete' (끝까지 못 따라간 메서드) 를 셈."""
+    try:
+        entries, rest_start = parse_constant_pool(data)
+    except (ValueError, struct.error, IndexError):
+        return {}
+    pool = _Pool(entries)
+    literals, uses, constants = {}, {}, []
+    try:
+        for code, handlers in _code_attributes(data, rest_start, pool, constants):
+            try:
+                complete = _analyze_method(code, handlers, pool, literals, uses)
+            except (struct.error, IndexError, KeyError, TypeError, ValueError):
+                complete = False                        # 깨진 메서드는 건너뜀
+            if stats is not None:
+                stats['methods'] += 1
+                stats['incomplete'] += not complete
+    except (struct.error, IndexError):
+        pass
+    for name, text in constants:
+        lit = literals.setdefault(text, len(literals))
+        uses.setdefault(lit, Counter())['field:' + name] += 1
+    return {text: uses.get(lit, Counter()) for text, lit in literals.items()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# JAR 단위 + 캐시
+# ──────────────────────────────────────────────────────────────────────────────
+
+class LiteralUsage:
+    """
+    JAR 1개의 리터럴 용도.
+        sinks    {리터럴: Counter(소비처)}
+        classes  {리터럴: [클래스 경로, …]}
+    """
+
+    def __init__(self, jar_name: str, sinks: dict, classes: dict):
+        self.jar_name = jar_name
+        self.sinks = sinks
+        self.classes = classes
+
+    def usage(self, text: str) -> str:
+        sinks = self.sinks.get(text)
+        return classify(sinks) if sinks is not None else 'unknown'
+
+    def literals(self, usage: str = None) -> set:
+        if usage is None:
+            return set(self.sinks)
+        return {t for t, s in self.sinks.items() if classify(s) == usage}
+
+
+def _analyze_range(jar_path: str, lo: int, hi: int) -> tuple:
+    sinks, classes, stats = {}, {}, Counter()
+    with zipfile.ZipFile(jar_path, 'r') as zf:
+        infos = [i for i in zf.infolist() if i.filename.endswith('.class')][lo:hi]
+        for info in infos:
+            try:
+                data = zf.read(info)
+            except Exception:
+                continue
+            for text, counter in analyze_class(data, stats).items():
+                total = sinks.get(text)
+                if total is None:
+                    sinks[text] = counter
+                    classes[text] = [info.filename]
+                else:
+                    total.update(counter)
+                    classes[text].append(info.filename)
+    return sinks, classes, stats
+
+
+def _analyze_jar(jar_path: Path, jobs: int = None) -> tuple:
+    with zipfile.ZipFile(jar_path, 'r') as zf:
+        total = sum(1 for i in zf.infolist() if i.filename.endswith('.class'))
+    jobs = min(jobs or os.cpu_count() or 1, max(1, total // (_PARALLEL_MIN_CLASSES // 2)))
+    if jobs <= 1 or total < _PARALLEL_MIN_CLASSES:
+        return _analyze_range(str(jar_path), 0, total)
+    step = -(-total // (jobs * 4))
+    bounds = [(lo, min(lo + step, total)) for lo in range(0, total, step)]
+    sinks, classes, stats = {}, {}, Counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part_sinks, part_classes, part_stats in pool.map(
+                _analyze_range, [str(jar_path)] * len(bounds),
+                [lo for lo, _ in bounds], [hi for _, hi in bounds]):
+            stats.update(part_stats)
+            for text, counter in part_sinks.items():
+                if text in sinks:
+                    sinks[text].update(counter)
+                    classes[text].extend(part_classes[text])
+                else:
+                    sinks[text] = counter
+                    classes[text] = part_classes[text]
+    return sinks, classes, stats
+
+
+def load_usage(jar_path, jobs: int = None) -> LiteralUsage:
+    """JAR 리터럴 용도. intermediate/literal_usage/{jar}-{내용 해시}.pickle 캐시."""
+    jar_path = Path(jar_path)
+    key = corpus_key(jar_path)
+    cache = CACHE_DIR / f"{jar_path.name}-{key}.pickle"
+    try:
+        with open(cache, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') == USAGE_VERSION:
+            return LiteralUsage(jar_path.name, payload['sinks'], payload['classes'])
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+        pass
+
+    start = time.perf_counter()
+    sinks, classes, stats = _analyze_jar(jar_path, jobs)
+    elapsed = time.perf_counter() - start
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        pickle.dump({'version': USAGE_VERSION, 'sinks': sinks, 'classes': classes}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache)
+    for old in CACHE_DIR.glob(f"{jar_path.name}-*.pickle"):
+        if old != cache:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    print(f"  리터럴 용도 분석: {jar_path.name} (리터럴 {len(sinks)}개, 메서드 {stats['methods']}개, "
+          f"{elapsed:.1f}s)")
+    if stats['incomplete']:
+        print(f"  WARN: 끝까지 분석하지 못한 메서드 {stats['incomplete']}개 "
+              f"(알 수 없는 명령어/깨진 코드 — 이후 리터럴 누락 가능)")
+    return LiteralUsage(jar_path.name, sinks, classes)
+
+
+def _default_jars() -> list:
+    from backup_store import original_path
+    from patch_utils import load_config, resolve_path
+    paths = load_config()['paths']
+    game_core = Path(resolve_path(paths['game_core']))
+    jars = []
+    for name in ('starfarer.api.jar', 'starfarer_obf.jar'):
+        original = original_path(paths, f'core/{name}')
+        for p in ((Path(original),) if original else ()) + (game_core / (name + '.bak'),
+                                                             game_core / name):
+            if p.is_file():
+                jars.append(p)
+                break
+    return jars
+
+
+def main():
+    parser = argparse.ArgumentParser(description='바이트코드 리터럴 용도 분석')
+    parser.add_argument('--jar', action='append', help='분석할 JAR (반복 가능)')
+    parser.add_argument('--out', default=str(_BASE / 'intermediate' / 'literal_usage.json'))
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--show', type=int, default=0, help='용도별 예시 N개 출력')
+    args = parser.parse_args()
+
+    jars = [Path(j) for j in args.jar] if args.jar else _default_jars()
+    if not jars:
+        print("ERROR: 분석할 JAR 없음", file=sys.stderr)
+        sys.exit(1)
+
+    result = {}
+    for jar in jars:
+        usage = load_usage(jar, args.jobs)
+        for text, sinks in usage.sinks.items():
+            entry = result.get(text)
+            if entry is None:
+                entry = result[text] = {'sinks': Counter(), 'classes': []}
+            entry['sinks'].update(sinks)
+            entry['classes'].extend(f"{jar.name}:{c}" for c in usage.classes[text])
+
+    output = {}
+    counts = Counter()
+    for text in sorted(result):
+        entry = result[text]
+        kind = classify(entry['sinks'])
+        counts[kind] += 1
+        output[text] = {'usage': kind, 'sinks': dict(entry['sinks'].most_common()),
+                        'classes': entry['classes']}
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"리터럴 {len(output)}개: ui {counts['ui']}, key {counts['key']}, "
+          f"unknown {counts['unknown']} → {args.out}")
+
+    if args.show:
+        for kind in ('ui', 'key', 'unknown'):
+            print(f"\n[{kind}]")
+            for text in [t for t, e in output.items() if e['usage'] == kind][:args.show]:
+                print(f"  {text!r:50s} ← {', '.join(list(output[text]['sinks'])[:3])}")
+
+
+if __name__ == '__main__':
+    main()
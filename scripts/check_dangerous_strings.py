@@ -1,8 +1,32 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+"""
+check_dangerous_strings.py - 단일 단어 문자열이 코드에서 ID/키로 쓰이는지 확인
+
+api_src/ 리터럴 색인(java_literals 캐시)을 한 번만 훑어, 단어 집합에 있는 리터럴이
+equals/get/put/containsKey/return/case 등 ID/키 용도로 쓰인 곳을 모두 찾음.
+색인이 없거나 오래되면 바뀐 .java 만 작업자 프로세스에 나눠 다시 토큰화.
+
+사용법:
+    python scripts/check_dangerous_strings.py                 # 기본 단어 목록
+    python scripts/check_dangerous_strings.py --dict          # 사전의 한 단어 키 전체
+    python scripts/check_dangerous_strings.py --words fleet,crew --out report.json
+
+옵션:
+    --dict         common + api_jar + obf_jar 사전에서 공백 없는 키 전체를 검사
+    --words A,B    검사할 단어 (쉼표 구분, --dict 와 함께 쓰면 합침)
+    --src DIR      Java 소스 폴더 (기본 api_src/)
+    --jobs N       색인 토큰화 작업자 수 (기본 CPU 수)
+    --out FILE     {단어: [{"file", "line", "usage"}, …]} JSON 저장
+"""
+
 from pathlib import Path
-import os, re, json
+import argparse, json, re, sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from dict_compiler import effective_dictionary
+from java_literals import key_usage, load_literal_index
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
@@ -27,38 +51,66 @@ dangerous_words = ['memory', 'battle', 'fleet', 'crew', 'credits', 'mission',
                    'combat', 'stability', 'unit', 'units', 'point', 'points',
                    'slot', 'slots', 'day', 'days', 'hour', 'hours', 'year', 'years']
 
-# Find unsafe usages
-unsafe_patterns = [
-    r'\.equals\s*\(\s*"{}"\s*\)',
-    r'\.equalsIgnoreCase\s*\(\s*"{}"\s*\)',
-    r'\.get\s*\(\s*"{}"\s*\)',
-    r'\.put\s*\(\s*"{}"\s*,',
-    r'\.containsKey\s*\(\s*"{}"\s*\)',
-    r'return\s+"{}"\s*;',
-    r'case\s+"{}"\s*:',
-]
-
-dangerous = set()
-
-for word in dangerous_words:
-    for root, dirs, files in os.walk(NEW_SRC):
-        if word in dangerous:
-            break
-        for fname in files:
-            if not fname.endswith('.java'):
-                continue
-            path = os.path.join(root, fname)
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-            for pat_template in unsafe_patterns:
-                pat = pat_template.format(re.escape(word))
-                if re.search(pat, content):
-                    dangerous.add(word)
-                    print(f"DANGEROUS: '{word}' used as ID/key in {fname}")
-                    break
-            if word in dangerous:
-                break
-
-print(f"\nDangerous short words (should NOT be translated): {len(dangerous)}")
-for w in sorted(dangerous):
-    print(f"  '{w}'")
+# Unsafe usages (java_literals.key_usage): .equals/.equalsIgnoreCase/.get/.containsKey("w"),
+# "w".equals(…), .put("w", …), return "w";, case "w":
+UNSAFE_USAGES = {'equals', 'equalsIgnoreCase', 'get', 'put', 'containsKey', 'return', 'case'}
+
+_SINGLE_WORD = re.compile(r'^\S*[A-Za-z]\S*$')
+
+
+def dictionary_words() -> set:
+    """전체 사전(common + api_jar + obf_jar)에서 공백 없는 키."""
+    return {k for k in effective_dictionary(_p, 'all') if _SINGLE_WORD.match(k)}
+
+
+def find_key_usages(src_dir, words: set, jobs: int = None) -> dict:
+    """{단어: [(상대경로, 줄, 용도), …]} — 리터럴 색인 1회 순회, 단어 수와 무관."""
+    found = {}
+    for rel, lit in load_literal_index(src_dir, jobs).literals():
+        if lit.text not in words:
+            continue
+        usage = key_usage(lit)
+        if usage in UNSAFE_USAGES:
+            found.setdefault(lit.text, []).append((rel, lit.line, usage))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='단일 단어 문자열의 ID/키 사용 검사')
+    parser.add_argument('--dict', action='store_true', help='사전의 한 단어 키 전체 검사')
+    parser.add_argument('--words', help='쉼표로 구분한 단어 목록')
+    parser.add_argument('--src', default=NEW_SRC)
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--out')
+    args = parser.parse_args()
+
+    words = set()
+    if args.dict:
+        words |= dictionary_words()
+    if args.words:
+        words |= {w.strip() for w in args.words.split(',') if w.strip()}
+    if not words:
+        words = set(dangerous_words)
+    print(f"검사 단어: {len(words)}개")
+
+    found = find_key_usages(args.src, words, args.jobs)
+    for word in sorted(found):
+        sites = found[word]
+        rel, line, usage = sites[0]
+        more = f" (+{len(sites) - 1})" if len(sites) > 1 else ''
+        print(f"DANGEROUS: '{word}' used as ID/key ({usage}) in {Path(rel).name}:{line}{more}")
+
+    print(f"\nDangerous short words (should NOT be translated): {len(found)}")
+    for w in sorted(found):
+        print(f"  '{w}'")
+
+    if args.out:
+        report = {w: [{'file': rel, 'line': line, 'usage': usage} for rel, line, usage in sites]
+                  for w, sites in sorted(found.items())}
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
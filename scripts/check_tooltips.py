@@ -2,10 +2,13 @@
 # -*- coding: utf-8 -*-
 
 from pathlib import Path
-import re, json, os
+import json, os, sys
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(Path(__file__).parent))
+from loose_json import collect_keys, load as load_loose_json
+
 def _resolve(p):
     if isinstance(p, str) and (p.startswith('./') or p.startswith('../') or p == '.'):
         return str((SCRIPT_DIR / p).resolve())
@@ -19,10 +22,7 @@ GAME_CORE = _resolve(_p['game_core'])
 GAME_MODS = _resolve(_p['game_mods'])
 
 def extract_keys(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    keys = re.findall(r'"([^"]+)"\s*:', content)
-    return set(keys)
+    return collect_keys(load_loose_json(filepath))
 
 # Check tooltips
 game_keys = extract_keys(os.path.join(GAME_CORE, 'data/strings/tooltips.json'))
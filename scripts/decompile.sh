@@ -2,7 +2,7 @@
 # 02_decompile.sh - CFR로 현재 버전 api JAR 디컴파일
 #
 # 게임 업데이트 시 04_find_strings.py, check_dangerous_strings.py 등
-# 소스 분석 스크립트를 위해 api_src/ 를 재생성.
+# 소스 분석 스크립트를 위해 api_src/ 를 갱신 (scripts/decompile_cache.py).
 #
 # 사전 요구사항:
 #   - tools/cfr.jar 존재
@@ -16,17 +16,15 @@ GAME_ROOT="$(cd "$BASE/.." && pwd)"
 JAVA="$GAME_ROOT/jre/bin/java"
 CFR="$BASE/tools/cfr.jar"
 
-echo "=== api JAR 디컴파일 (CFR) ==="
+echo "=== api JAR 디컴파일 (CFR, 클래스 해시 캐시) ==="
 
-mkdir -p "$BASE/api_src"
-rm -rf "$BASE/api_src/"* 2>/dev/null || true
-
-# 현재 버전 JAR 디컴파일
-echo "starfarer.api.jar 디컴파일 중..."
-"$JAVA" -jar "$CFR" \
+# 바뀐 클래스만 CFR 로 다시 디컴파일 (패키지 샤드 병렬), 나머지는
+# intermediate/decompile_cache/ 에서 재사용. 사라진 클래스의 .java 는 삭제.
+python "$BASE/scripts/decompile_cache.py" \
     "$GAME_CORE/starfarer.api.jar" \
-    --outputdir "$BASE/api_src/" \
-    --silent true
+    "$BASE/api_src" \
+    --java "$JAVA" \
+    --cfr "$CFR"
 echo "  완료: $(find "$BASE/api_src" -name '*.java' | wc -l) Java 파일"
 
 echo ""
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+decompile_cache.py - 클래스 해시별 증분 CFR 디컴파일 캐시
+
+JAR 의 클래스를 최상위 클래스 단위(Foo + Foo$1, Foo$Inner …)로 묶어 바이트 해시를 내고,
+CFR 출력 .java 를 그 해시로 intermediate/decompile_cache/cfr-{CFR 해시}/ 에 저장.
+바이트가 같은 클래스는 게임 버전·JAR 이 달라도 캐시를 그대로 씀 → 게임 업데이트 때는
+실제로 바뀐 클래스만 디컴파일.
+
+캐시에 없는 클래스는 패키지 단위로 묶은 샤드 JAR 로 만들어 CFR 을 여러 개 동시에 실행
+(원본 JAR 을 --extraclasspath 로 넘겨 다른 클래스 참조 해석). 출력 폴더는
+.decompile_manifest.json 과 비교해 바뀐 .java 만 다시 쓰고 사라진 클래스의 .java 는 지움
+— 안 바뀐 파일은 mtime 이 그대로라 java_literals 색인도 그대로 재사용.
+
+사용법:
+    python scripts/decompile_cache.py JAR OUT_DIR [--jobs N] [--java PATH] [--cfr PATH]
+        예: python scripts/decompile_cache.py ../starsector-core/starfarer.api.jar api_src
+        --java 기본: 게임 내장 JRE (game_core/../jre/bin/java), 없으면 PATH 의 java
+
+공개 API:
+    decompile(jar_path, out_dir, cfr_jar, java_cmd, jobs=None) -> bool
+    default_java(paths) -> str
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import load_config, resolve_path
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+CACHE_DIR = _BASE / 'intermediate' / 'decompile_cache'
+DEFAULT_CFR = _BASE / 'tools' / 'cfr.jar'
+MANIFEST = '.decompile_manifest.json'
+_SHARD_MIN_CLASSES = 50     # JVM 기동 비용 대비 샤드 최소 크기 (패키지를 이보다 작게 쪼개지 않음)
+
+
+def default_java(paths: dict) -> str:
+    """게임 내장 JRE java, 없으면 'java' (PATH)."""
+    java = Path(resolve_path(paths.get('game_core', '../starsector-core'))).parent / 'jre' / 'bin' / 'java'
+    return str(java) if java.exists() else 'java'
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _class_groups(zf: zipfile.ZipFile) -> dict:
+    """{출력 .java 상대 경로: [클래스 엔트리, …]} — 내부 클래스는 최상위 클래스 파일에 합쳐짐."""
+    names = {i.filename for i in zf.infolist() if i.filename.endswith('.class')}
+    groups = defaultdict(list)
+    for name in sorted(names):
+        stem = name[:-len('.class')]
+        outer = stem.split('$', 1)[0]
+        if outer + '.class' not in names:
+            outer = stem            # 최상위 클래스가 없는 내부 클래스 — 단독 출력
+        groups[outer + '.java'].append(name)
+    return groups
+
+
+def _group_hash(zf: zipfile.ZipFile, entries: list) -> str:
+    h = hashlib.sha1()
+    for name in entries:
+        data = zf.read(name)
+        h.update(name.encode('utf-8'))
+        h.update(len(data).to_bytes(8, 'big'))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _shards(missing: dict, jobs: int) -> list:
+    """캐시에 없는 그룹 {상대 경로: …} → 샤드 [[상대 경로, …], …] — 패키지는 쪼개지 않음."""
+    by_package = defaultdict(list)
+    for rel in missing:
+        by_package[rel.rpartition('/')[0]].append(rel)
+    target = max(_SHARD_MIN_CLASSES, -(-len(missing) // (jobs * 2)))
+    shards, current = [], []
+    for package in sorted(by_package):
+        current.extend(by_package[package])
+        if len(current) >= target:
+            shards.append(current)
+            current = []
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _run_shard(zf_path: Path, groups: dict, shard: list, cfr_jar: Path, java_cmd: str,
+               work: Path, n: int) -> tuple:
+    """샤드 1개 CFR 실행 → ({상대 경로: .java 바이트}, CFR 종료 코드)."""
+    shard_jar = work / f"shard{n}.jar"
+    out = work / f"out{n}"
+    with zipfile.ZipFile(zf_path, 'r') as src, zipfile.ZipFile(shard_jar, 'w') as dst:
+        for rel in shard:
+            for name in groups[rel]:
+                dst.writestr(name, src.read(name))
+    cmd = [java_cmd, '-jar', str(cfr_jar), str(shard_jar), '--outputdir', str(out),
+           '--extraclasspath', str(zf_path), '--silent', 'true']
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    produced = {}
+    for rel in shard:
+        java = out / rel
+        if java.is_file():
+            produced[rel] = java.read_bytes()
+    return produced, result.returncode
+
+
+def decompile(jar_path, out_dir, cfr_jar=DEFAULT_CFR, java_cmd: str = 'java',
+              jobs: int = None) -> bool:
+    """
+    JAR → out_dir/{패키지}/{클래스}.java (캐시에 없는 클래스만 CFR 실행).
+    CFR JAR 이 없거나, 캐시에 없는 클래스가 있는데 Java 가 없으면 False.
+    """
+    jar_path, out_dir, cfr_jar = Path(jar_path), Path(out_dir), Path(cfr_jar)
+    if not cfr_jar.exists():
+        print(f"  WARN: CFR JAR 없음: {cfr_jar}")
+        return False
+    cache = CACHE_DIR / f"cfr-{_file_hash(cfr_jar)[:12]}"
+
+    start = time.perf_counter()
+    with zipfile.ZipFile(jar_path, 'r') as zf:
+        groups = _class_groups(zf)
+        hashes = {rel: _group_hash(zf, entries) for rel, entries in groups.items()}
+
+    def cached(h: str) -> Path:
+        return cache / h[:2] / f"{h}.java"
+
+    missing = {rel: h for rel, h in hashes.items() if not cached(h).is_file()}
+    failed = 0
+    if missing and shutil.which(java_cmd) is None:
+        print(f"  WARN: Java 없음: {java_cmd} — 캐시에 없는 클래스 {len(missing)}개 디컴파일 불가")
+        return False
+    if missing:
+        jobs = jobs or os.cpu_count() or 1
+        shards = _shards(missing, jobs)
+        print(f"  CFR 디컴파일: {jar_path.name} — {len(missing)}/{len(hashes)}개 클래스, "
+              f"샤드 {len(shards)}개 × 동시 {min(jobs, len(shards))}")
+        with tempfile.TemporaryDirectory(prefix='cfr_') as tmp:
+            # 실제 작업은 자식 JVM 이 하므로 스레드로 충분
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_run_shard, jar_path, groups, shard, cfr_jar, java_cmd,
+                                       Path(tmp), n) for n, shard in enumerate(shards)]
+                for future in futures:
+                    produced, returncode = future.result()
+                    if returncode != 0:
+                        print("  WARN: CFR 오류 (일부 클래스 디컴파일 실패할 수 있음)")
+                    for rel, source in produced.items():
+                        target = cached(missing[rel])
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        part = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+                        part.write_bytes(source)
+                        os.replace(part, target)
+        failed = sum(1 for h in missing.values() if not cached(h).is_file())
+
+    # 출력 폴더 갱신: 해시가 바뀐 파일만 쓰고, 사라진 클래스의 .java 는 삭제
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    written = 0
+    current = {}
+    for rel, h in hashes.items():
+        target = out_dir / rel
+        if previous.get(rel) == h and target.is_file():
+            current[rel] = h
+            continue
+        if not cached(h).is_file():
+            if target.is_file():
+                target.unlink()     # 바뀐 클래스의 옛 소스를 남기지 않음
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached(h), target)
+        current[rel] = h
+        written += 1
+    removed = 0
+    for java in out_dir.rglob('*.java'):
+        if java.relative_to(out_dir).as_posix() not in current:
+            java.unlink()
+            removed += 1
+    for d in sorted((p for p in out_dir.rglob('*') if p.is_dir()), reverse=True):
+        if not any(d.iterdir()):
+            d.rmdir()
+    tmp_manifest = manifest_path.with_name(f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(tmp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=0, sort_keys=True)
+    os.replace(tmp_manifest, manifest_path)
+
+    print(f"  디컴파일: {jar_path.name} → {out_dir} (클래스 {len(hashes)}개, "
+          f"CFR {len(missing)}개, 캐시 재사용 {len(hashes) - len(missing)}개, "
+          f"갱신 {written}개, 삭제 {removed}개"
+          + (f", 실패 {failed}개" if failed else '') + f", {time.perf_counter() - start:.1f}s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='클래스 해시별 증분 CFR 디컴파일')
+    parser.add_argument('jar')
+    parser.add_argument('out_dir')
+    parser.add_argument('--jobs', type=int, default=None, help='동시 CFR 프로세스 수')
+    parser.add_argument('--java', default=None)
+    parser.add_argument('--cfr', default=str(DEFAULT_CFR))
+    args = parser.parse_args()
+
+    java_cmd = args.java or default_java(load_config()['paths'])
+    if not decompile(args.jar, args.out_dir, args.cfr, java_cmd, args.jobs):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+dict_compiler.py - 계층형 번역 사전 컴파일러 (common + 대상별 + 모드별 − 제외목록)
+
+"common + api_jar", "common + 모드 전용 − blocked_strings − blocked_jar_strings" 같은
+유효 사전(effective dictionary)을 한 번만 병합해 intermediate/dict_cache/ 에 컴파일된
+바이너리로 저장하고, 이후에는 mmap 으로 열어 dict 를 만들지 않고 조회함.
+
+산출물 이름에 소스 파일(사전 + exclusions.json) 내용 해시가 들어가므로, 소스가
+바뀌면 새 이름으로 다시 컴파일되고 이전 버전은 삭제됨. 소스 stat(크기·mtime)이
+그대로면 {대상}.stamp 에 기록한 해시를 재사용 → 시작 시 JSON 을 읽지 않음.
+
+대상 (target):
+    common    common.json
+    api       common + api_jar.json − (blocked_strings ∪ blocked_jar_strings)
+    obf       common + obf_jar.json − (blocked_strings ∪ blocked_jar_strings)
+    all       common + api_jar + obf_jar (제외 없음, 분석·스펙 CSV 용)
+    mod       patches/{mod}/translations.json − blocked_strings (전역 ∪ 모드)
+    mod_all   common + patches/{mod}/translations.json (제외 없음, 후보 추출 시 기존 번역 판정용)
+    mod_jar   common + patches/{mod}/translations.json
+              − (blocked_strings ∪ blocked_jar_strings) (전역 ∪ 모드)
+
+파일 형식 (리틀 엔디언):
+    header   MAGIC(8) + count(u32) + table_size(u32) + excluded(u32, 제외목록으로 빠진 항목 수)
+    entries  count × (key_off, key_len, val_off, val_len) u32 — 키(UTF-8 바이트) 정렬순
+    table    table_size × u32 해시 슬롯 (엔트리 번호 + 1, 0 = 빈 슬롯, crc32 선형 탐사)
+    data     키/값 UTF-8 바이트 (surrogatepass)
+
+공개 API:
+    CompiledDict(path)                                   읽기 전용 Mapping (mmap), .excluded
+    compile_dict(mapping, path, excluded=0) -> None
+    effective_dictionary(paths, target, mod_id=None) -> CompiledDict
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections.abc import ItemsView, Mapping, ValuesView
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import load_exclusions_file, resolve_path
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+CACHE_DIR = _BASE / 'intermediate' / 'dict_cache'
+
+MAGIC = b'KRDICT\x00\x02'
+_HEADER = struct.Struct('<8sIII')
+_ENTRY = struct.Struct('<IIII')
+_SLOT = struct.Struct('<I')
+
+
+def _encode(s: str) -> bytes:
+    return s.encode('utf-8', 'surrogatepass')
+
+
+def _decode(b: bytes) -> str:
+    return b.decode('utf-8', 'surrogatepass')
+
+
+class CompiledDict(Mapping):
+    """
+    compile_dict 산출물을 mmap 으로 연 읽기 전용 사전.
+    get / in / [] 는 해시 슬롯 조회, 반복은 키 정렬순. excluded: 컴파일 때 제외목록으로 뺀 항목 수.
+    pickle 시 경로만 전달
+    (프로세스 풀 작업자가 같은 파일을 다시 mmap — 페이지 캐시 공유).
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._table_size, self.excluded = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"컴파일된 사전 형식 아님: {self.path}")
+        self._entries = _HEADER.size
+        self._table = self._entries + self._count * _ENTRY.size
+        self._mask = self._table_size - 1
+
+    def __reduce__(self):
+        return (CompiledDict, (self.path,))
+
+    def close(self):
+        self._mm.close()
+
+    def _find(self, key):
+        """키 → (엔트리 번호, 값 오프셋, 값 길이). 없으면 엔트리 번호 -1."""
+        if not isinstance(key, str):
+            return -1, 0, 0
+        kb = _encode(key)
+        n = len(kb)
+        mm = self._mm
+        table, entries, mask = self._table, self._entries, self._mask
+        slot_at, entry_at = _SLOT.unpack_from, _ENTRY.unpack_from
+        slot = zlib.crc32(kb) & mask
+        while True:
+            idx = slot_at(mm, table + slot * 4)[0]
+            if idx == 0:
+                return -1, 0, 0
+            k_off, k_len, v_off, v_len = entry_at(mm, entries + (idx - 1) * 16)
+            if k_len == n and mm[k_off:k_off + n] == kb:
+                return idx - 1, v_off, v_len
+            slot = (slot + 1) & mask
+
+    def __getitem__(self, key):
+        i, v_off, v_len = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return _decode(self._mm[v_off:v_off + v_len])
+
+    def get(self, key, default=None):
+        i, v_off, v_len = self._find(key)
+        return default if i < 0 else _decode(self._mm[v_off:v_off + v_len])
+
+    def __contains__(self, key):
+        return self._find(key)[0] >= 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        mm = self._mm
+        for i in range(self._count):
+            k_off, k_len, _v_off, _v_len = _ENTRY.unpack_from(mm, self._entries + i * _ENTRY.size)
+            yield _decode(mm[k_off:k_off + k_len])
+
+    def _iter_entries(self):
+        mm = self._mm
+        for i in range(self._count):
+            k_off, k_len, v_off, v_len = _ENTRY.unpack_from(mm, self._entries + i * _ENTRY.size)
+            yield _decode(mm[k_off:k_off + k_len]), _decode(mm[v_off:v_off + v_len])
+
+    def items(self):
+        return _CompiledItems(self)
+
+    def values(self):
+        return _CompiledValues(self)
+
+    def to_dict(self) -> dict:
+        """전체를 dict 로 (반복 조회가 매우 많은 경우용)."""
+        return dict(self._iter_entries())
+
+
+class _CompiledItems(ItemsView):
+    """items() 반복 시 키마다 해시 조회하지 않고 엔트리 표를 순서대로 읽음."""
+
+    def __iter__(self):
+        return self._mapping._iter_entries()
+
+
+class _CompiledValues(ValuesView):
+    def __iter__(self):
+        return (v for _k, v in self._mapping._iter_entries())
+
+
+def compile_dict(mapping, path, excluded: int = 0) -> None:
+    """str → str 매핑을 컴파일된 사전 파일로 저장 (임시 파일 + os.replace)."""
+    items = sorted((_encode(k), _encode(v)) for k, v in mapping.items())
+    count = len(items)
+    table_size = 8
+    while table_size < count * 2:
+        table_size *= 2
+    mask = table_size - 1
+
+    data_start = _HEADER.size + count * _ENTRY.size + table_size * 4
+    entries = bytearray()
+    data = bytearray()
+    table = [0] * table_size
+    for i, (kb, vb) in enumerate(items):
+        k_off = data_start + len(data)
+        data += kb
+        v_off = data_start + len(data)
+        data += vb
+        entries += _ENTRY.pack(k_off, len(kb), v_off, len(vb))
+        slot = zlib.crc32(kb) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = i + 1
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, count, table_size, excluded))
+        f.write(entries)
+        f.write(struct.pack(f'<{table_size}I', *table))
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 유효 사전: 계층 정의 + 소스 해시 → 컴파일 산출물
+# ──────────────────────────────────────────────────────────────────────────────
+
+# target → (paths 키 계층, 제외할 exclusions 항목, 모드 사전 포함 위치)
+#   제외 항목: 0 = blocked_strings, 1 = blocked_jar_strings
+_TARGETS = {
+    'common':  (('translations',), (), None),
+    'api':     (('translations', 'api_trans'), (0, 1), None),
+    'obf':     (('translations', 'obf_trans'), (0, 1), None),
+    'all':     (('translations', 'api_trans', 'obf_trans'), (), None),
+    'mod':     ((), (0,), 'mod'),
+    'mod_all': (('translations',), (), 'mod'),
+    'mod_jar': (('translations',), (0, 1), 'mod'),
+}
+
+
+def _sources(paths: dict, target: str, mod_id: str = None) -> tuple:
+    """(병합 순서대로의 사전 파일 목록, exclusions 파일 목록)"""
+    if target not in _TARGETS:
+        raise ValueError(f"알 수 없는 사전 대상: {target}")
+    keys, excluded, mod_layer = _TARGETS[target]
+    if mod_layer and not mod_id:
+        raise ValueError(f"'{target}' 사전에는 mod_id 가 필요함")
+
+    layers = [Path(resolve_path(paths[k])) for k in keys if paths.get(k)]
+    excl_files = []
+    if mod_layer:
+        patch_dir = Path(resolve_path(paths['patches'])) / mod_id
+        layers.append(patch_dir / 'translations.json')
+    if excluded:
+        if paths.get('exclusions'):
+            excl_files.append(Path(resolve_path(paths['exclusions'])))
+        if mod_id:
+            excl_files.append(Path(resolve_path(paths['patches'])) / mod_id / 'exclusions.json')
+    return layers, excl_files
+
+
+def _source_key(target: str, layers: list, excl_files: list) -> str:
+    h = hashlib.sha1(MAGIC + target.encode())
+    for p in layers + [None] + excl_files:
+        if p is None:
+            h.update(b'\x00--\x00')
+            continue
+        h.update(str(p).encode('utf-8', 'replace') + b'\x00')
+        if p.exists():
+            h.update(hashlib.sha1(p.read_bytes()).digest())
+        else:
+            h.update(b'-')
+    return h.hexdigest()[:16]
+
+
+def _stat_signature(files: list) -> str:
+    """소스 파일 (경로, 크기, mtime) 서명 — 바뀌지 않았으면 내용 해시 계산을 생략."""
+    h = hashlib.sha1(MAGIC)
+    for p in files:
+        try:
+            st = p.stat()
+            h.update(f"{p}\x00{st.st_size}\x00{st.st_mtime_ns}\x00".encode('utf-8', 'replace'))
+        except OSError:
+            h.update(f"{p}\x00-\x00".encode('utf-8', 'replace'))
+    return h.hexdigest()
+
+
+def _cached_source_key(name: str, target: str, layers: list, excl_files: list) -> str:
+    """
+    {name}.stamp 에 (stat 서명 → 내용 해시 키)를 기록해 두고, stat 이 그대로면 재사용.
+    stat 이 바뀌면 (touch 포함) 내용 해시를 다시 계산 — 내용이 같으면 같은 키.
+    """
+    stamp = CACHE_DIR / f"{name}.stamp"
+    sig = _stat_signature(layers + excl_files)
+    try:
+        with open(stamp, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('stat') == sig:
+            return saved['key']
+    except (OSError, ValueError, KeyError):
+        pass
+    key = _source_key(target, layers, excl_files)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = stamp.with_name(f"{stamp.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'stat': sig, 'key': key}, f)
+    os.replace(tmp, stamp)
+    return key
+
+
+def _build_effective(target: str, layers: list, excl_files: list) -> tuple:
+    merged = {}
+    for p in layers:
+        if p.exists():
+            with open(p, encoding='utf-8') as f:
+                merged.update(json.load(f))
+    blocked = set()
+    excluded = _TARGETS[target][1]
+    for p in excl_files:
+        _classes, strings, jar_strings = load_exclusions_file(p)
+        if 0 in excluded:
+            blocked |= strings
+        if 1 in excluded:
+            blocked |= jar_strings
+    removed = 0
+    if blocked:
+        before = len(merged)
+        merged = {k: v for k, v in merged.items() if k not in blocked}
+        removed = before - len(merged)
+    return merged, removed
+
+
+def effective_dictionary(paths: dict, target: str, mod_id: str = None) -> CompiledDict:
+    """
+    대상별 유효 사전을 반환. 소스 해시가 같은 컴파일 산출물이 있으면 그대로 mmap,
+    없으면 병합·제외 후 컴파일 (같은 이름의 이전 버전은 삭제).
+    """
+    layers, excl_files = _sources(paths, target, mod_id)
+    name = target if not mod_id else f"{target}-{mod_id}"
+    key = _cached_source_key(name, target, layers, excl_files)
+    path = CACHE_DIR / f"{name}-{key}.kdict"
+
+    if not path.exists():
+        merged, removed = _build_effective(target, layers, excl_files)
+        compile_dict(merged, path, removed)
+        print(f"  사전 컴파일: {name} ({len(merged)}개"
+              + (f", 제외 {removed}개" if removed else "") + ")")
+        for old in CACHE_DIR.glob(f"{name}-*.kdict"):
+            if old != path and old.stem.rsplit('-', 1)[0] == name:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass  # 다른 프로세스가 mmap 중 (Windows) — 다음 컴파일 때 정리
+
+    return CompiledDict(path)
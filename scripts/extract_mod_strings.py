@@ -5,13 +5,15 @@ extract_mod_strings.py - 범용 모드 번역 후보 추출기 (분석 도구, 
 모드 JAR + 데이터 파일에서 번역 후보를 추출해 intermediate/{mod_id}_candidates.json 출력.
 
 사용법:
-    python scripts/extract_mod_strings.py --mod Nexerelin [--skip-jar]
+    python scripts/extract_mod_strings.py --mod Nexerelin [--skip-jar] [--decompile]
 
 단계:
-    1. CFR으로 JAR 디컴파일 → intermediate/{mod_id}_src/
-    2. .java 파일 regex 스캔 → 문자열 리터럴 추출
-    3. 데이터 파일(strings.json, CSV) 스캔
-    4. 필터:
+    1. 데이터 파일(strings.json, CSV) 스캔
+    2. JAR 문자열 리터럴 — 기본: 바이트코드 용도 분석(bytecode_usage 캐시, Java/CFR 불필요)으로
+       ID/키로 쓰이는 리터럴(equals, Map 키, MemoryAPI …)은 제외
+       --decompile: CFR으로 디컴파일(decompile_cache — 바뀐 클래스만) → intermediate/{mod_id}_{jar}_src/
+       의 .java 리터럴 색인(java_literals 캐시) 전체
+    3. 필터:
         - len < 4 이고 공백 없음 → 제외 (ID 가능성)
         - 이미 common.json 또는 patches/{mod_id}/translations.json에 있음 → 제외
         - 순수 숫자, URL, 파일경로 패턴 → 제외
@@ -24,15 +26,17 @@ import argparse
 import csv
 import io
 import json
-import os
 import re
-import subprocess
 import sys
 import zipfile
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(Path(__file__).parent))
+from dict_compiler import effective_dictionary
+from bytecode_usage import load_usage
+from decompile_cache import decompile, default_java
+from java_literals import load_literal_index
 
 
 def _resolve(p, base=SCRIPT_DIR):
@@ -93,28 +97,19 @@ def _is_candidate(s: str, existing: set) -> bool:
 # Java 소스 스캔
 # ──────────────────────────────────────────────────────────────────────────────
 
-_RE_STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"')
-
-
 def extract_from_java_sources(src_dir: Path, existing: set) -> set:
-    """디컴파일된 .java 파일에서 문자열 리터럴 추출."""
-    candidates = set()
-    java_files = list(src_dir.rglob('*.java'))
-    print(f"  Java 소스 스캔: {len(java_files)}개 파일")
+    """디컴파일된 .java 파일의 문자열 리터럴 (리터럴 색인 — 바뀐 파일만 다시 토큰화)."""
+    index = load_literal_index(src_dir)
+    print(f"  Java 소스 스캔: {len(index.files)}개 파일")
+    return {lit.text for _rel, lit in index.literals() if _is_candidate(lit.text, existing)}
 
-    for jf in java_files:
-        try:
-            text = jf.read_text(encoding='utf-8', errors='replace')
-        except Exception:
-            continue
-        for m in _RE_STRING_LITERAL.finditer(text):
-            raw = m.group(1)
-            # 이스케이프 처리 (간단)
-            s = raw.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"').replace('\\\\', '\\')
-            if _is_candidate(s, existing):
-                candidates.add(s)
 
-    return candidates
+def extract_from_jar_bytecode(jar_path: Path, existing: set) -> set:
+    """JAR 바이트코드의 문자열 리터럴 중 ID/키 용도가 아닌 것 (bytecode_usage 캐시)."""
+    usage = load_usage(jar_path)
+    keys = usage.literals('key')
+    print(f"  바이트코드 리터럴: {len(usage.sinks)}개 (ID/키 용도 {len(keys)}개 제외)")
+    return {text for text in usage.sinks if text not in keys and _is_candidate(text, existing)}
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -191,23 +186,8 @@ def _collect_json_strings(obj, existing: set, result: set):
 # ──────────────────────────────────────────────────────────────────────────────
 
 def decompile_jar(jar_path: Path, out_dir: Path, cfr_jar: Path, java_cmd: str) -> bool:
-    """CFR로 JAR 디컴파일."""
-    if out_dir.exists() and any(out_dir.rglob('*.java')):
-        print(f"  디컴파일 스킵 (이미 존재): {out_dir}")
-        return True
-
-    out_dir.mkdir(parents=True, exist_ok=True)
-    if not cfr_jar.exists():
-        print(f"  WARN: CFR JAR 없음: {cfr_jar} — JAR 소스 스캔 건너뜀")
-        return False
-
-    print(f"  CFR 디컴파일: {jar_path.name} → {out_dir}")
-    cmd = [java_cmd, '-jar', str(cfr_jar), str(jar_path),
-           '--outputdir', str(out_dir), '--silent', 'true']
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"  WARN: CFR 오류 (일부 클래스 디컴파일 실패할 수 있음)")
-    return True
+    """CFR로 JAR 디컴파일 — 클래스 해시 캐시(decompile_cache)로 바뀐 클래스만 다시 디컴파일."""
+    return decompile(jar_path, out_dir, cfr_jar, java_cmd)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -217,7 +197,9 @@ def decompile_jar(jar_path: Path, out_dir: Path, cfr_jar: Path, java_cmd: str) -
 def main():
     parser = argparse.ArgumentParser(description='모드 번역 후보 추출')
     parser.add_argument('--mod', required=True, help='모드 ID (config.json mods[].id)')
-    parser.add_argument('--skip-jar', action='store_true', help='JAR 디컴파일/스캔 건너뜀')
+    parser.add_argument('--skip-jar', action='store_true', help='JAR 스캔 건너뜀')
+    parser.add_argument('--decompile', action='store_true',
+                        help='바이트코드 분석 대신 CFR 디컴파일 소스 스캔')
     args = parser.parse_args()
     mod_id = args.mod
 
@@ -232,7 +214,6 @@ def main():
         sys.exit(1)
 
     game_mods = Path(_resolve(paths['game_mods']))
-    patches_dir = Path(_resolve(paths['patches']))
     intermediate = SCRIPT_DIR / 'intermediate'
     intermediate.mkdir(exist_ok=True)
 
@@ -241,17 +222,8 @@ def main():
         print(f"ERROR: 모드 폴더 없음: {mod_dir}", file=sys.stderr)
         sys.exit(1)
 
-    # 기존 번역 사전 로드 (중복 제외용)
-    existing = set()
-    common_file = _resolve(paths.get('translations', ''))
-    if common_file and os.path.exists(common_file):
-        with open(common_file, encoding='utf-8') as f:
-            existing.update(json.load(f).keys())
-
-    mod_trans_file = patches_dir / mod_id / 'translations.json'
-    if mod_trans_file.exists():
-        with open(mod_trans_file, encoding='utf-8') as f:
-            existing.update(json.load(f).keys())
+    # 기존 번역 사전 (중복 제외용): common + 모드 전용, 컴파일된 사전 mmap 조회
+    existing = effective_dictionary(paths, 'mod_all', mod_id)
 
     print(f"\n[{mod_id}] 번역 후보 추출")
     print(f"  기존 번역 제외 기준: {len(existing)}개 항목")
@@ -264,7 +236,7 @@ def main():
     print(f"  데이터 파일 후보: {len(data_cands)}개")
     candidates.update(data_cands)
 
-    # 2. JAR 디컴파일 + 소스 스캔
+    # 2. JAR 리터럴 (바이트코드 분석, --decompile: 디컴파일 소스 스캔)
     if not args.skip_jar:
         mod_jar = mod_cfg.get('mod_jar')
         if mod_jar:
@@ -275,12 +247,17 @@ def main():
                     print(f"  WARN: JAR 없음: {jar_path}")
                     continue
 
+                if not args.decompile:
+                    print(f"\nJAR 바이트코드 분석: {jar_rel}")
+                    jar_cands = extract_from_jar_bytecode(jar_path, existing)
+                    print(f"  JAR 후보: {len(jar_cands)}개")
+                    candidates.update(jar_cands)
+                    continue
+
                 jar_name = Path(jar_rel).stem
                 src_dir = intermediate / f"{mod_id}_{jar_name}_src"
                 cfr_jar = SCRIPT_DIR / 'tools' / 'cfr.jar'
-                java_cmd = str(Path(_resolve(paths.get('game_core', '../starsector-core'))).parent / 'jre' / 'bin' / 'java')
-                if not Path(java_cmd).exists():
-                    java_cmd = 'java'
+                java_cmd = default_java(paths)
 
                 if decompile_jar(jar_path, src_dir, cfr_jar, java_cmd):
                     print(f"\nJAR 소스 스캔: {jar_rel}")
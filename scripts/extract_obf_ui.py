@@ -12,7 +12,11 @@ extract_obf_ui.py - starfarer_obf.jar에서 번역 가능한 UI 문자열만 정
 """
 
 from pathlib import Path
-import json, os, re, struct, zipfile
+import json, os, re, sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from dict_compiler import effective_dictionary
+from jar_corpus import load_corpus
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
@@ -32,50 +36,9 @@ TRANSLATIONS = _resolve(_p['translations'])
 OUTPUT_MODS  = _resolve(_p['output_mods'])
 INTERMEDIATE = str(SCRIPT_DIR / 'intermediate')
 
-def _load_all_translations():
-    merged = {}
-    for key in ['translations', 'api_trans', 'obf_trans']:
-        p = _resolve(_p.get(key, ''))
-        if p and os.path.exists(p):
-            with open(p, encoding='utf-8') as f:
-                merged.update(json.load(f))
-    return merged
-
 JAR_PATH = os.path.join(GAME_CORE, 'starfarer_obf.jar')
 OUT_FILE = os.path.join(INTERMEDIATE, 'ui_candidates.json')
 
-MAGIC = b'\xca\xfe\xba\xbe'
-
-# ─────────────────────────────────────────────────────
-# 상수 풀 문자열 추출
-# ─────────────────────────────────────────────────────
-def get_strings(data: bytes) -> list:
-    if data[:4] != MAGIC:
-        return []
-    try:
-        count = struct.unpack_from('>H', data, 8)[0]
-        result = []
-        pos = 10; i = 1
-        while i < count:
-            tag = data[pos]; pos += 1
-            if tag == 1:
-                ln = struct.unpack_from('>H', data, pos)[0]; pos += 2
-                raw = data[pos:pos+ln]; pos += ln
-                try:
-                    result.append(raw.decode('utf-8', errors='replace'))
-                except:
-                    pass
-            elif tag in (5, 6): pos += 8; i += 1
-            elif tag in (3, 4): pos += 4
-            elif tag in (7, 8, 16, 19, 20): pos += 2
-            elif tag in (9, 10, 11, 12, 17, 18): pos += 4
-            elif tag == 15: pos += 3
-            else: break
-            i += 1
-        return result
-    except:
-        return []
-
 # ─────────────────────────────────────────────────────
 # UI 문자열 판별 - 엄격한 필터
 # ─────────────────────────────────────────────────────
@@ -164,29 +127,20 @@ def ui_score(s: str) -> int:
 
 def main():
     # 기존 번역 로드
-    existing = _load_all_translations()
+    existing = effective_dictionary(_p, 'all')
     print(f"기존 번역: {len(existing)}개")
 
-    # 스캔
+    # 스캔 (jar_corpus 캐시 — JAR 내용이 그대로면 JAR 을 열지 않음)
     candidates = {}  # str → source_class
-    with zipfile.ZipFile(JAR_PATH, 'r') as zf:
-        entries = zf.infolist()
-        print(f"JAR 항목: {len(entries)}개")
-        for info in entries:
-            if not info.filename.endswith('.class'):
-                continue
-            try:
-                data = zf.read(info.filename)
-            except:
-                continue
-            strings = get_strings(data)
-            for s in strings:
-                if s in existing:
-                    continue
-                if not is_ui_string(s):
-                    continue
-                if s not in candidates:
-                    candidates[s] = info.filename
+    corpus = load_corpus(JAR_PATH)
+    print(f"클래스: {len(corpus.classes)}개")
+    for cls, _slot, _role, s in corpus.records():
+        if s in existing:
+            continue
+        if not is_ui_string(s):
+            continue
+        if s not in candidates:
+            candidates[s] = cls
 
     print(f"후보 문자열: {len(candidates)}개")
 
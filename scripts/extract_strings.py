@@ -4,19 +4,24 @@
 extract_strings.py - JAR에서 번역되지 않은 UI 문자열 추출
 
 사용법:
-    python extract_strings.py [--jar JAR경로] [--out OUTPUT.json] [--min-len N]
+    python extract_strings.py [--jar JAR경로] [--out OUTPUT.json] [--min-len N] [--jobs N]
 
 기본값:
     --jar: starfarer.api.jar, starfarer_obf.jar 둘 다 스캔
     --out: intermediate/untranslated.json
     --min-len: 4
+    --jobs: 말뭉치 캐시가 없을 때 JAR 스캔 작업자 수 (CPU 수, 1 이면 직렬)
 
 출력:
     {"문자열": ["출처JAR:클래스경로", ...], ...}
 """
 
 from pathlib import Path
-import argparse, json, os, re, struct, zipfile
+import argparse, json, os, re, sys, time, zipfile
+
+sys.path.insert(0, str(Path(__file__).parent))
+from dict_compiler import effective_dictionary
+from jar_corpus import load_corpus
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
@@ -36,93 +41,12 @@ TRANSLATIONS = _resolve(_p['translations'])
 OUTPUT_MODS  = _resolve(_p['output_mods'])
 INTERMEDIATE = str(SCRIPT_DIR / 'intermediate')
 
-def _load_all_translations():
-    merged = {}
-    for key in ['translations', 'api_trans', 'obf_trans']:
-        p = _resolve(_p.get(key, ''))
-        if p and os.path.exists(p):
-            with open(p, encoding='utf-8') as f:
-                merged.update(json.load(f))
-    return merged
-
 DEFAULT_JARS = [
     os.path.join(GAME_CORE, 'starfarer.api.jar'),
     os.path.join(GAME_CORE, 'starfarer_obf.jar'),
 ]
 DEFAULT_OUT = os.path.join(INTERMEDIATE, 'untranslated.json')
 
-# ─────────────────────────────────────────────────────
-# Java Modified UTF-8 디코드
-# ─────────────────────────────────────────────────────
-def decode_java_utf8(raw: bytes) -> str:
-    result = []
-    i = 0
-    while i < len(raw):
-        b = raw[i]
-        if b == 0:
-            result.append('\x00'); i += 1
-        elif b < 0x80:
-            result.append(chr(b)); i += 1
-        elif b < 0xC0:
-            result.append('\uFFFD'); i += 1
-        elif b < 0xE0:
-            if i + 1 < len(raw):
-                c = ((b & 0x1F) << 6) | (raw[i+1] & 0x3F)
-                result.append(chr(c)); i += 2
-            else:
-                result.append('\uFFFD'); i += 1
-        elif b < 0xF0:
-            if i + 2 < len(raw):
-                c = ((b & 0x0F) << 12) | ((raw[i+1] & 0x3F) << 6) | (raw[i+2] & 0x3F)
-                result.append(chr(c)); i += 3
-            else:
-                result.append('\uFFFD'); i += 1
-        else:
-            if i + 5 < len(raw) and raw[i] == 0xED and raw[i+3] == 0xED:
-                hi = ((raw[i+1] & 0x0F) << 6) | (raw[i+2] & 0x3F)
-                lo = ((raw[i+4] & 0x0F) << 6) | (raw[i+5] & 0x3F)
-                cp = 0x10000 + ((hi - 0xD800) << 10) + (lo - 0xDC00)
-                result.append(chr(cp)); i += 6
-            else:
-                result.append('\uFFFD'); i += 1
-    return ''.join(result)
-
-
-# ─────────────────────────────────────────────────────
-# 상수 풀에서 Utf8 문자열 추출
-# ─────────────────────────────────────────────────────
-def extract_strings_from_class(data: bytes) -> list:
-    if data[:4] != b'\xca\xfe\xba\xbe':
-        return []
-    try:
-        count = struct.unpack_from('>H', data, 8)[0]
-        strings = []
-        pos = 10
-        i = 1
-        while i < count:
-            tag = data[pos]; pos += 1
-            if tag == 1:
-                length = struct.unpack_from('>H', data, pos)[0]; pos += 2
-                raw = data[pos:pos+length]; pos += length
-                try:
-                    s = decode_java_utf8(raw)
-                    strings.append(s)
-                except Exception:
-                    pass
-            elif tag in (5, 6):
-                pos += 8; i += 1  # Long/Double: 2슬롯
-            elif tag in (3, 4):   pos += 4
-            elif tag in (7, 8, 16, 19, 20): pos += 2
-            elif tag in (9, 10, 11, 12, 17, 18): pos += 4
-            elif tag == 15:       pos += 3
-            else:
-                return strings  # 알 수 없는 태그 → 중단
-            i += 1
-        return strings
-    except Exception:
-        return []
-
-
 # ─────────────────────────────────────────────────────
 # UI 문자열 판별 필터
 # ─────────────────────────────────────────────────────
@@ -172,38 +96,39 @@ def is_ui_string(s: str, min_len: int) -> bool:
 # ─────────────────────────────────────────────────────
 # 메인
 # ─────────────────────────────────────────────────────
-def scan_jar(jar_path: str, translations: dict, min_len: int) -> dict:
+def scan_jar(jar_path: str, translations: dict, min_len: int, jobs: int = None) -> dict:
     """JAR에서 번역 안 된 UI 문자열 추출. {문자열: [출처, ...]}"""
     results = {}
     jar_name = os.path.basename(jar_path)
+    start = time.perf_counter()
 
+    # 상수 풀 문자열은 jar_corpus 캐시에서 (JAR 내용이 그대로면 JAR 을 열지 않음,
+    # 캐시가 없으면 엔트리 구간별 병렬 스캔)
     try:
-        zf = zipfile.ZipFile(jar_path, 'r')
-    except Exception as e:
+        corpus = load_corpus(jar_path, jobs)
+    except (OSError, zipfile.BadZipFile) as e:
         print(f"  Cannot open {jar_path}: {e}")
         return results
 
-    with zf:
-        for entry in zf.infolist():
-            if not entry.filename.endswith('.class'):
-                continue
-            try:
-                data = zf.read(entry.filename)
-            except Exception:
-                continue
-
-            strings = extract_strings_from_class(data)
-            for s in strings:
-                if s in translations:
-                    continue
-                if not is_ui_string(s, min_len):
-                    continue
-                source = f"{jar_name}:{entry.filename}"
-                if s not in results:
-                    results[s] = []
-                if source not in results[s]:
-                    results[s].append(source)
+    # 필터는 고유 문자열마다 한 번만 — 같은 문자열이 여러 클래스에 나와도 재평가하지 않음
+    keep = [s not in translations and is_ui_string(s, min_len) for s in corpus.strings_table]
 
+    # 레코드는 클래스 단위로 모여 있으므로 같은 출처는 연속 → 마지막 출처만 비교
+    classes, strings, e = corpus.classes, corpus.strings_table, corpus.entries
+    for i in range(0, len(e), 4):
+        str_idx = e[i + 3]
+        if not keep[str_idx]:
+            continue
+        source = f"{jar_name}:{classes[e[i]]}"
+        srcs = results.get(strings[str_idx])
+        if srcs is None:
+            results[strings[str_idx]] = [source]
+        elif srcs[-1] != source:
+            srcs.append(source)
+
+    elapsed = time.perf_counter() - start
+    print(f"  {len(classes)} classes in {elapsed:.2f}s "
+          f"({len(classes) / max(elapsed, 1e-9):,.0f} classes/s)")
     return results
 
 
@@ -214,12 +139,14 @@ def main():
     parser.add_argument('--min-len', type=int, default=4, help='Minimum string length')
     parser.add_argument('--show', type=int, default=0,
                         help='Print N sample strings to stdout (0=all)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for uncached JAR scans (default: CPU count)')
     args = parser.parse_args()
 
     jars = args.jar if args.jar else DEFAULT_JARS
 
     # Load current translations
-    translations = _load_all_translations()
+    translations = effective_dictionary(_p, 'all')
     print(f"Loaded {len(translations)} existing translations")
 
     # Scan JARs
@@ -229,7 +156,7 @@ def main():
             print(f"  SKIP (not found): {jar}")
             continue
         print(f"Scanning: {os.path.basename(jar)} ...")
-        results = scan_jar(jar, translations, args.min_len)
+        results = scan_jar(jar, translations, args.min_len, args.jobs)
         print(f"  Found {len(results)} untranslated strings")
         for s, sources in results.items():
             if s not in all_results:
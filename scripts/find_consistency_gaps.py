@@ -3,11 +3,18 @@
 """
 이미 번역된 항목과 일관성을 기준으로 미번역 UI 문자열 찾기
 - 번역된 문자열의 단어 패턴과 매칭되는 미번역 항목 우선 선정
+- 번역 키 단어 역색인(단어 → 키 번호 목록)으로 점수 계산, 최다 겹침 번역 항목은
+  드문 단어부터 후보를 넓히다가 남은 단어로 더 나아질 수 없으면 중단
 """
 
 from pathlib import Path
-import json, os, re, zipfile, struct
-from collections import defaultdict
+import json, os, re, sys, time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, str(Path(__file__).parent))
+from backup_store import original_path
+from dict_compiler import effective_dictionary
+from jar_corpus import load_corpus
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
@@ -27,46 +34,6 @@ TRANSLATIONS = _resolve(_p['translations'])
 OUTPUT_MODS  = _resolve(_p['output_mods'])
 INTERMEDIATE = str(SCRIPT_DIR / 'intermediate')
 
-def _load_all_translations():
-    merged = {}
-    for key in ['translations', 'api_trans', 'obf_trans']:
-        p = _resolve(_p.get(key, ''))
-        if p and os.path.exists(p):
-            with open(p, encoding='utf-8') as f:
-                merged.update(json.load(f))
-    return merged
-
-OBF_BAK = os.path.join(GAME_CORE, 'starfarer_obf.jar.bak')
-API_BAK = os.path.join(GAME_CORE, 'starfarer.api.jar.bak')
-
-trans = _load_all_translations()
-
-def extract_utf8_strings(jar_path):
-    strings = set()
-    with zipfile.ZipFile(jar_path, 'r') as zf:
-        for name in zf.namelist():
-            if not name.endswith('.class'): continue
-            data = zf.read(name)
-            if len(data) < 10: continue
-            if struct.unpack_from('>I', data, 0)[0] != 0xCAFEBABE: continue
-            count = struct.unpack_from('>H', data, 8)[0]
-            pos = 10; i = 1
-            while i < count and pos < len(data):
-                tag = data[pos]; pos += 1
-                if tag == 1:
-                    length = struct.unpack_from('>H', data, pos)[0]; pos += 2
-                    raw = data[pos:pos+length]; pos += length
-                    try: strings.add(raw.decode('utf-8', errors='replace'))
-                    except: pass
-                elif tag in (5,6): pos += 8; i += 1
-                elif tag in (3,4): pos += 4
-                elif tag in (7,8,16,19,20): pos += 2
-                elif tag in (9,10,11,12,17,18): pos += 4
-                elif tag == 15: pos += 3
-                else: break
-                i += 1
-    return strings
-
 def is_display_text(s):
     s = s.strip()
     if len(s) < 3 or len(s) > 80: return False
@@ -92,123 +59,166 @@ def is_display_text(s):
     is_short_ui = len(s) <= 30 and bool(re.match(r'^[A-Z][a-z]', s))
     return has_space or is_label or is_modifier or is_natural or is_short_ui
 
-print("JAR에서 문자열 추출 중...")
-all_strings = extract_utf8_strings(OBF_BAK) | extract_utf8_strings(API_BAK)
-print(f"총 {len(all_strings)}개 추출")
-
-# 표시용 문자열 필터
-display = {s.strip() for s in all_strings if is_display_text(s.strip())}
-untrans = {s for s in display if s not in trans}
-print(f"표시용 문자열: {len(display)}개, 미번역: {len(untrans)}개")
-
 # ── 번역된 문자열에서 단어 패턴 추출 ──────────────────────────────
+_WORD_RE = re.compile(r'[a-zA-Z]{3,}')
+
 def words(s):
-    return re.findall(r'[a-zA-Z]{3,}', s.lower())
-
-# 번역된 항목의 단어 집합
-trans_words = defaultdict(set)  # word -> set of translated strings containing it
-for k in trans:
-    for w in words(k):
-        trans_words[w].add(k)
-
-# 공통 접두어 그룹 (번역 완료)
-trans_prefixes = defaultdict(list)
-for k in trans:
-    ws = words(k)
-    if ws:
-        trans_prefixes[ws[0]].append(k)
-
-# ── 미번역 항목 점수화 ───────────────────────────────────────────
-scored = []
-for s in untrans:
-    ws = words(s)
-    if not ws: continue
-    score = 0
-    matched_trans = set()
-    # 각 단어가 번역된 항목에 몇 개 있나
-    for w in ws:
-        if w in trans_words:
-            score += len(trans_words[w])
-            matched_trans |= trans_words[w]
-    # 같은 첫 단어를 가진 번역 항목 수
-    prefix_bonus = len(trans_prefixes.get(ws[0], []))
-    score += prefix_bonus * 2
-    if score > 0:
-        # 가장 유사한 번역 항목 찾기
-        best_match = None
-        best_overlap = 0
-        for tm in matched_trans:
-            overlap = len(set(words(s)) & set(words(tm)))
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_match = tm
-        scored.append((score, best_overlap, s, best_match))
-
-scored.sort(reverse=True)
-print(f"연관 미번역: {len(scored)}개")
-
-# ── 카테고리별 그룹화 ────────────────────────────────────────────
-categories = {
-    '전투/전함': ['combat', 'battle', 'ship', 'fleet', 'weapon', 'fighter', 'hull', 'armor', 'shield', 'damage', 'range', 'beam', 'missile', 'turret', 'wing', 'bay', 'burn'],
-    '함대/장교': ['officer', 'crew', 'command', 'captain', 'admiral', 'skill', 'level', 'point', 'deploy', 'reinforce'],
-    '플럭스/제원': ['flux', 'vent', 'dissipation', 'overload', 'speed', 'acceleration', 'turn', 'rate', 'peak', 'cargo', 'fuel', 'supply', 'ordnance', 'capacity', 'mass', 'upkeep'],
-    '식민지/경제': ['colony', 'planet', 'market', 'trade', 'income', 'profit', 'expense', 'growth', 'stability', 'hazard', 'admin', 'governor', 'industry', 'production', 'demand', 'supply', 'export', 'import', 'price', 'accessibility'],
-    '세력/인텔': ['faction', 'intel', 'contact', 'bounty', 'mission', 'hegemony', 'luddic', 'pirate', 'persean', 'sindrian', 'commission', 'relation', 'reputation', 'smuggle'],
-    '항법/지도': ['nav', 'jump', 'gate', 'relay', 'beacon', 'sensor', 'survey', 'scan', 'system', 'star', 'orbit', 'planet', 'moon', 'debris', 'derelict'],
-    '전투 상태': ['disabled', 'overloaded', 'retreat', 'assist', 'engage', 'deploy', 'recover', 'readiness', 'repair', 'damage', 'emp', 'malfunction'],
-}
-
-cat_results = defaultdict(list)
-others = []
-top_scored = [(s, bm, sc) for sc, bo, s, bm in scored if sc >= 5][:400]
-
-for s, bm, sc in top_scored:
-    ws_set = set(words(s))
-    matched_cat = None
-    best_cnt = 0
-    for cat, kws in categories.items():
-        cnt = len(ws_set & set(kws))
-        if cnt > best_cnt:
-            best_cnt = cnt
-            matched_cat = cat
-    if matched_cat and best_cnt > 0:
-        cat_results[matched_cat].append((sc, s, bm))
-    else:
-        others.append((sc, s, bm))
-
-# 결과 출력
-output_items = []
-print("\n" + "="*70)
-print("카테고리별 연관 미번역 항목 (기존 번역과 일관성 우선)")
-print("="*70)
-
-for cat, items in sorted(cat_results.items()):
-    items.sort(reverse=True)
-    top = items[:20]
-    if not top: continue
-    print(f"\n[{cat}] {len(items)}개:")
-    for sc, s, bm in top:
-        note = f'  ← "{bm}"' if bm else ''
-        print(f"  {repr(s)}{note}")
-        output_items.append(s)
-
-if others:
-    print(f"\n[기타] {len(others)}개:")
-    for sc, s, bm in others[:20]:
-        note = f'  ← "{bm}"' if bm else ''
-        print(f"  {repr(s)}{note}")
-        output_items.append(s)
-
-# 중복 제거 후 저장
-seen = set()
-unique = []
-for s in output_items:
-    if s not in seen:
-        seen.add(s)
-        unique.append(s)
-
-out_file = os.path.join(INTERMEDIATE, 'consistency_gaps.json')
-os.makedirs(INTERMEDIATE, exist_ok=True)
-with open(out_file, 'w', encoding='utf-8') as f:
-    json.dump(unique, f, ensure_ascii=False, indent=2)
-print(f"\n총 {len(unique)}개 저장: consistency_gaps.json")
+    return _WORD_RE.findall(s.lower())
+
+
+class TranslationIndex:
+    """
+    번역 키 단어 역색인.
+        keys       번역 키 목록 (사전 순서)
+        key_words  키마다 단어 집합
+        postings   단어 → 그 단어를 포함한 키 번호 목록
+        prefixes   첫 단어 → 그 단어로 시작하는 키 수
+    """
+
+    def __init__(self, trans_keys):
+        self.keys = list(trans_keys)
+        self.key_words = []
+        self.postings = defaultdict(list)
+        self.prefixes = Counter()
+        for i, k in enumerate(self.keys):
+            ws = words(k)
+            if ws:
+                self.prefixes[ws[0]] += 1
+            ws_set = frozenset(ws)
+            self.key_words.append(ws_set)
+            for w in ws_set:
+                self.postings[w].append(i)
+
+    def score(self, ws) -> int:
+        """단어마다 그 단어를 포함한 번역 키 수 + 같은 첫 단어 키 수 × 2."""
+        postings = self.postings
+        return (sum(len(postings[w]) for w in ws if w in postings)
+                + self.prefixes.get(ws[0], 0) * 2)
+
+    def best_match(self, ws) -> tuple:
+        """
+        (겹치는 단어 수, 번역 키) — 겹침이 가장 큰 번역 키, 없으면 (0, None).
+        드문 단어 순으로 후보를 늘리며, 아직 안 본 단어 수로도 현재 최고를 넘을 수 없으면
+        중단 → 흔한 단어('the', 'and' …)의 긴 목록은 대개 읽지 않음.
+        """
+        postings, key_words = self.postings, self.key_words
+        ws_set = {w for w in ws if w in postings}
+        order = sorted(ws_set, key=lambda w: (len(postings[w]), w))
+        best, best_key = 0, None
+        seen = set()
+        for m, w in enumerate(order):
+            if best >= len(order) - m:
+                break
+            for k in postings[w]:
+                if k in seen:
+                    continue
+                seen.add(k)
+                overlap = len(key_words[k] & ws_set)
+                if overlap > best:
+                    best, best_key = overlap, k
+        return best, (self.keys[best_key] if best_key is not None else None)
+
+
+def main():
+    # 영어 원본: 백업 저장소 CURRENT 스냅샷 → 없으면 기존 .bak
+    obf_bak = str(original_path(_p, 'core/starfarer_obf.jar')
+                  or os.path.join(GAME_CORE, 'starfarer_obf.jar.bak'))
+    api_bak = str(original_path(_p, 'core/starfarer.api.jar')
+                  or os.path.join(GAME_CORE, 'starfarer.api.jar.bak'))
+
+    trans = effective_dictionary(_p, 'all')
+
+    print("JAR에서 문자열 추출 중...")
+    all_strings = load_corpus(obf_bak).strings() | load_corpus(api_bak).strings()
+    print(f"총 {len(all_strings)}개 추출")
+
+    # 표시용 문자열 필터
+    display = {s.strip() for s in all_strings if is_display_text(s.strip())}
+    untrans = {s for s in display if s not in trans}
+    print(f"표시용 문자열: {len(display)}개, 미번역: {len(untrans)}개")
+
+    # ── 미번역 항목 점수화 ───────────────────────────────────────────
+    t0 = time.perf_counter()
+    index = TranslationIndex(trans)
+    scored = []
+    for s in untrans:
+        ws = words(s)
+        if not ws: continue
+        score = index.score(ws)
+        if score > 0:
+            # 가장 유사한 번역 항목 찾기
+            best_overlap, best_match = index.best_match(ws)
+            scored.append((score, best_overlap, s, best_match))
+
+    scored.sort(reverse=True)
+    print(f"연관 미번역: {len(scored)}개 ({time.perf_counter() - t0:.2f}s)")
+
+    # ── 카테고리별 그룹화 ────────────────────────────────────────────
+    categories = {
+        '전투/전함': ['combat', 'battle', 'ship', 'fleet', 'weapon', 'fighter', 'hull', 'armor', 'shield', 'damage', 'range', 'beam', 'missile', 'turret', 'wing', 'bay', 'burn'],
+        '함대/장교': ['officer', 'crew', 'command', 'captain', 'admiral', 'skill', 'level', 'point', 'deploy', 'reinforce'],
+        '플럭스/제원': ['flux', 'vent', 'dissipation', 'overload', 'speed', 'acceleration', 'turn', 'rate', 'peak', 'cargo', 'fuel', 'supply', 'ordnance', 'capacity', 'mass', 'upkeep'],
+        '식민지/경제': ['colony', 'planet', 'market', 'trade', 'income', 'profit', 'expense', 'growth', 'stability', 'hazard', 'admin', 'governor', 'industry', 'production', 'demand', 'supply', 'export', 'import', 'price', 'accessibility'],
+        '세력/인텔': ['faction', 'intel', 'contact', 'bounty', 'mission', 'hegemony', 'luddic', 'pirate', 'persean', 'sindrian', 'commission', 'relation', 'reputation', 'smuggle'],
+        '항법/지도': ['nav', 'jump', 'gate', 'relay', 'beacon', 'sensor', 'survey', 'scan', 'system', 'star', 'orbit', 'planet', 'moon', 'debris', 'derelict'],
+        '전투 상태': ['disabled', 'overloaded', 'retreat', 'assist', 'engage', 'deploy', 'recover', 'readiness', 'repair', 'damage', 'emp', 'malfunction'],
+    }
+
+    cat_results = defaultdict(list)
+    others = []
+    top_scored = [(s, bm, sc) for sc, bo, s, bm in scored if sc >= 5][:400]
+
+    for s, bm, sc in top_scored:
+        ws_set = set(words(s))
+        matched_cat = None
+        best_cnt = 0
+        for cat, kws in categories.items():
+            cnt = len(ws_set & set(kws))
+            if cnt > best_cnt:
+                best_cnt = cnt
+                matched_cat = cat
+        if matched_cat and best_cnt > 0:
+            cat_results[matched_cat].append((sc, s, bm))
+        else:
+            others.append((sc, s, bm))
+
+    # 결과 출력
+    output_items = []
+    print("\n" + "="*70)
+    print("카테고리별 연관 미번역 항목 (기존 번역과 일관성 우선)")
+    print("="*70)
+
+    for cat, items in sorted(cat_results.items()):
+        items.sort(reverse=True)
+        top = items[:20]
+        if not top: continue
+        print(f"\n[{cat}] {len(items)}개:")
+        for sc, s, bm in top:
+            note = f'  ← "{bm}"' if bm else ''
+            print(f"  {repr(s)}{note}")
+            output_items.append(s)
+
+    if others:
+        print(f"\n[기타] {len(others)}개:")
+        for sc, s, bm in others[:20]:
+            note = f'  ← "{bm}"' if bm else ''
+            print(f"  {repr(s)}{note}")
+            output_items.append(s)
+
+    # 중복 제거 후 저장
+    seen = set()
+    unique = []
+    for s in output_items:
+        if s not in seen:
+            seen.add(s)
+            unique.append(s)
+
+    out_file = os.path.join(INTERMEDIATE, 'consistency_gaps.json')
+    os.makedirs(INTERMEDIATE, exist_ok=True)
+    with open(out_file, 'w', encoding='utf-8') as f:
+        json.dump(unique, f, ensure_ascii=False, indent=2)
+    print(f"\n총 {len(unique)}개 저장: consistency_gaps.json")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,7 @@
 """
 04_find_strings.py - 미번역 화면 스트링 추출
 
-api_src/의 모든 Java 파일을 스캔하여:
+api_src/의 모든 Java 파일 리터럴 색인(java_literals 캐시)에서:
 1. 화면에 표시될 가능성 있는 문자열 후보 추출
 2. final_translations.json에 없는 것만 선별
 3. 안전하지 않은 사용 패턴(ID/키로 사용되는 경우) 제외
@@ -13,6 +13,10 @@ Output: intermediate/untranslated.json
 from pathlib import Path
 import re, json, os, sys
 
+sys.path.insert(0, str(Path(__file__).parent))
+from dict_compiler import effective_dictionary
+from java_literals import UI_CALLS, key_usage, load_literal_index
+
 SCRIPT_DIR = Path(__file__).parent.parent
 
 def _resolve(p):
@@ -31,46 +35,15 @@ TRANSLATIONS = _resolve(_p['translations'])
 OUTPUT_MODS  = _resolve(_p['output_mods'])
 INTERMEDIATE = str(SCRIPT_DIR / 'intermediate')
 
-def _load_all_translations():
-    merged = {}
-    for key in ['translations', 'api_trans', 'obf_trans']:
-        p = _resolve(_p.get(key, ''))
-        if p and os.path.exists(p):
-            with open(p, encoding='utf-8') as f:
-                merged.update(json.load(f))
-    return merged
-
 NEW_SRC  = str(SCRIPT_DIR / 'api_src')
 OUT_FILE = os.path.join(INTERMEDIATE, 'untranslated.json')
 
 # Load existing translations
-translation_map = _load_all_translations()
-
-# UI-friendly method calls (safe to translate)
-UI_CALL_PATTERNS = re.compile(
-    r'(?:addOption|addParagraph|addPara|addTitle|addTooltip|setText|setTitle|'
-    r'addButton|addMessage|addDescription|setDescription|addSection|addNote|'
-    r'showMenu|addIntro|setButtonText|addBullet|addBlockquote|addSectionHeading|'
-    r'addCustom|setStatusMessage|addError|addWarning|addInfo|addDetail|'
-    r'addSubTitles|addSubtitle|setName|setTooltip|showDialog|getTooltip|'
-    r'setLabel|addLabel|addRow|addCell|addHeader|getString)\s*\('
-)
-
-# Unsafe patterns: string used as ID/key/comparison
-UNSAFE_PATTERNS = [
-    re.compile(r'\.equals\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'\.equalsIgnoreCase\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'switch\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'\.get\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'\.put\s*\(\s*"([^"]+)"\s*,'),
-    re.compile(r'\.containsKey\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'\.remove\s*\(\s*"([^"]+)"\s*\)'),
-    re.compile(r'return\s+"([^"]+)"\s*;'),
-    re.compile(r'=\s*"([^"]+)"\s*;'),  # variable assignment (might be ID)
-    re.compile(r'new\s+\w+\s*\(\s*"([^"]+)"\s*\)'),  # constructor with string
-    re.compile(r'@\w+\s*\(\s*"([^"]+)"\s*\)'),  # annotations
-    re.compile(r'(?:getId|getKey|getType|getSpec|getTag|getCommand|getSuffix|getPrefix)\s*\(\s*\)\s*\{[^}]*return\s+"([^"]+)"'),
-]
+translation_map = effective_dictionary(_p, 'all')
+
+# Unsafe usage (string used as ID/key/comparison): java_literals.key_usage —
+# equals/equalsIgnoreCase/get/containsKey/remove/switch("x"), "x".equals(…), put("x", …),
+# case "x":, return "x";, … = "x";, new Foo("x"), @Foo("x")
 
 # Patterns that are definitely NOT UI strings
 EXCLUDE_PREFIXES = [
@@ -83,6 +56,7 @@ EXCLUDE_CONTAINS = [
 ]
 PURE_ID_PATTERN = re.compile(r'^[A-Z_][A-Z0-9_]*$')  # PURE_CONSTANT
 CAMELCASE_NOSPACE = re.compile(r'^[a-z][a-zA-Z0-9_]*$')  # camelCase identifier
+HAS_KOREAN = re.compile(r'[\uAC00-\uD7A3]')
 
 
 def is_ui_string_candidate(s):
@@ -123,63 +97,31 @@ def is_ui_string_candidate(s):
     return True
 
 
-def extract_strings_from_java(filepath):
-    """Extract string literals from a Java source file with context"""
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    # Find all string literals with their context (surrounding line)
+def extract_strings_from_java(literals):
+    """Filter one Java file's indexed literals (java_literals) to UI candidates with context"""
     results = []
-    lines = content.split('\n')
-
-    for line_no, line in enumerate(lines):
-        # Skip comment lines
-        stripped = line.strip()
-        if stripped.startswith('//') or stripped.startswith('*'):
+    for lit in literals:
+        s = lit.text
+        if not is_ui_string_candidate(s):
             continue
 
-        # Find all string literals on this line
-        literals = re.findall(r'"((?:[^"\\]|\\.)*)"', line)
-        for lit in literals:
-            # Unescape basic escape sequences
-            try:
-                s = lit.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"').replace('\\\\', '\\')
-            except:
-                s = lit
-
-            if not is_ui_string_candidate(s):
-                continue
-
-            # Check if it's used in a UI context
-            ui_context = bool(UI_CALL_PATTERNS.search(line))
-
-            # Check if it's in an unsafe context
-            unsafe = False
-            for pat in UNSAFE_PATTERNS:
-                if pat.search(line):
-                    unsafe = True
-                    break
+        # Used in a UI call (any enclosing call in the same statement)
+        ui_context = any(call in UI_CALLS for call in lit.calls)
 
-            # Additional unsafe check: look at surrounding context (3 lines)
-            ctx_start = max(0, line_no - 2)
-            ctx_end = min(len(lines), line_no + 3)
-            context = '\n'.join(lines[ctx_start:ctx_end])
+        # Used as ID/key
+        unsafe = key_usage(lit) is not None
 
-            # If in return statement
-            if re.search(r'\breturn\s+"' + re.escape(lit) + r'"', context):
-                unsafe = True
-
-            # Skip unsafe non-UI strings
-            if unsafe and not ui_context:
-                continue
+        # Skip unsafe non-UI strings
+        if unsafe and not ui_context:
+            continue
 
-            results.append({
-                'string': s,
-                'line': line_no + 1,
-                'ui_context': ui_context,
-                'unsafe': unsafe,
-                'line_text': line.strip()[:120],
-            })
+        results.append({
+            'string': s,
+            'line': lit.line,
+            'ui_context': ui_context,
+            'unsafe': unsafe,
+            'line_text': lit.line_text,
+        })
 
     return results
 
@@ -188,44 +130,41 @@ def main():
     os.makedirs(INTERMEDIATE, exist_ok=True)
 
     # Build set of already-translated strings (normalized)
-    already_translated = set(translation_map.keys())
+    already_translated = translation_map  # 컴파일된 사전 — in 조회만 사용 (키 집합 생성 불필요)
 
     # Track results
     all_untranslated = {}  # string → {files: [...], count: N, ui_context: bool}
     total_files = 0
     total_strings = 0
 
-    for root, dirs, files in os.walk(NEW_SRC):
-        for fname in files:
-            if not fname.endswith('.java'):
+    # 리터럴 색인 (바뀐 .java 만 다시 토큰화)
+    index = load_literal_index(NEW_SRC)
+
+    for rel, literals in index.files.items():
+        candidates = extract_strings_from_java(literals)
+        total_files += 1
+
+        for c in candidates:
+            s = c['string']
+            total_strings += 1
+
+            if s in already_translated:
                 continue
-            fpath = os.path.join(root, fname)
-            rel = os.path.relpath(fpath, NEW_SRC).replace('\\', '/')
-
-            candidates = extract_strings_from_java(fpath)
-            total_files += 1
-
-            for c in candidates:
-                s = c['string']
-                total_strings += 1
-
-                if s in already_translated:
-                    continue
-                if re.search(r'[\uAC00-\uD7A3]', s):
-                    continue  # Already has Korean
-
-                if s not in all_untranslated:
-                    all_untranslated[s] = {
-                        'files': [],
-                        'count': 0,
-                        'ui_context': False,
-                        'sample_line': c['line_text'],
-                    }
-                entry = all_untranslated[s]
-                if rel not in entry['files']:
-                    entry['files'].append(rel)
-                entry['count'] += 1
-                entry['ui_context'] = entry['ui_context'] or c['ui_context']
+            if HAS_KOREAN.search(s):
+                continue  # Already has Korean
+
+            if s not in all_untranslated:
+                all_untranslated[s] = {
+                    'files': [],
+                    'count': 0,
+                    'ui_context': False,
+                    'sample_line': c['line_text'],
+                }
+            entry = all_untranslated[s]
+            if entry['files'][-1:] != [rel]:
+                entry['files'].append(rel)
+            entry['count'] += 1
+            entry['ui_context'] = entry['ui_context'] or c['ui_context']
 
     print(f"Scanned {total_files} Java files, found {total_strings} string candidates")
     print(f"After filtering: {len(all_untranslated)} unique untranslated strings")
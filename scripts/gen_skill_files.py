@@ -2,10 +2,13 @@
 # -*- coding: utf-8 -*-
 
 from pathlib import Path
-import re, os, json
+import os, re, json, sys
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(Path(__file__).parent))
+from loose_json import LooseJSONError, load as load_loose_json
+
 def _resolve(p):
     if isinstance(p, str) and (p.startswith('./') or p.startswith('../') or p == '.'):
         return str((SCRIPT_DIR / p).resolve())
@@ -33,45 +36,54 @@ CUSTOM_SCOPE_KO = {
 }
 
 def read_skill_file(path):
-    """Extract key fields from a skill file"""
-    with open(path, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
+    """Extract key fields from a skill file (loose JSON: # comments, unquoted scope values)"""
+    try:
+        data = load_loose_json(path)
+    except (LooseJSONError, UnicodeDecodeError):
+        data = None
+    if not isinstance(data, dict):
+        # fallback: regex
+        return _read_skill_file_regex(path)
 
-    # Extract fields
     result = {}
+    for key in ('id', 'governingAptitude'):
+        if isinstance(data.get(key), str) and data[key]:
+            result[key] = data[key]
 
-    # id
-    m = re.search(r'"id"\s*:\s*"([^"]+)"', content)
-    if m: result['id'] = m.group(1)
+    # booleans are written back verbatim as true/false
+    for key in ('compressHullmods', 'elite'):
+        if isinstance(data.get(key), bool):
+            result[key] = 'true' if data[key] else 'false'
 
-    # governingAptitude
-    m = re.search(r'"governingAptitude"\s*:\s*"([^"]+)"', content)
-    if m: result['governingAptitude'] = m.group(1)
+    # scope / scope2: quoted or unquoted (e.g. "scope":CUSTOM)
+    for key in ('scope', 'scope2'):
+        if isinstance(data.get(key), str) and data[key]:
+            result[key] = data[key]
 
-    # compressHullmods
-    m = re.search(r'"compressHullmods"\s*:\s*(true|false)', content)
-    if m: result['compressHullmods'] = m.group(1)
+    # scopeStr (English)
+    if isinstance(data.get('scopeStr'), str) and data['scopeStr']:
+        result['scopeStr_en'] = data['scopeStr']
 
-    # elite
-    m = re.search(r'"elite"\s*:\s*(true|false)', content)
-    if m: result['elite'] = m.group(1)
+    return result
 
-    # scope (handle both quoted and unquoted)
-    m = re.search(r'(?:^|[^#])\s*"scope"\s*:\s*([A-Z_"]+[A-Z_])', content, re.MULTILINE)
-    if m:
-        scope_val = m.group(1).strip('"')
-        result['scope'] = scope_val
 
-    # scope2
-    m = re.search(r'(?:^|[^#])\s*"scope2"\s*:\s*([A-Z_"]+[A-Z_])', content, re.MULTILINE)
-    if m:
-        scope2_val = m.group(1).strip('"')
-        result['scope2'] = scope2_val
+def _read_skill_file_regex(path):
+    """Regex field extraction for skill files the loose JSON parser rejects"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
 
-    # scopeStr (English)
+    result = {}
+    for key in ('id', 'governingAptitude'):
+        m = re.search(r'"' + key + r'"\s*:\s*"([^"]+)"', content)
+        if m: result[key] = m.group(1)
+    for key in ('compressHullmods', 'elite'):
+        m = re.search(r'"' + key + r'"\s*:\s*(true|false)', content)
+        if m: result[key] = m.group(1)
+    for key in ('scope', 'scope2'):
+        m = re.search(r'(?:^|[^#])\s*"' + key + r'"\s*:\s*([A-Z_"]+[A-Z_])', content, re.MULTILINE)
+        if m: result[key] = m.group(1).strip('"')
     m = re.search(r'(?:^|[^#])\s*"scopeStr"\s*:\s*"([^"]+)"', content, re.MULTILINE)
     if m: result['scopeStr_en'] = m.group(1)
-
     return result
 
 
@@ -11,10 +11,13 @@ patches/starsectorkorean/data/hulls/skins/ 에 오버라이드 스킨 파일 생
 """
 
 from pathlib import Path
-import os, json, re, csv
+import os, json, re, csv, sys
 
 SCRIPT_DIR = Path(__file__).parent.parent
 
+sys.path.insert(0, str(Path(__file__).parent))
+from loose_json import LooseJSONError, load as load_loose_json
+
 def _resolve(p):
     if isinstance(p, str) and (p.startswith('./') or p.startswith('../') or p == '.'):
         return str((SCRIPT_DIR / p).resolve())
@@ -60,14 +63,13 @@ def load_hull_names(path):
 
 
 def load_skin_file(path):
-    """skin 파일 파싱 (JSON + # 주석 지원)"""
-    with open(path, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-    content_clean = re.sub(r'#[^\n]*', '', content)
+    """skin 파일 파싱 (loose JSON: # 주석, 후행 쉼표, unquoted 키 지원)"""
     try:
-        return json.loads(content_clean)
-    except json.JSONDecodeError:
+        return load_loose_json(path)
+    except (LooseJSONError, UnicodeDecodeError):
         # fallback: regex
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
         result = {}
         for key in ('skinHullId', 'baseHullId', 'hullName'):
             m = re.search(r'"' + key + r'"\s*:\s*"([^"]*)"', content)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+jar_corpus.py - JAR 상수 풀 문자열 말뭉치 (분석 스크립트 공용 디스크 캐시)
+
+JAR 안 모든 .class 의 CONSTANT_Utf8 을 (클래스, 상수 풀 슬롯, 역할)과 함께 한 번만
+추출해 intermediate/jar_corpus/ 에 저장하고, 이후에는 캐시만 읽음.
+캐시 이름에 JAR 내용 해시가 들어가고, JAR stat(크기·mtime)이 그대로면 {jar}-{경로 해시}.stamp
+에 기록한 해시를 재사용 → 두 번째 실행부터는 JAR 파일을 열지 않음.
+캐시가 없을 때의 스캔은 ZIP 엔트리 구간별로 작업자 프로세스에 나눠 처리하고 순서대로 병합
+(결과는 직렬 스캔과 동일).
+
+역할 (비트 마스크, 같은 Utf8 이 여러 역할일 수 있음 — 예: enum 상수명 = 필드명 + 리터럴):
+    ROLE_LITERAL     CONSTANT_String 이 참조 (문자열 리터럴)
+    ROLE_IDENTIFIER  클래스명, NameAndType/필드/메서드 이름, 모듈·패키지명
+    ROLE_DESCRIPTOR  NameAndType/필드/메서드 디스크립터, MethodType
+    0                그 외 (속성 이름, Signature, SourceFile 등)
+
+공개 API:
+    ROLE_LITERAL, ROLE_IDENTIFIER, ROLE_DESCRIPTOR
+    JarCorpus                                  records(role=None), strings(role=None), sources(role=None)
+    load_corpus(jar_path, jobs=None) -> JarCorpus   jobs: 스캔 작업자 수 (기본 CPU 수, 1 = 직렬)
+    corpus_key(jar_path) -> str                JAR 내용 해시 (stat 이 그대로면 캐시값)
+    extract_class_strings(data) -> list[tuple[int, int, str]]   (슬롯, 역할, 문자열)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+import time
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import decode_java_utf8, parse_constant_pool
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+CACHE_DIR = _BASE / 'intermediate' / 'jar_corpus'
+CORPUS_VERSION = 1
+
+ROLE_LITERAL = 1
+ROLE_IDENTIFIER = 2
+ROLE_DESCRIPTOR = 4
+
+_PARALLEL_MIN_CLASSES = 2000   # 이보다 적으면 프로세스 기동 비용이 더 큼
+
+_U2 = struct.Struct('>H')
+_U2U2 = struct.Struct('>HH')
+
+
+def _member_roles(data: bytes, rest_start: int, roles: dict) -> None:
+    """클래스 바디의 필드/메서드 name_index·descriptor_index 와 속성 이름은 상수 풀에 없음."""
+    try:
+        pos = rest_start + 6  # access_flags(2) + this_class(2) + super_class(2)
+        icount = _U2.unpack_from(data, pos)[0]
+        pos += 2 + icount * 2
+        for _section in range(2):  # fields, methods
+            count = _U2.unpack_from(data, pos)[0]; pos += 2
+            for _ in range(count):
+                name_idx, desc_idx = _U2U2.unpack_from(data, pos + 2)
+                roles[name_idx] = roles.get(name_idx, 0) | ROLE_IDENTIFIER
+                roles[desc_idx] = roles.get(desc_idx, 0) | ROLE_DESCRIPTOR
+                pos += 6
+                acount = _U2.unpack_from(data, pos)[0]; pos += 2
+                for _ in range(acount):
+                    pos += 6 + struct.unpack_from('>I', data, pos + 2)[0]
+    except (struct.error, IndexError):
+        pass  # 바디 파싱 실패 시 상수 풀에서 얻은 역할만 사용
+
+
+def extract_class_strings(data: bytes) -> list:
+    """
+    .class 바이트 → [(슬롯, 역할, 문자열), …] (상수 풀 순서).
+    클래스 파일이 아니거나 상수 풀을 읽을 수 없으면 [].
+    """
+    try:
+        entries, rest_start = parse_constant_pool(data)
+    except (ValueError, struct.error, IndexError):
+        return []
+
+    roles = {}
+    for entry in entries:
+        if entry is None:
+            continue
+        tag, val = entry
+        if tag == 8:                       # String → 리터럴
+            idx = _U2.unpack_from(val)[0]
+            roles[idx] = roles.get(idx, 0) | ROLE_LITERAL
+        elif tag in (7, 19, 20):           # Class, Module, Package → 이름
+            idx = _U2.unpack_from(val)[0]
+            roles[idx] = roles.get(idx, 0) | ROLE_IDENTIFIER
+        elif tag == 16:                    # MethodType → 디스크립터
+            idx = _U2.unpack_from(val)[0]
+            roles[idx] = roles.get(idx, 0) | ROLE_DESCRIPTOR
+        elif tag == 12:                    # NameAndType → 이름 + 디스크립터
+            name_idx, desc_idx = _U2U2.unpack_from(val)
+            roles[name_idx] = roles.get(name_idx, 0) | ROLE_IDENTIFIER
+            roles[desc_idx] = roles.get(desc_idx, 0) | ROLE_DESCRIPTOR
+    _member_roles(data, rest_start, roles)
+
+    result = []
+    for slot, entry in enumerate(entries):
+        if entry is None or entry[0] != 1:
+            continue
+        raw = entry[1]
+        try:
+            text = decode_java_utf8(raw)
+        except Exception:
+            text = raw.decode('utf-8', errors='replace')
+        result.append((slot, roles.get(slot, 0), text))
+    return result
+
+
+class JarCorpus:
+    """
+    JAR 1개의 Utf8 문자열 기록. 레코드 순서 = JAR 엔트리 순서 → 상수 풀 순서.
+        classes  클래스 경로 목록 (JAR 엔트리 이름)
+        strings  고유 문자열 목록
+        entries  array('I'): 레코드마다 (클래스 번호, 슬롯, 역할, 문자열 번호)
+    """
+
+    def __init__(self, jar_name: str, classes: list, strings: list, entries: array):
+        self.jar_name = jar_name
+        self.classes = classes
+        self.strings_table = strings
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries) // 4
+
+    def records(self, role: int = None):
+        """(클래스, 슬롯, 역할, 문자열) 생성기. role 을 주면 해당 비트가 있는 레코드만."""
+        classes, strings, e = self.classes, self.strings_table, self.entries
+        for i in range(0, len(e), 4):
+            r = e[i + 2]
+            if role is None or r & role:
+                yield classes[e[i]], e[i + 1], r, strings[e[i + 3]]
+
+    def strings(self, role: int = None) -> set:
+        """고유 문자열 집합 (role 로 역할 필터)."""
+        if role is None:
+            return set(self.strings_table)
+        e, strings = self.entries, self.strings_table
+        return {strings[e[i + 3]] for i in range(0, len(e), 4) if e[i + 2] & role}
+
+    def sources(self, role: int = None) -> dict:
+        """{문자열: [클래스, …]} — 처음 등장한 순서, 클래스 중복 없음."""
+        result = {}
+        for cls, _slot, _role, s in self.records(role):
+            srcs = result.get(s)
+            if srcs is None:
+                result[s] = [cls]
+            elif srcs[-1] != cls:
+                srcs.append(cls)
+        return result
+
+
+def _scan_range(jar_path: str, lo: int, hi: int) -> tuple:
+    """.class 엔트리 [lo, hi) 구간 스캔 → (classes, strings, entries) — 번호는 구간 안 기준."""
+    classes, strings, index = [], [], {}
+    entries = array('I')
+    with zipfile.ZipFile(jar_path, 'r') as zf:
+        infos = [i for i in zf.infolist() if i.filename.endswith('.class')][lo:hi]
+        for info in infos:
+            try:
+                data = zf.read(info)
+            except Exception:
+                continue
+            found = extract_class_strings(data)
+            if not found:
+                continue
+            cls_idx = len(classes)
+            classes.append(info.filename)
+            for slot, role, text in found:
+                str_idx = index.get(text)
+                if str_idx is None:
+                    str_idx = index[text] = len(strings)
+                    strings.append(text)
+                entries.extend((cls_idx, slot, role, str_idx))
+    return classes, strings, entries
+
+
+def _scan_jar(jar_path: Path, jobs: int = None) -> JarCorpus:
+    with zipfile.ZipFile(jar_path, 'r') as zf:
+        total = sum(1 for i in zf.infolist() if i.filename.endswith('.class'))
+    jobs = min(jobs or os.cpu_count() or 1, max(1, total // (_PARALLEL_MIN_CLASSES // 2)))
+    if jobs <= 1 or total < _PARALLEL_MIN_CLASSES:
+        classes, strings, entries = _scan_range(str(jar_path), 0, total)
+        return JarCorpus(jar_path.name, classes, strings, entries)
+
+    # 구간을 작업자 수보다 잘게 나눠 큰 클래스가 몰린 구간의 꼬리 지연을 줄임.
+    # 구간 결과는 엔트리 순서대로 병합 → 클래스·문자열 번호가 직렬 스캔과 같음.
+    step = -(-total // (jobs * 4))
+    bounds = [(lo, min(lo + step, total)) for lo in range(0, total, step)]
+    classes, strings, index = [], [], {}
+    entries = array('I')
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        parts = pool.map(_scan_range, [str(jar_path)] * len(bounds),
+                         [lo for lo, _ in bounds], [hi for _, hi in bounds])
+        for part_classes, part_strings, part_entries in parts:
+            cls_base = len(classes)
+            classes.extend(part_classes)
+            remap = []
+            for text in part_strings:
+                str_idx = index.get(text)
+                if str_idx is None:
+                    str_idx = index[text] = len(strings)
+                    strings.append(text)
+                remap.append(str_idx)
+            for i in range(0, len(part_entries), 4):
+                entries.extend((part_entries[i] + cls_base, part_entries[i + 1],
+                                part_entries[i + 2], remap[part_entries[i + 3]]))
+    return JarCorpus(jar_path.name, classes, strings, entries)
+
+
+def _content_key(jar_path: Path) -> str:
+    h = hashlib.sha1()
+    with open(jar_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def _cached_key(jar_path: Path) -> tuple:
+    """
+    (내용 해시 키, stamp 경로). {jar}-{경로 해시}.stamp 의 stat 이 그대로면 해시 재사용,
+    바뀌었으면 (touch 포함) 내용 해시를 다시 계산.
+    """
+    path_tag = hashlib.sha1(str(jar_path.resolve()).encode('utf-8', 'replace')).hexdigest()[:8]
+    stamp = CACHE_DIR / f"{jar_path.name}-{path_tag}.stamp"
+    st = jar_path.stat()
+    sig = [st.st_size, st.st_mtime_ns]
+    try:
+        with open(stamp, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('stat') == sig:
+            return saved['key'], stamp
+    except (OSError, ValueError, KeyError):
+        pass
+    key = _content_key(jar_path)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = stamp.with_name(f"{stamp.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'stat': sig, 'key': key}, f)
+    os.replace(tmp, stamp)
+    return key, stamp
+
+
+def corpus_key(jar_path) -> str:
+    """JAR 내용 해시 키 (말뭉치 캐시 이름에 쓰는 값). stat 이 그대로면 JAR 을 읽지 않음."""
+    return _cached_key(Path(jar_path))[0]
+
+
+def _prune(jar_name: str, keep: Path) -> None:
+    """어느 stamp 도 가리키지 않는 같은 JAR 이름의 이전 캐시 삭제."""
+    live = set()
+    for stamp in CACHE_DIR.glob(f"{jar_name}-*.stamp"):
+        try:
+            with open(stamp, encoding='utf-8') as f:
+                live.add(json.load(f)['key'])
+        except (OSError, ValueError, KeyError):
+            continue
+    for old in CACHE_DIR.glob(f"{jar_name}-*.pickle"):
+        if old != keep and old.stem.rsplit('-', 1)[1] not in live:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_corpus(jar_path, jobs: int = None) -> JarCorpus:
+    """
+    JAR 문자열 말뭉치. 캐시가 있으면 JAR 을 열지 않고 캐시만 읽음,
+    없으면 JAR 을 한 번 스캔(jobs 개 프로세스)해 intermediate/jar_corpus/{jar}-{해시}.pickle 로 저장.
+    """
+    jar_path = Path(jar_path)
+    key, _stamp = _cached_key(jar_path)
+    cache = CACHE_DIR / f"{jar_path.name}-{key}.pickle"
+    try:
+        with open(cache, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') == CORPUS_VERSION:
+            return JarCorpus(jar_path.name, payload['classes'], payload['strings'],
+                             payload['entries'])
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+        pass
+
+    start = time.perf_counter()
+    corpus = _scan_jar(jar_path, jobs)
+    elapsed = time.perf_counter() - start
+    payload = {'version': CORPUS_VERSION, 'classes': corpus.classes,
+               'strings': corpus.strings_table, 'entries': corpus.entries}
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache)
+    _prune(jar_path.name, cache)
+    print(f"  문자열 말뭉치 생성: {jar_path.name} "
+          f"(클래스 {len(corpus.classes)}개, 문자열 {len(corpus.strings_table)}개, "
+          f"{elapsed:.1f}s, {len(corpus.classes) / max(elapsed, 1e-9):,.0f} classes/s)")
+    return corpus
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+java_literals.py - Java 소스 문자열 리터럴 색인 (분석 스크립트 공용 디스크 캐시)
+
+.java 파일마다 토크나이저 한 번으로 모든 문자열 리터럴을 줄 번호·둘러싼 호출·앞뒤 토큰과
+함께 기록해 intermediate/java_literals/{소스 폴더}-{경로 해시}.pickle 에 저장.
+다음 실행에서는 파일 stat(크기·mtime)이 그대로면 그대로 재사용하고, 바뀌었으면 내용 해시가
+같은지 보고 다를 때만 다시 토큰화 → 소스 트리 전체를 다시 읽거나 정규식을 다시 돌리지 않음.
+다시 토큰화할 파일이 많으면(처음 실행, 새 디컴파일) 작업자 프로세스에 나눠 처리.
+
+주석(//, /* */)과 문자 리터럴 안의 따옴표는 건너뜀. 리터럴 값은 Java 이스케이프를 풀어 저장.
+
+JavaLiteral 필드:
+    text       리터럴 값 (이스케이프 해제)
+    line       줄 번호 (1부터)
+    calls      둘러싼 호출 이름, 안쪽부터 — 같은 문장 안({ 블록 경계까지)만.
+               예: addPara(String.format("…")) → ('format', 'addPara')
+               생성자는 'new Foo', 애너테이션은 '@Foo', switch/if 등 키워드 괄호도 이름으로 기록
+    arg        가장 안쪽 호출에서의 인자 위치 (0부터, 호출 밖이면 -1)
+    prev       바로 앞 토큰: 'return', 'case', '=', '(', ',', '+' …
+    next       바로 뒤 토큰: ')', ',', ';', ':', '+', '.equals' …
+    line_text  그 줄 (앞뒤 공백 제거, 120자)
+
+공개 API:
+    JavaLiteral
+    load_literal_index(src_dir, jobs=None) -> LiteralIndex   .files {상대경로: [JavaLiteral…]},
+                                                             literals(); jobs: 토큰화 작업자 수
+    scan_java_source(content) -> list[JavaLiteral]
+    key_usage(lit) -> str | None                    ID/키로 쓰인 경우 그 용도
+    UI_CALLS                                        UI 출력 호출 이름 (find_strings, bytecode_usage)
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+CACHE_DIR = _BASE / 'intermediate' / 'java_literals'
+INDEX_VERSION = 1
+_PARALLEL_MIN_FILES = 200   # 이보다 적으면 프로세스 기동 비용이 더 큼
+
+JavaLiteral = namedtuple('JavaLiteral', 'text line calls arg prev next line_text')
+
+_TOKEN_RE = re.compile(
+    r'(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<block>"""[ \t\f]*\r?\n.*?""")'
+    r'|(?P<string>"(?:[^"\\\n]|\\.)*")'
+    r"|(?P<char>'(?:[^'\\\n]|\\.)*')"
+    r'|(?P<call>(?P<name>[A-Za-z_$][\w$]*)\s*\()'
+    r'|(?P<punct>[(){},])',
+    re.S,
+)
+_ESCAPE_RE = re.compile(r'\\(u+[0-9a-fA-F]{4}|[0-3]?[0-7]{1,2}|.)', re.S)
+_ESCAPES = {'b': '\b', 't': '\t', 'n': '\n', 'f': '\f', 'r': '\r', 's': ' ',
+            '"': '"', "'": "'", '\\': '\\'}
+_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+_OPERATOR_CHARS = frozenset('=!<>+-*/%&|^')
+_NEW_RE = re.compile(r'\bnew\s+(?:[\w$]+\s*\.\s*)*$')
+
+# UI 출력 호출 (번역 안전) — 리터럴을 둘러싼 호출 이름(소스) / 소비 메서드 이름(바이트코드)과 비교
+UI_CALLS = frozenset((
+    'addOption', 'addParagraph', 'addPara', 'addTitle', 'addTooltip', 'setText', 'setTitle',
+    'addButton', 'addMessage', 'addDescription', 'setDescription', 'addSection', 'addNote',
+    'showMenu', 'addIntro', 'setButtonText', 'addBullet', 'addBlockquote', 'addSectionHeading',
+    'addCustom', 'setStatusMessage', 'addError', 'addWarning', 'addInfo', 'addDetail',
+    'addSubTitles', 'addSubtitle', 'setName', 'setTooltip', 'showDialog', 'getTooltip',
+    'setLabel', 'addLabel', 'addRow', 'addCell', 'addHeader', 'getString',
+))
+
+# 리터럴이 유일한 인자일 때 ID/키로 보는 호출
+_KEY_CALLS = frozenset(('equals', 'equalsIgnoreCase', 'get', 'containsKey', 'remove', 'switch'))
+
+
+def _unescape_char(m) -> str:
+    esc = m.group(1)
+    if esc[0] == 'u':
+        return chr(int(esc.lstrip('u'), 16))
+    if esc[0] in '01234567':
+        return chr(int(esc, 8))
+    return _ESCAPES.get(esc, esc)
+
+
+def unescape_java(raw: str) -> str:
+    return _ESCAPE_RE.sub(_unescape_char, raw) if '\\' in raw else raw
+
+
+def _prev_token(content: str, i: int) -> str:
+    i -= 1
+    while i >= 0 and content[i] in ' \t\r\n\f':
+        i -= 1
+    if i < 0:
+        return ''
+    c = content[i]
+    if c in _IDENT_CHARS:
+        j = i
+        while j > 0 and content[j - 1] in _IDENT_CHARS:
+            j -= 1
+        return content[j:i + 1]
+    if c in _OPERATOR_CHARS:
+        j = i
+        while j > 0 and content[j - 1] in _OPERATOR_CHARS:
+            j -= 1
+        return content[j:i + 1]
+    return c
+
+
+def _next_token(content: str, i: int) -> str:
+    n = len(content)
+    while i < n and content[i] in ' \t\r\n\f':
+        i += 1
+    if i >= n:
+        return ''
+    c = content[i]
+    if c == '.':
+        j = i + 1
+        while j < n and content[j] in ' \t\r\n\f':
+            j += 1
+        k = j
+        while k < n and content[k] in _IDENT_CHARS:
+            k += 1
+        return '.' + content[j:k]
+    if c in _OPERATOR_CHARS:
+        j = i
+        while j < n and content[j] in _OPERATOR_CHARS:
+            j += 1
+        return content[i:j]
+    return c
+
+
+def scan_java_source(content: str) -> list:
+    """Java 소스 → [JavaLiteral, …] (등장 순서)."""
+    result = []
+    lines = None
+    stack = []          # [이름, 인자 위치] — '(' 는 이름 None, '{' 는 '{'
+    line, pos = 1, 0
+    for m in _TOKEN_RE.finditer(content):
+        kind = m.lastgroup
+        if kind == 'comment' or kind == 'char':
+            continue
+        if kind == 'string' or kind == 'block':
+            start = m.start()
+            line += content.count('\n', pos, start)
+            pos = start
+            if kind == 'string':
+                text = unescape_java(m.group()[1:-1])
+            else:
+                body = m.group()[3:-3]
+                text = unescape_java(body[body.index('\n') + 1:])
+            calls = []
+            for name, _arg in reversed(stack):
+                if name == '{':
+                    break
+                if name is not None:
+                    calls.append(name)
+            arg = -1
+            for name, a in reversed(stack):
+                if name == '{':
+                    break
+                if name is not None:
+                    arg = a
+                    break
+            if lines is None:
+                lines = content.split('\n')
+            result.append(JavaLiteral(text, line, tuple(calls), arg,
+                                      _prev_token(content, start),
+                                      _next_token(content, m.end()),
+                                      lines[line - 1].strip()[:120]))
+        elif kind == 'call':
+            name = m.group('name')
+            before = content[max(0, m.start() - 64):m.start()]
+            if before.rstrip().endswith('@'):
+                name = '@' + name
+            elif _NEW_RE.search(before):
+                name = 'new ' + name
+            stack.append([name, 0])
+        else:
+            c = m.group()
+            if c == '(':
+                stack.append([None, 0])
+            elif c == '{':
+                stack.append(['{', 0])
+            elif c == ',':
+                if stack:
+                    stack[-1][1] += 1
+            elif c == ')':
+                # 짝이 안 맞는 '{' 는 남겨 둠 (디컴파일 오류 대비)
+                if stack and stack[-1][0] != '{':
+                    stack.pop()
+            elif c == '}':
+                while stack:
+                    if stack.pop()[0] == '{':
+                        break
+    return result
+
+
+def key_usage(lit: JavaLiteral):
+    """
+    리터럴이 ID/키로 쓰인 경우 그 용도, 아니면 None.
+        equals / equalsIgnoreCase / get / containsKey / remove / switch   ("x") 단독 인자
+        equals                 "x".equals(…)
+        put                    put("x", …) 첫 인자
+        case / return          case "x": / return "x";
+        assign                 … = "x";
+        new / annotation       new Foo("x") / @Foo("x") 단독 인자
+    """
+    innermost = lit.calls[0] if lit.calls else None
+    alone = lit.prev == '(' and lit.next == ')'
+    if innermost in _KEY_CALLS and alone:
+        return innermost
+    if lit.next in ('.equals', '.equalsIgnoreCase'):
+        return lit.next[1:]
+    if innermost == 'put' and lit.arg == 0 and lit.prev == '(' and lit.next == ',':
+        return 'put'
+    if lit.prev == 'case':
+        return 'case'
+    if lit.prev == 'return' and lit.next == ';':
+        return 'return'
+    if lit.prev == '=' and lit.next == ';':
+        return 'assign'
+    if innermost and alone:
+        if innermost.startswith('new '):
+            return 'new'
+        if innermost.startswith('@'):
+            return 'annotation'
+    return None
+
+
+class LiteralIndex:
+    """소스 폴더 1개의 리터럴 색인. files: {상대경로(/ 구분): [JavaLiteral, …]} (경로 정렬순)."""
+
+    def __init__(self, src_dir: Path, files: dict):
+        self.src_dir = src_dir
+        self.files = files
+
+    def literals(self):
+        """(상대경로, JavaLiteral) 생성기."""
+        for rel, lits in self.files.items():
+            for lit in lits:
+                yield rel, lit
+
+    def __len__(self):
+        return sum(len(lits) for lits in self.files.values())
+
+
+def _cache_path(src_dir: Path) -> Path:
+    tag = hashlib.sha1(str(src_dir.resolve()).encode('utf-8', 'replace')).hexdigest()[:8]
+    return CACHE_DIR / f"{src_dir.name}-{tag}.pickle"
+
+
+def _scan_bytes(data: bytes) -> list:
+    return scan_java_source(data.decode('utf-8', errors='replace'))
+
+
+def load_literal_index(src_dir, jobs: int = None) -> LiteralIndex:
+    """
+    src_dir 아래 모든 .java 의 리터럴 색인. 바뀐 파일만 다시 토큰화(jobs 개 프로세스,
+    기본 CPU 수)하고 캐시 갱신. src_dir 가 없으면 빈 색인.
+    """
+    src_dir = Path(src_dir)
+    if not src_dir.is_dir():
+        return LiteralIndex(src_dir, {})
+    cache = _cache_path(src_dir)
+    try:
+        with open(cache, 'rb') as f:
+            payload = pickle.load(f)
+        old = payload['files'] if payload.get('version') == INDEX_VERSION else {}
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+        old = {}
+
+    start = time.perf_counter()
+    entries = {}
+    pending = []        # (상대경로, stat, 해시, 내용) — 다시 토큰화할 파일
+    dirty = False
+    for path in sorted(src_dir.rglob('*.java')):
+        rel = path.relative_to(src_dir).as_posix()
+        st = path.stat()
+        prev = old.get(rel)
+        if prev is not None and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+            entries[rel] = prev
+            continue
+        dirty = True
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        if prev is not None and prev[2] == digest:
+            entries[rel] = (st.st_size, st.st_mtime_ns, digest, prev[3])
+        else:
+            entries[rel] = None     # 순서 자리 확보
+            pending.append((rel, st, digest, data))
+
+    scanned = len(pending)
+    jobs = min(jobs or os.cpu_count() or 1, max(1, scanned // (_PARALLEL_MIN_FILES // 2)))
+    if jobs <= 1 or scanned < _PARALLEL_MIN_FILES:
+        results = map(_scan_bytes, [p[3] for p in pending])
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(_scan_bytes, [p[3] for p in pending],
+                           chunksize=max(1, scanned // (jobs * 8)))
+    try:
+        for (rel, st, digest, _data), lits in zip(pending, results):
+            entries[rel] = (st.st_size, st.st_mtime_ns, digest, lits)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    files = {rel: entry[3] for rel, entry in entries.items()}
+
+    if dirty or len(entries) != len(old):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'files': entries}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    if scanned:
+        elapsed = time.perf_counter() - start
+        print(f"  리터럴 색인 갱신: {src_dir.name} (파일 {len(files)}개 중 {scanned}개 토큰화, "
+              f"작업자 {jobs}개, {elapsed:.1f}s)")
+    return LiteralIndex(src_dir, files)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+loose_json.py - Starsector 비표준(loose) JSON 토크나이저 / 원문 보존 번역기
+
+Starsector 데이터 JSON은 # 주석, 후행 쉼표, 따옴표 없는 키/값, Java float 리터럴
+(1.5f, 2d) 등을 허용함. 원문을 한 번만 훑으며 토큰 위치(span)를 기록하므로,
+번역 시 문자열 값의 바이트 구간만 교체하고 주석·들여쓰기·키 순서 등 나머지는
+그대로 유지함. 파서(loads)도 같은 토크나이저로 한 번에 파싱함 (재시도/정규식 전처리 없음).
+
+공개 API:
+    LooseJSONError
+    tokenize(text) -> Iterator[tuple[str, int, int]]
+    loads(text) -> object
+    load(path) -> object
+    collect_keys(obj, keys=None) -> set
+    translate_string_spans(text, translations, blocked_json_keys=None, lookups=None)
+        -> tuple[str, int]
+"""
+
+import json
+import re
+
+# 토큰 종류: '{' '}' '[' ']' ':' ',' 'str' (큰따옴표 문자열) 'bare' (숫자·true·따옴표 없는 키 등)
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n\ufeff]+|\#[^\n]*)
+  | (?P<str>"(?:[^"\\]|\\.)*")
+  | (?P<punct>[{}\[\]:,])
+  | (?P<bare>[^\s{}\[\]:,"\#]+)
+''', re.VERBOSE | re.DOTALL)
+
+
+class LooseJSONError(ValueError):
+    """loose JSON 구문 오류 (위치 포함)."""
+
+    def __init__(self, msg: str, text: str, pos: int):
+        line = text.count('\n', 0, pos) + 1
+        col = pos - (text.rfind('\n', 0, pos) + 1) + 1
+        super().__init__(f"{msg}: line {line} column {col} (char {pos})")
+        self.pos = pos
+
+
+def tokenize(text: str):
+    """
+    (kind, start, end) 토큰 생성기. 공백과 # 주석은 건너뜀.
+    kind: '{' '}' '[' ']' ':' ',' 'str' 'bare'
+    """
+    pos = 0
+    n = len(text)
+    match = _TOKEN_RE.match
+    while pos < n:
+        m = match(text, pos)
+        if m is None:
+            raise LooseJSONError("Unterminated string or invalid token", text, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind == 'punct':
+            yield text[pos], pos, end
+        elif kind != 'ws':
+            yield kind, pos, end
+        pos = end
+
+
+def _decode_string(text: str, start: int, end: int) -> str:
+    # 문자열 안의 raw 개행/탭도 허용 (strict=False)
+    return json.loads(text[start:end], strict=False)
+
+
+# 따옴표 없는 값 중 숫자 (Java 접미사 f/F/d/D/l/L 허용)
+_NUMBER_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?([fFdDlL]?)$')
+
+_BARE_CONSTANTS = {
+    'true': True, 'false': False, 'null': None,
+    'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf'),
+}
+
+
+def _bare_value(token: str):
+    """따옴표 없는 값 → Python 값. 숫자/상수가 아니면 문자열 그대로 (예: scope:CUSTOM)."""
+    if token in _BARE_CONSTANTS:
+        return _BARE_CONSTANTS[token]
+    m = _NUMBER_RE.match(token)
+    if m is None:
+        return token
+    suffix = m.group(1)
+    core = token[:len(token) - len(suffix)] if suffix else token
+    if suffix in ('', 'l', 'L') and not any(c in core for c in '.eE'):
+        return int(core)
+    return float(core)
+
+
+def loads(text: str):
+    """
+    Starsector loose JSON → Python 객체 (표준 JSON 은 json.loads 와 같은 결과).
+
+    허용: # 주석, 후행 쉼표, 따옴표 없는 키/값, Java float 리터럴, 문자열 내 raw 개행.
+    구문 오류 시 LooseJSONError (ValueError 하위 클래스).
+    """
+    root = []        # 최상위 값 (0 또는 1개)
+    stack = []       # [컨테이너, 대기 중인 키, 상태] — 상태: 'key' | 'colon' | 'value'
+
+    def attach(value, pos):
+        if not stack:
+            if root:
+                raise LooseJSONError("Extra data", text, pos)
+            root.append(value)
+            return
+        top = stack[-1]
+        container = top[0]
+        if isinstance(container, list):
+            container.append(value)
+            return
+        if top[2] != 'value':
+            raise LooseJSONError("Expecting ':' delimiter", text, pos)
+        container[top[1]] = value
+        top[1], top[2] = None, 'key'
+
+    for kind, start, end in tokenize(text):
+        top = stack[-1] if stack else None
+        in_obj = top is not None and isinstance(top[0], dict)
+
+        if kind in ('{', '['):
+            if in_obj and top[2] == 'key':
+                raise LooseJSONError("Expecting property name", text, start)
+            new = {} if kind == '{' else []
+            attach(new, start)
+            stack.append([new, None, 'key'])
+        elif kind in ('}', ']'):
+            want = dict if kind == '}' else list
+            if top is None or not isinstance(top[0], want) or (in_obj and top[2] != 'key'):
+                raise LooseJSONError(f"Unexpected '{kind}'", text, start)
+            stack.pop()
+        elif kind == ',':
+            if top is None or (in_obj and top[2] != 'key'):
+                raise LooseJSONError("Unexpected ','", text, start)
+        elif kind == ':':
+            if not in_obj or top[2] != 'colon':
+                raise LooseJSONError("Unexpected ':'", text, start)
+            top[2] = 'value'
+        elif in_obj and top[2] == 'key':
+            top[1] = _decode_string(text, start, end) if kind == 'str' else text[start:end]
+            top[2] = 'colon'
+        elif kind == 'str':
+            attach(_decode_string(text, start, end), start)
+        else:
+            attach(_bare_value(text[start:end]), start)
+
+    if stack:
+        raise LooseJSONError("Unexpected end of input", text, len(text))
+    if not root:
+        raise LooseJSONError("Expecting value", text, 0)
+    return root[0]
+
+
+def load(path):
+    """파일 경로 → loads (UTF-8, BOM 허용)."""
+    with open(path, encoding='utf-8-sig') as f:
+        return loads(f.read())
+
+
+def collect_keys(obj, keys: set = None) -> set:
+    """파싱된 값 안의 모든 객체 키 (중첩 dict/list 재귀)."""
+    if keys is None:
+        keys = set()
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            keys.add(k)
+            collect_keys(v, keys)
+    elif isinstance(obj, list):
+        for v in obj:
+            collect_keys(v, keys)
+    return keys
+
+
+def translate_string_spans(text: str, translations: dict,
+                           blocked_json_keys: set = None, lookups: set = None) -> tuple:
+    """
+    원문 텍스트에서 사전에 있는 문자열 값만 제자리 교체.
+
+    번역 규칙 (build_mods JSON 번역 규칙):
+      - 키는 번역하지 않음
+      - blocked_json_keys 에 속한 키 아래 값은 건너뜀
+      - 리스트 항목은 리스트를 담은 키를 부모 키로 물려받음
+
+    lookups 가 주어지면 사전 조회 대상 문자열을 수집.
+    반환: (새 텍스트, 교체한 문자열 수). 교체가 없으면 원문 그대로 반환.
+    구문 오류 시 LooseJSONError.
+    """
+    # 스택 항목: [컨테이너 종류, 현재 키(또는 물려받은 키), 키 대기 여부]
+    stack = []
+    chunks = []
+    last = 0
+    replaced = 0
+    blocked = blocked_json_keys or ()
+
+    for kind, start, end in tokenize(text):
+        top = stack[-1] if stack else None
+
+        if kind in ('{', '['):
+            if top is not None and top[0] == 'obj' and top[2]:
+                raise LooseJSONError("Expecting property name", text, start)
+            parent_key = top[1] if top is not None else None
+            stack.append(['obj', None, True] if kind == '{' else ['arr', parent_key, False])
+            continue
+        if kind in ('}', ']'):
+            want = 'obj' if kind == '}' else 'arr'
+            if top is None or top[0] != want:
+                raise LooseJSONError(f"Unexpected '{kind}'", text, start)
+            stack.pop()
+            continue
+        if kind == ',':
+            if top is not None and top[0] == 'obj':
+                top[2] = True
+            continue
+        if kind == ':':
+            if top is None or top[0] != 'obj' or top[2]:
+                raise LooseJSONError("Unexpected ':'", text, start)
+            continue
+
+        # 'str' 또는 'bare'
+        if top is not None and top[0] == 'obj' and top[2]:
+            # 키 위치 — 따옴표 없는 키 허용
+            top[1] = _decode_string(text, start, end) if kind == 'str' else text[start:end]
+            top[2] = False
+            continue
+        if kind != 'str':
+            continue  # 숫자·true·null 등
+
+        parent_key = top[1] if top is not None else None
+        if parent_key in blocked:
+            continue  # 코드 식별자 키 — 번역 건너뜀
+        value = _decode_string(text, start, end)
+        if lookups is not None:
+            lookups.add(value)
+        new_value = translations.get(value)
+        if new_value is None or new_value == value:
+            continue
+        chunks.append(text[last:start])
+        chunks.append(json.dumps(new_value, ensure_ascii=False))
+        last = end
+        replaced += 1
+
+    if stack:
+        raise LooseJSONError("Unexpected end of input", text, len(text))
+    if not replaced:
+        return text, 0
+    chunks.append(text[last:])
+    return ''.join(chunks), replaced
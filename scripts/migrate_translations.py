@@ -12,11 +12,13 @@ intermediate/final_translations.json (16,190개) 를 세 파일로 분리:
 
 import json
 import os
-import struct
 import sys
-import zipfile
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from backup_store import original_path
+from jar_corpus import load_corpus
+
 SCRIPT_DIR = Path(__file__).parent.parent
 
 
@@ -26,48 +28,6 @@ def _resolve(p, base):
     return p
 
 
-def extract_jar_strings(jar_path: str) -> set:
-    """JAR에서 모든 CONSTANT_Utf8 문자열 추출."""
-    strings = set()
-    try:
-        with zipfile.ZipFile(jar_path, 'r') as z:
-            for name in z.namelist():
-                if not name.endswith('.class'):
-                    continue
-                try:
-                    data = z.read(name)
-                    if data[:4] != b'\xca\xfe\xba\xbe':
-                        continue
-                    count = struct.unpack_from('>H', data, 8)[0]
-                    pos = 10
-                    i = 1
-                    while i < count:
-                        tag = data[pos]; pos += 1
-                        if tag == 1:
-                            length = struct.unpack_from('>H', data, pos)[0]; pos += 2
-                            raw = data[pos:pos+length]; pos += length
-                            try:
-                                strings.add(raw.decode('utf-8', errors='replace'))
-                            except Exception:
-                                pass
-                        elif tag in (5, 6):
-                            pos += 8; i += 1
-                        elif tag in (3, 4):
-                            pos += 4
-                        elif tag in (7, 8, 16, 19, 20):
-                            pos += 2
-                        elif tag in (9, 10, 11, 12, 17, 18):
-                            pos += 4
-                        elif tag == 15:
-                            pos += 3
-                        i += 1
-                except Exception:
-                    pass
-    except Exception as e:
-        print(f"  JAR 읽기 오류 {jar_path}: {e}", file=sys.stderr)
-    return strings
-
-
 def main():
     with open(SCRIPT_DIR / 'config.json', encoding='utf-8') as f:
         cfg = json.load(f)
@@ -87,16 +47,19 @@ def main():
         translations = json.load(f)
     print(f"입력 번역 쌍: {len(translations)}개")
 
-    # JAR 문자열 추출 (.bak 우선, 없으면 라이브)
+    # JAR 문자열 추출 (백업 저장소 원본 → .bak → 라이브 순)
     def load_jar_strings(jar_name):
-        for suffix in (jar_name + '.bak', jar_name):
-            path = os.path.join(game_core, suffix)
+        original = original_path(paths, f'core/{jar_name}')
+        candidates = [str(original)] if original else []
+        candidates += [os.path.join(game_core, jar_name + '.bak'),
+                       os.path.join(game_core, jar_name)]
+        for path in candidates:
             if os.path.exists(path):
-                print(f"  {suffix} 추출 중...")
-                s = extract_jar_strings(path)
+                print(f"  {os.path.basename(path)} 추출 중...")
+                s = load_corpus(path).strings()
                 print(f"  → {len(s)}개 문자열")
                 return s
-        print(f"  WARNING: {jar_name} 및 .bak 모두 없음", file=sys.stderr)
+        print(f"  WARNING: {jar_name} 원본·.bak·라이브 모두 없음", file=sys.stderr)
         return set()
 
     print("\napi JAR 문자열 추출...")
@@ -6,24 +6,25 @@
     python 05_patch_classes.py [--no-restore]
 
 입력:
-    ../starsector-core/starfarer.api.jar.bak   (영어 원본 백업)
+    backups/ 원본 저장소의 starfarer.api.jar (CURRENT 스냅샷, 없으면 ../starsector-core/starfarer.api.jar.bak)
     ./patches/common.json + ./patches/api_jar.json
 
 출력:
     ./output/starsector-core/starfarer.api.jar  (패치본)
 
 옵션:
-    --no-restore    .bak → live JAR 복원 단계 건너뜀 (기본: 복원 후 패치)
+    --no-restore    원본 → live JAR 복원 단계 건너뜀 (기본: 복원 후 패치)
 """
 
 import argparse
 import os
-import shutil
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from patch_utils import load_config, load_exclusions, load_translations, patch_jar, resolve_path
+from backup_store import original_path
+from dict_compiler import effective_dictionary
+from patch_utils import load_config, load_exclusions, patch_jar, resolve_path, restore_file
 
 
 def main():
@@ -35,30 +36,33 @@ def main():
 
     paths = load_config()['paths']
     game_core = resolve_path(paths['game_core'])
-    bak_jar  = os.path.join(game_core, 'starfarer.api.jar.bak')
+    # 원본: 백업 저장소 CURRENT 스냅샷 → 없으면 기존 .bak
+    bak_jar  = str(original_path(paths, 'core/starfarer.api.jar')
+                   or os.path.join(game_core, 'starfarer.api.jar.bak'))
     live_jar = os.path.join(game_core, 'starfarer.api.jar')
     out_jar  = os.path.join(resolve_path(paths['output_core']), 'starfarer.api.jar')
 
     if not os.path.exists(bak_jar):
-        print(f"ERROR: .bak not found: {bak_jar}", file=sys.stderr)
-        print("게임 업데이트 전에 백업을 먼저 생성하세요:", file=sys.stderr)
-        print("  cp starsector-core/starfarer.api.jar starsector-core/starfarer.api.jar.bak",
-              file=sys.stderr)
+        print(f"ERROR: 원본 없음: {bak_jar}", file=sys.stderr)
+        print("게임(영어 원본) 상태에서 백업 저장소에 스냅샷을 먼저 기록하세요:", file=sys.stderr)
+        print("  python scripts/backup_store.py snapshot", file=sys.stderr)
         sys.exit(1)
 
     if restore:
-        print(f"[복원] starfarer.api.jar.bak → starfarer.api.jar")
-        shutil.copy2(bak_jar, live_jar)
+        if restore_file(bak_jar, live_jar):
+            print(f"[복원] 원본 → starfarer.api.jar")
+        else:
+            print(f"[복원 생략] starfarer.api.jar 이미 원본과 일치")
     else:
         print("[복원 건너뜀] --no-restore")
 
-    translations = load_translations(paths, 'api_trans')
-    blocked_classes, blocked_strings, blocked_jar_strings = load_exclusions(paths)
-    jar_blocked = blocked_strings | blocked_jar_strings
-    print(f"Loaded {len(translations)} translations (common + api)")
+    # common + api − (blocked_strings ∪ blocked_jar_strings), 소스가 그대로면 컴파일본 재사용
+    translations = effective_dictionary(paths, 'api')
+    blocked_classes, _, _ = load_exclusions(paths)
+    print(f"Loaded {len(translations)} translations (common + api, exclusions 반영)")
 
     os.makedirs(os.path.dirname(out_jar), exist_ok=True)
-    stats = patch_jar(bak_jar, out_jar, translations, blocked_classes, jar_blocked, "api")
+    stats = patch_jar(bak_jar, out_jar, translations, blocked_classes, set(), "api")
 
     print(f"\nProcessed {stats['total']} class files")
     print(f"  Patched:   {stats['patched']}")
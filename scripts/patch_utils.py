@@ -19,9 +19,33 @@ patch_utils.py - Java .class 상수 풀 패칭 공유 라이브러리
     load_exclusions_file(path) -> tuple[set, set, set]
     load_exclusions(paths, mod_id=None) -> tuple[set, set, set]
     load_translations(paths, *extra_keys) -> dict
+
+공개 API (백업 복원):
+    jar_fingerprint(path) -> str
+    files_match(a, b) -> bool
+    restore_file(bak, live) -> bool
+    restore_tree(bak_dir, live_dir) -> tuple[int, int]
+
+공개 API (하드링크 스테이징):
+    stage_tree(src_dir, dst_dir, link=True, skip=None) -> tuple[int, int]
+    write_bytes_private(path, data: bytes) -> None
+    write_text_private(path, text, encoding='utf-8') -> None
+    copy_private(src, dst) -> str
+
+공개 API (트랜잭션 설치):
+    fsync_file(path) -> None
+    fsync_dir(path) -> None
+    install_file(src, live) -> bool            live.kr_new → rename, 이전 상태는 live.kr_prev
+
+공개 API (post_build 훅):
+    HookContext(mod_cfg, paths, output_dir=None)
+    HookContext.from_config(mod_id, cfg=None) -> HookContext
 """
 
+import hashlib
 import json
+import os
+import shutil
 import struct
 import sys
 import zipfile
@@ -230,8 +254,8 @@ def rebuild_class(data: bytes, translations: dict) -> Optional[bytes]:
             except Exception:
                 text = val.decode('utf-8', errors='replace')
 
-            if text in translations:
-                translated = translations[text]
+            translated = translations.get(text)
+            if translated is not None:
                 try:
                     encoded = encode_java_utf8(translated)
                 except Exception:
@@ -294,6 +318,11 @@ def patch_jar(
     Returns:
         dict with keys: total, patched, errors
     """
+    # 컴파일된 사전(mmap)은 조회마다 해시 탐사를 파이썬으로 하므로, Utf8 마다 조회하는
+    # 클래스 루프 전에 dict 로 한 번 펼침
+    if hasattr(translations, 'to_dict'):
+        translations = translations.to_dict()
+
     # blocked_strings 필터링
     effective_translations = translations
     if blocked_strings:
@@ -345,7 +374,6 @@ def patch_jar(
             dst_zip.writestr(info, data)
 
     if in_place:
-        import os
         os.replace(tmp_jar, dst_jar)
 
     return {"total": total, "patched": patched, "errors": errors}
@@ -424,3 +452,300 @@ def load_translations(paths: dict, *extra_keys: str) -> dict:
             with open(p, encoding='utf-8') as f:
                 result.update(json.load(f))
     return result
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 백업 복원 (해시 게이트): 이미 일치하면 복사 생략
+# ──────────────────────────────────────────────────────────────────────────────
+
+def jar_fingerprint(path) -> str:
+    """
+    JAR(ZIP) 지문: 파일 크기 + 중앙 디렉토리(엔트리명·CRC·원본 크기) 해시.
+    중앙 디렉토리만 읽으므로 수십 MB JAR도 전체를 읽지 않고 비교 가능.
+    """
+    h = hashlib.sha1()
+    h.update(str(os.path.getsize(path)).encode())
+    with zipfile.ZipFile(path, 'r') as zf:
+        for info in zf.infolist():
+            h.update(info.filename.encode('utf-8', errors='replace'))
+            h.update(struct.pack('>IQ', info.CRC, info.file_size))
+    return h.hexdigest()
+
+
+def files_match(a, b) -> bool:
+    """
+    a, b 가 같은 내용으로 간주되면 True (복사 생략 판정용).
+
+    1. 크기가 다르면 불일치
+    2. mtime(ns)까지 같으면 일치 — shutil.copy2 가 mtime을 보존하므로
+       직전 복원 결과는 이 단계에서 판정됨
+    3. ZIP(JAR)이면 중앙 디렉토리 지문 비교, 그 외 파일은 불일치로 간주
+    """
+    try:
+        sa, sb = os.stat(a), os.stat(b)
+    except FileNotFoundError:
+        return False
+    if sa.st_size != sb.st_size:
+        return False
+    if sa.st_mtime_ns == sb.st_mtime_ns:
+        return True
+    if zipfile.is_zipfile(a) and zipfile.is_zipfile(b):
+        try:
+            return jar_fingerprint(a) == jar_fingerprint(b)
+        except (zipfile.BadZipFile, OSError):
+            return False
+    return False
+
+
+def restore_file(bak, live) -> bool:
+    """
+    bak → live 복원. 이미 일치하면 복사 생략. 실제로 복원했으면 True.
+    install_file 이 남긴 live.kr_prev 가 bak 과 일치하면 복사 대신 rename (O(1)).
+    복사 시에는 임시 파일 + os.replace — 하드링크로 공유 중인 이전 트리를 건드리지 않음.
+    """
+    if files_match(bak, live):
+        return False
+    prev = Path(str(live) + PREV_SUFFIX)
+    if files_match(bak, prev):
+        os.replace(prev, live)
+        return True
+    copy_private(bak, live)
+    return True
+
+
+def restore_tree(bak_dir, live_dir) -> tuple:
+    """
+    bak_dir → live_dir 파일 단위 복원 (덮어쓰기, 삭제 없음).
+    files_match 로 일치하는 파일은 복사 생략.
+    반환: (복사한 파일 수, 생략한 파일 수)
+    """
+    bak_dir, live_dir = Path(bak_dir), Path(live_dir)
+    copied = skipped = 0
+    for root, _dirs, files in os.walk(bak_dir):
+        rel = Path(root).relative_to(bak_dir)
+        target_dir = live_dir / rel
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for fname in files:
+            if restore_file(Path(root) / fname, target_dir / fname):
+                copied += 1
+            else:
+                skipped += 1
+    return copied, skipped
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 하드링크 스테이징: output/mods/{id} 는 게임 원본 파일을 하드링크로 공유하고,
+# 수정하는 파일만 임시 파일 + os.replace 로 교체해 개별 사본을 만든다.
+#
+# 주의: 스테이징된 파일을 open(path, 'w') 로 직접 쓰면 같은 inode를 공유하는
+#       게임 원본까지 수정됨. output/mods/ 아래 파일은 반드시 *_private 헬퍼로 쓸 것.
+# ──────────────────────────────────────────────────────────────────────────────
+
+def stage_tree(src_dir, dst_dir, link: bool = True, skip=None) -> tuple:
+    """
+    src_dir → dst_dir 스테이징. link=True 면 파일마다 하드링크를 시도하고
+    실패(다른 볼륨, 미지원 FS 등) 시 copy2 로 대체.
+    skip: 건너뛸 상대경로 집합 (posix, os.path.normcase 적용된 값)
+    반환: (하드링크 수, 복사 수)
+    """
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    skip = skip or set()
+    linked = copied = 0
+    for root, _dirs, files in os.walk(src_dir):
+        rel_dir = Path(root).relative_to(src_dir)
+        target_dir = dst_dir / rel_dir
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for fname in files:
+            if skip and os.path.normcase((rel_dir / fname).as_posix()) in skip:
+                continue
+            s, d = os.path.join(root, fname), target_dir / fname
+            if link:
+                try:
+                    os.link(s, d)
+                    linked += 1
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(s, d)
+            copied += 1
+    return linked, copied
+
+
+def _replace_with_tmp(path: Path, writer) -> None:
+    """같은 디렉토리의 임시 파일에 writer(tmp)로 쓴 뒤 os.replace — 하드링크 분리."""
+    path = Path(path)
+    tmp = path.with_name(path.name + '.kr_tmp')
+    try:
+        writer(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_bytes_private(path, data: bytes) -> None:
+    """path 에 data 기록. 하드링크된 원본에는 절대 기록되지 않음."""
+    _replace_with_tmp(path, lambda tmp: tmp.write_bytes(data))
+
+
+def write_text_private(path, text: str, encoding: str = 'utf-8') -> None:
+    """path 에 text 기록. 하드링크된 원본에는 절대 기록되지 않음."""
+    _replace_with_tmp(path, lambda tmp: tmp.write_text(text, encoding=encoding))
+
+
+def copy_private(src, dst) -> str:
+    """shutil.copy2 대체 (copytree copy_function 호환). 하드링크된 dst 에 덮어쓰지 않음."""
+    _replace_with_tmp(dst, lambda tmp: shutil.copy2(src, tmp))
+    return str(dst)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# post_build 훅 컨텍스트: 훅 스크립트는 run(ctx) 를 정의하고, build_mods 는 빌드 중
+# 이미 만든 사전·제외목록·파일 목록을 ctx 에 담아 같은 프로세스에서 호출함.
+# 단독 실행(--mod) 시에는 HookContext.from_config() 가 필요한 항목만 지연 로드.
+# ──────────────────────────────────────────────────────────────────────────────
+
+class HookContext:
+    """
+    post_build 훅에 전달되는 모드 빌드 컨텍스트.
+
+    속성:
+        mod_id, mod_cfg, paths
+        output_dir        output/mods/{mod_id}
+        mod_translations  모드 전용 사전 − blocked_strings (dict_compiler 'mod' 대상)
+        translations      common + 모드 전용 사전 − blocked_strings − blocked_jar_strings
+                          (모드 전용 우선, JAR 패치용 — dict_compiler 'mod_jar' 대상)
+        exclusions        (blocked_classes, blocked_strings, blocked_jar_strings) 전역 ∪ 모드
+        files             output_dir 기준 상대경로(posix, normcase) 집합
+
+    사전·제외목록·파일 목록은 처음 접근할 때 로드하며, build_mods 가 미리 채워 두면
+    재로딩하지 않음. 사전은 읽기 전용 CompiledDict (mmap) — 같은 ctx 를 다음 훅이 공유.
+    """
+
+    def __init__(self, mod_cfg: dict, paths: dict, output_dir=None):
+        self.mod_cfg = mod_cfg
+        self.mod_id = mod_cfg['id']
+        self.paths = paths
+        if output_dir is None:
+            output_dir = Path(resolve_path(paths['output_mods'])) / self.mod_id
+        self.output_dir = Path(output_dir)
+        self._mod_translations = None
+        self._translations = None
+        self._exclusions = None
+        self._files = None
+
+    @classmethod
+    def from_config(cls, mod_id: str, cfg: dict = None):
+        """단독 실행용: config.json 에서 모드 설정을 찾아 컨텍스트 생성 (없으면 id 만)."""
+        if cfg is None:
+            cfg = load_config()
+        mod_cfg = next((m for m in cfg.get('mods', []) if m['id'] == mod_id), {'id': mod_id})
+        return cls(mod_cfg, cfg['paths'])
+
+    def path(self, key: str) -> Path:
+        """config.json paths 항목 → 절대 경로."""
+        return Path(resolve_path(self.paths[key]))
+
+    @property
+    def patch_dir(self) -> Path:
+        return self.path('patches') / self.mod_id
+
+    @property
+    def exclusions(self) -> tuple:
+        if self._exclusions is None:
+            self._exclusions = load_exclusions(self.paths, self.mod_id)
+        return self._exclusions
+
+    @exclusions.setter
+    def exclusions(self, value: tuple):
+        self._exclusions = value
+
+    @property
+    def mod_translations(self):
+        if self._mod_translations is None:
+            from dict_compiler import effective_dictionary
+            self._mod_translations = effective_dictionary(self.paths, 'mod', self.mod_id)
+        return self._mod_translations
+
+    @mod_translations.setter
+    def mod_translations(self, value):
+        self._mod_translations = value
+
+    @property
+    def translations(self):
+        if self._translations is None:
+            from dict_compiler import effective_dictionary
+            self._translations = effective_dictionary(self.paths, 'mod_jar', self.mod_id)
+        return self._translations
+
+    @property
+    def files(self) -> set:
+        if self._files is None:
+            files = set()
+            for root, _dirs, names in os.walk(self.output_dir):
+                rel = Path(root).relative_to(self.output_dir).as_posix()
+                for name in names:
+                    files.add(os.path.normcase(name if rel == '.' else f"{rel}/{name}"))
+            self._files = files
+        return self._files
+
+    def has_file(self, rel: str) -> bool:
+        """output_dir 기준 상대경로 파일 존재 여부 (파일 목록 조회, stat 없음)."""
+        return os.path.normcase(rel) in self.files
+
+    def add_file(self, rel: str) -> None:
+        """훅이 output_dir 에 새 파일을 만들었을 때 파일 목록에 등록."""
+        if self._files is not None:
+            self._files.add(os.path.normcase(rel))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 트랜잭션 설치: 새 내용은 옆 경로(.kr_new)에 만들고 fsync 후 rename 으로 교체,
+# 직전 상태는 .kr_prev 로 남겨 두어 롤백·복원을 rename 한 번으로 처리.
+# ──────────────────────────────────────────────────────────────────────────────
+
+NEW_SUFFIX = '.kr_new'
+PREV_SUFFIX = '.kr_prev'
+
+
+def fsync_file(path) -> None:
+    with open(path, 'rb+') as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(path) -> None:
+    """디렉토리 엔트리(rename) 영속화 — POSIX 전용, Windows 는 생략."""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def install_file(src, live) -> bool:
+    """
+    src → live 원자적 설치. 이미 일치하면 생략하고 False.
+
+    1. live.kr_new 에 복사 + fsync
+    2. 현재 live 를 live.kr_prev 로 보존 (하드링크, 실패 시 복사)
+    3. os.replace(live.kr_new, live) — 중단되어도 live 는 이전 또는 새 내용 중 하나
+    """
+    live = Path(live)
+    if files_match(src, live):
+        return False
+    new = Path(str(live) + NEW_SUFFIX)
+    prev = Path(str(live) + PREV_SUFFIX)
+    shutil.copy2(src, new)
+    fsync_file(new)
+    if live.exists():
+        if prev.exists():
+            prev.unlink()
+        try:
+            os.link(live, prev)
+        except OSError:
+            shutil.copy2(live, prev)
+    os.replace(new, live)
+    fsync_dir(live.parent)
+    return True
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+string_db.py - 문자열 데이터베이스 (SQLite) + 조회 CLI
+
+게임 JAR·모드 JAR 상수 풀(jar_corpus), 모드 데이터 파일(JSON/CSV), patches/ 사전과
+exclusions 를 intermediate/strings.sqlite 한 곳에 모아 두고, 분석 스크립트를 새로 쓰지
+않고도 조건 조회를 밀리초 단위로 처리.
+
+증분 갱신: 소스(JAR·모드 파일·사전)마다 키(JAR 내용 해시 / 파일 크기·mtime)를 기록해
+두고, 바뀐 소스의 행만 지우고 다시 넣음. 상태(status)는 변경이 있을 때만 재계산.
+
+스키마:
+    sources       (id, kind, name, key)            kind: jar | data | dict | exclusions
+    strings       (id, text UNIQUE, length, words, status)
+                  status: translated | untranslated | blocked (exclusions 의 blocked_strings)
+    locations     (id, path UNIQUE)                JAR: 클래스 경로, 모드: {mod}/{상대경로}
+    origins       (string_id, source_id, location_id, slot, field, role)
+                  JAR:  slot = 상수 풀 슬롯
+                  모드: field = JSON 경로 또는 CSV 열 이름, slot = CSV 행 번호
+                  role: 비트 마스크 — 1 리터럴, 2 식별자, 4 디스크립터, 8 모드 데이터 (0 기타)
+    translations  (string_id, source_id, dict, value)   dict: common, api_jar, {mod}/translations …
+    blocked       (string_id, source_id)
+
+사용법:
+    python scripts/string_db.py build
+    python scripts/string_db.py query [조건…]
+    python scripts/string_db.py sql "SELECT …"
+
+query 조건:
+    --status S        translated | untranslated | blocked
+    --dict NAME       --status translated/untranslated 를 특정 사전 기준으로 판정
+    --role R          literal | identifier | descriptor | data | other
+    --prefix P        위치(클래스 경로 / 모드 파일) 접두어, 예: com/fs/starfarer/campaign/
+    --source S        소스 이름 부분 일치, 예: starfarer_obf.jar, Nexerelin
+    --min-words N / --max-words N / --min-len N
+    --contains TEXT   부분 문자열
+    --limit N (기본 50, 0 = 전체) / --count / --json / --refresh (조회 전 증분 갱신)
+
+예:
+    # com/fs/starfarer/campaign/ 의 미번역 리터럴 중 3단어 이상
+    python scripts/string_db.py query --status untranslated --role literal \\
+        --prefix com/fs/starfarer/campaign/ --min-words 3
+"""
+
+import argparse
+import csv
+import io
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from backup_store import original_path
+from jar_corpus import ROLE_DESCRIPTOR, ROLE_IDENTIFIER, ROLE_LITERAL, corpus_key, load_corpus
+from loose_json import LooseJSONError, loads as loads_loose_json
+from patch_utils import load_config, resolve_path
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+DB_PATH = _BASE / 'intermediate' / 'strings.sqlite'
+SCHEMA_VERSION = 2
+
+ROLE_DATA = 8
+ROLE_NAMES = {
+    'literal': ROLE_LITERAL, 'identifier': ROLE_IDENTIFIER,
+    'descriptor': ROLE_DESCRIPTOR, 'data': ROLE_DATA, 'other': 0,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL UNIQUE, key TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY, text TEXT NOT NULL UNIQUE,
+    length INTEGER NOT NULL, words INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'untranslated');
+CREATE TABLE IF NOT EXISTS locations (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS origins (
+    string_id INTEGER NOT NULL, source_id INTEGER NOT NULL,
+    location_id INTEGER NOT NULL, slot INTEGER, field TEXT, role INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS translations (
+    string_id INTEGER NOT NULL, source_id INTEGER NOT NULL, dict TEXT NOT NULL, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS blocked (string_id INTEGER NOT NULL, source_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_strings_status ON strings(status);
+CREATE INDEX IF NOT EXISTS idx_origins_string ON origins(string_id);
+CREATE INDEX IF NOT EXISTS idx_origins_location ON origins(location_id);
+CREATE INDEX IF NOT EXISTS idx_origins_source ON origins(source_id);
+CREATE INDEX IF NOT EXISTS idx_translations_string ON translations(string_id, dict);
+CREATE INDEX IF NOT EXISTS idx_translations_source ON translations(source_id);
+CREATE INDEX IF NOT EXISTS idx_blocked_string ON blocked(string_id);
+CREATE INDEX IF NOT EXISTS idx_blocked_source ON blocked(source_id);
+"""
+
+
+def connect(path=DB_PATH) -> sqlite3.Connection:
+    """DB 연결 (없으면 스키마 생성, 스키마 버전이 다르면 새로 만듦)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is not None and row[0] != str(SCHEMA_VERSION):
+        conn.close()
+        path.unlink()
+        conn = sqlite3.connect(str(path))
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+    conn.execute("PRAGMA case_sensitive_like = ON")
+    return conn
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 소스 수집: (kind, name, key, loader) — loader() 는 행 생성기
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _stat_key(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _original_jar(paths: dict, key: str, fallback: Path):
+    """백업 저장소 원본 → .bak → 라이브 순."""
+    original = original_path(paths, key)
+    for p in ((Path(original),) if original else ()) + (Path(str(fallback) + '.bak'), fallback):
+        if p.is_file():
+            return p
+    return None
+
+
+def _jar_rows(jar_path: Path):
+    for cls, slot, role, text in load_corpus(jar_path).records():
+        yield 'origin', text, cls, slot, None, role
+
+
+def _json_strings(obj, path: str):
+    if isinstance(obj, str):
+        yield path, obj
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _json_strings(v, f"{path}.{k}" if path else str(k))
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            yield from _json_strings(v, f"{path}[{i}]")
+
+
+def _data_rows(file_path: Path, location: str):
+    text = file_path.read_text(encoding='utf-8-sig', errors='replace')
+    if file_path.suffix == '.json':
+        try:
+            obj = loads_loose_json(text)
+        except LooseJSONError as e:
+            print(f"  WARN: JSON 파싱 실패 {location}: {e}", file=sys.stderr)
+            return
+        for field, value in _json_strings(obj, ''):
+            if value.strip():
+                yield 'origin', value, location, None, field, ROLE_DATA
+        return
+    rows = csv.reader(io.StringIO(text))
+    header = next(rows, None)
+    if header is None:
+        return
+    for row_no, row in enumerate(rows, start=2):
+        for col, cell in enumerate(row):
+            if not cell.strip():
+                continue
+            try:
+                float(cell)
+                continue  # 숫자 셀
+            except ValueError:
+                pass
+            field = header[col] if col < len(header) else str(col)
+            yield 'origin', cell, location, row_no, field, ROLE_DATA
+
+
+def _dict_rows(dict_path: Path, dict_name: str):
+    with open(dict_path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        return
+    for k, v in data.items():
+        if isinstance(v, str):
+            yield 'translation', k, dict_name, v
+
+
+def _exclusion_rows(excl_path: Path):
+    with open(excl_path, encoding='utf-8') as f:
+        data = json.load(f)
+    for k in set(data.get('blocked_strings', [])) | set(data.get('blocked_jar_strings', [])):
+        yield 'blocked', k
+
+
+def collect_sources(cfg: dict) -> list:
+    """현재 설정 기준 소스 목록 [(kind, name, key, loader)]."""
+    from build_mods import collect_translatable_files
+
+    paths = cfg['paths']
+    game_core = Path(resolve_path(paths['game_core']))
+    game_mods = Path(resolve_path(paths['game_mods']))
+    patches = Path(resolve_path(paths['patches']))
+    sources = []
+
+    for jar_name in ('starfarer.api.jar', 'starfarer_obf.jar'):
+        jar = _original_jar(paths, f'core/{jar_name}', game_core / jar_name)
+        if jar is not None:
+            sources.append(('jar', f'jar:{jar_name}', corpus_key(jar),
+                            lambda jar=jar: _jar_rows(jar)))
+
+    for mod in cfg.get('mods', []):
+        if not mod.get('enabled', True):
+            continue
+        mod_id = mod['id']
+        mod_dir = original_path(paths, f'mods/{mod_id}') or game_mods / (mod_id + '.bak')
+        if not Path(mod_dir).is_dir():
+            mod_dir = game_mods / mod_id
+        if not mod_dir.is_dir():
+            continue
+        if mod.get('mod_jar') and (mod_dir / mod['mod_jar']).is_file():
+            jar = mod_dir / mod['mod_jar']
+            sources.append(('jar', f'jar:{mod_id}/{mod["mod_jar"]}', corpus_key(jar),
+                            lambda jar=jar: _jar_rows(jar)))
+        for f in collect_translatable_files(mod_dir):
+            location = f"{mod_id}/{f.relative_to(mod_dir).as_posix()}"
+            sources.append(('data', f'data:{location}', _stat_key(f),
+                            lambda f=f, location=location: _data_rows(f, location)))
+
+    if patches.is_dir():
+        for f in sorted(patches.glob('*.json')) + sorted(patches.glob('*/*.json')):
+            rel = f.relative_to(patches).with_suffix('').as_posix()
+            if f.name == 'exclusions.json':
+                sources.append(('exclusions', f'exclusions:{rel}', _stat_key(f),
+                                lambda f=f: _exclusion_rows(f)))
+            else:
+                sources.append(('dict', f'dict:{rel}', _stat_key(f),
+                                lambda f=f, rel=rel: _dict_rows(f, rel)))
+    return sources
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 증분 갱신
+# ──────────────────────────────────────────────────────────────────────────────
+
+def update(conn: sqlite3.Connection, cfg: dict, verbose: bool = True) -> dict:
+    """바뀐 소스만 다시 적재. 반환: {'updated': n, 'removed': n, 'unchanged': n}"""
+    start = time.perf_counter()
+    sources = collect_sources(cfg)
+    known = {name: (sid, key) for sid, name, key in
+             conn.execute("SELECT id, name, key FROM sources")}
+    current = {name for _kind, name, _key, _loader in sources}
+    stale = [(sid, name) for name, (sid, _key) in known.items() if name not in current]
+    changed = [s for s in sources if known.get(s[1], (None, None))[1] != s[2]]
+    stats = {'updated': len(changed), 'removed': len(stale),
+             'unchanged': len(sources) - len(changed)}
+    if not changed and not stale:
+        return stats
+
+    ids = dict(conn.execute("SELECT text, id FROM strings"))
+    next_id = (conn.execute("SELECT MAX(id) FROM strings").fetchone()[0] or 0) + 1
+    new_strings = []
+    loc_ids = dict(conn.execute("SELECT path, id FROM locations"))
+    next_loc = (conn.execute("SELECT MAX(id) FROM locations").fetchone()[0] or 0) + 1
+    new_locations = []
+
+    def location_id(path: str) -> int:
+        nonlocal next_loc
+        lid = loc_ids.get(path)
+        if lid is None:
+            lid = loc_ids[path] = next_loc
+            next_loc += 1
+            new_locations.append((lid, path))
+        return lid
+
+    def string_id(text: str) -> int:
+        nonlocal next_id
+        sid = ids.get(text)
+        if sid is None:
+            sid = ids[text] = next_id
+            next_id += 1
+            new_strings.append((sid, text, len(text), len(text.split())))
+        return sid
+
+    with conn:
+        for sid, name in stale:
+            for table in ('origins', 'translations', 'blocked'):
+                conn.execute(f"DELETE FROM {table} WHERE source_id = ?", (sid,))
+            conn.execute("DELETE FROM sources WHERE id = ?", (sid,))
+
+        for kind, name, key, loader in changed:
+            row = known.get(name)
+            if row is not None:
+                src_id = row[0]
+                for table in ('origins', 'translations', 'blocked'):
+                    conn.execute(f"DELETE FROM {table} WHERE source_id = ?", (src_id,))
+                conn.execute("UPDATE sources SET key = ?, kind = ? WHERE id = ?",
+                             (key, kind, src_id))
+            else:
+                src_id = conn.execute("INSERT INTO sources (kind, name, key) VALUES (?, ?, ?)",
+                                      (kind, name, key)).lastrowid
+            origins, translations, blocked = [], [], []
+            for rec in loader():
+                if rec[0] == 'origin':
+                    _, text, location, slot, field, role = rec
+                    origins.append((string_id(text), src_id, location_id(location),
+                                    slot, field, role))
+                elif rec[0] == 'translation':
+                    _, text, dict_name, value = rec
+                    translations.append((string_id(text), src_id, dict_name, value))
+                else:
+                    blocked.append((string_id(rec[1]), src_id))
+            conn.executemany("INSERT INTO strings (id, text, length, words) VALUES (?, ?, ?, ?)",
+                             new_strings)
+            new_strings.clear()
+            conn.executemany("INSERT INTO locations VALUES (?, ?)", new_locations)
+            new_locations.clear()
+            conn.executemany("INSERT INTO origins VALUES (?, ?, ?, ?, ?, ?)", origins)
+            conn.executemany("INSERT INTO translations VALUES (?, ?, ?, ?)", translations)
+            conn.executemany("INSERT INTO blocked VALUES (?, ?)", blocked)
+            if verbose:
+                print(f"  적재: {name} (출처 {len(origins)}, 번역 {len(translations)}, "
+                      f"제외 {len(blocked)})")
+
+        conn.execute("""
+            DELETE FROM strings WHERE
+                NOT EXISTS (SELECT 1 FROM origins o WHERE o.string_id = strings.id) AND
+                NOT EXISTS (SELECT 1 FROM translations t WHERE t.string_id = strings.id) AND
+                NOT EXISTS (SELECT 1 FROM blocked b WHERE b.string_id = strings.id)""")
+        conn.execute("""
+            DELETE FROM locations WHERE
+                NOT EXISTS (SELECT 1 FROM origins o WHERE o.location_id = locations.id)""")
+        conn.execute("""
+            UPDATE strings SET status = CASE
+                WHEN EXISTS (SELECT 1 FROM blocked b WHERE b.string_id = strings.id) THEN 'blocked'
+                WHEN EXISTS (SELECT 1 FROM translations t WHERE t.string_id = strings.id)
+                    THEN 'translated'
+                ELSE 'untranslated' END""")
+
+    if verbose:
+        print(f"  문자열 DB 갱신: 소스 {stats['updated']}개 적재, {stats['removed']}개 제거, "
+              f"{stats['unchanged']}개 그대로 ({time.perf_counter() - start:.1f}s)")
+    return stats
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 조회
+# ──────────────────────────────────────────────────────────────────────────────
+
+def build_query(args) -> tuple:
+    """query 인자 → (SQL, 파라미터). 문자열 1개당 1행 (첫 위치 + 위치 수)."""
+    where, params = [], []
+    if args.status:
+        if args.dict and args.status in ('translated', 'untranslated'):
+            op = 'EXISTS' if args.status == 'translated' else 'NOT EXISTS'
+            where.append(f"{op} (SELECT 1 FROM translations t "
+                         f"WHERE t.string_id = s.id AND t.dict = ?)")
+            params.append(args.dict)
+        else:
+            where.append("s.status = ?")
+            params.append(args.status)
+    if args.role:
+        mask = ROLE_NAMES[args.role]
+        where.append("o.role = 0" if mask == 0 else "(o.role & ?) != 0")
+        if mask:
+            params.append(mask)
+    if args.prefix:
+        # GLOB 은 대소문자 구분 + 접두어면 location 인덱스 사용
+        where.append("l.path GLOB ?")
+        params.append(args.prefix.replace('[', '[[]').replace('*', '[*]')
+                      .replace('?', '[?]') + '*')
+    if args.source:
+        where.append("instr(src.name, ?) > 0")
+        params.append(args.source)
+    if args.min_words:
+        where.append("s.words >= ?")
+        params.append(args.min_words)
+    if args.max_words:
+        where.append("s.words <= ?")
+        params.append(args.max_words)
+    if args.min_len:
+        where.append("s.length >= ?")
+        params.append(args.min_len)
+    if args.contains:
+        where.append("instr(s.text, ?) > 0")
+        params.append(args.contains)
+
+    sql = ("SELECT s.text, s.status, MIN(l.path), COUNT(DISTINCT l.id) "
+           "FROM strings s JOIN origins o ON o.string_id = s.id "
+           "JOIN locations l ON l.id = o.location_id "
+           "JOIN sources src ON src.id = o.source_id")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " GROUP BY s.id ORDER BY s.text"
+    if args.count:
+        sql = f"SELECT COUNT(*) FROM ({sql})"
+    elif args.limit:
+        sql += " LIMIT ?"
+        params.append(args.limit)
+    return sql, params
+
+
+def cmd_query(conn: sqlite3.Connection, args) -> None:
+    sql, params = build_query(args)
+    start = time.perf_counter()
+    rows = conn.execute(sql, params).fetchall()
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.count:
+        print(rows[0][0])
+    elif args.json:
+        print(json.dumps([{'text': t, 'status': st, 'location': loc, 'locations': n}
+                          for t, st, loc, n in rows], ensure_ascii=False, indent=2))
+    else:
+        for text, status, location, n in rows:
+            more = f" (+{n - 1})" if n > 1 else ""
+            print(f"[{status}] {text!r}  ← {location}{more}")
+    print(f"{len(rows) if not args.count else 1}행, {elapsed:.1f} ms", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='문자열 데이터베이스')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('build', help='증분 갱신')
+    q = sub.add_parser('query', help='조건 조회')
+    q.add_argument('--status', choices=['translated', 'untranslated', 'blocked'])
+    q.add_argument('--dict')
+    q.add_argument('--role', choices=sorted(ROLE_NAMES))
+    q.add_argument('--prefix')
+    q.add_argument('--source')
+    q.add_argument('--min-words', type=int)
+    q.add_argument('--max-words', type=int)
+    q.add_argument('--min-len', type=int)
+    q.add_argument('--contains')
+    q.add_argument('--limit', type=int, default=50)
+    q.add_argument('--count', action='store_true')
+    q.add_argument('--json', action='store_true')
+    q.add_argument('--refresh', action='store_true')
+    s = sub.add_parser('sql', help='임의 SQL 실행')
+    s.add_argument('statement')
+    args = parser.parse_args()
+
+    fresh = not DB_PATH.exists()
+    conn = connect()
+    try:
+        if args.command == 'build' or fresh or getattr(args, 'refresh', False):
+            update(conn, load_config())
+        if args.command == 'query':
+            cmd_query(conn, args)
+        elif args.command == 'sql':
+            for row in conn.execute(args.statement):
+                print('\t'.join('' if v is None else str(v) for v in row))
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,9 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 BASE_DIR   = SCRIPT_DIR.parent
 
+sys.path.insert(0, str(SCRIPT_DIR))
+from dict_compiler import effective_dictionary
+
 # patches/ 에서 이미 별도 관리 중인 파일 — 덮어쓰지 않음
 SKIP_FILES = {
     'campaign/rules.csv',
@@ -167,21 +170,9 @@ def main():
     korean_root  = game_mods / 'starsectorkorean' / 'data'
     output_root  = patches   / 'starsectorkorean' / 'data'
 
-    # 번역 사전 로드 (common + api_jar + obf_jar 병합)
-    translations = {}
-    for key, label in [('translations', 'common.json'),
-                        ('api_trans',   'api_jar.json'),
-                        ('obf_trans',   'obf_jar.json')]:
-        p = paths.get(key, '')
-        if not p:
-            continue
-        path = (BASE_DIR / p).resolve() if p.startswith('.') else Path(p)
-        if path.exists():
-            with open(path, encoding='utf-8') as f:
-                chunk = json.load(f)
-            translations.update(chunk)
-            print(f'  + {label}: {len(chunk):,}개')
-    print(f'번역 사전 합계: {len(translations):,}개 항목')
+    # 번역 사전 (common + api_jar + obf_jar 병합, dict_compiler 'all' 대상 — 소스가 그대로면 재사용)
+    translations = effective_dictionary(paths, 'all').to_dict()   # 셀마다 조회 — dict 로 펼침
+    print(f'번역 사전 합계: {len(translations):,}개 항목 (common + api_jar + obf_jar)')
 
     print('=' * 60)
     print('sync_spec_csvs — 바닐라 CSV + common.json 번역 적용')
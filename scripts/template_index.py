@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+template_index.py - 서식 템플릿 색인: 자리표시자·숫자·앞뒤 공백/구두점만 다른 문자열 묶기
+
+"%d supplies" / "5 supplies" / " supplies", "Combat time: " / "Combat time" 처럼 서식만 다른
+문자열을 같은 템플릿 키로 정규화하고, 사전에 이미 있는 번역을 템플릿 단위로 색인.
+후보 문자열은 키 한 번 계산 + 해시 조회로 번역을 자동 제안 (쌍별 비교 없음, 선형).
+
+정규화:
+    앞 공백, 뒤 공백·구두점(. : ! ? , ; …)   → 떼어 두었다가 제안 시 후보 문자열 것을 그대로 붙임
+    printf 지정자 (%s, %d, %.1f, %1$s …)       → {%}
+    숫자 (5, 1.5, 1,000)                       → {#}
+    예: "Combat time: " → 키 "Combat time", "+%d%% range" → 키 "+{%}{%} range"
+
+사전 항목이 템플릿으로 쓰이려면 번역이 원문과 같은 앞/뒤 부분을 갖고, 원문의 지정자·숫자가
+번역에 모두 그대로 나와야 함 (순서는 달라도 됨). 같은 키에 서로 다른 번역 템플릿이 있으면 충돌.
+
+사용법:
+    python scripts/template_index.py propose [--input FILE | --db] [--out FILE]
+        미번역 후보에 번역 제안 (기본 입력 intermediate/untranslated.json,
+        --db: strings.sqlite 의 untranslated 전체 — 게임 JAR + 모드 말뭉치)
+        → intermediate/template_proposals.json
+    python scripts/template_index.py conflicts [--out FILE]
+        같은 템플릿에 번역이 갈리는 사전 항목 → intermediate/template_conflicts.json
+    python scripts/template_index.py show TEXT …
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import load_config
+from translation_memory import dictionary_entries
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+INTERMEDIATE = _BASE / 'intermediate'
+
+_TOKEN_RE = re.compile(
+    # Java Formatter 변환 문자만 — 공백 플래그는 빼서 "15% shield" 의 "% s" 를 지정자로 안 봄
+    r'(?P<spec>%(?:\d+\$)?[-#+0,(]*\d*(?:\.\d+)?[bBhHsScCdoxXeEfgGaAn%])'
+    r'|(?P<num>\d+(?:[.,]\d+)*)'
+)
+_LEAD_RE = re.compile(r'^\s*')
+_TRAIL_RE = re.compile(r'[\s.:!?,;…]*$')
+_HAS_ALPHA = re.compile(r'[^\W\d_]')
+
+
+def split_affixes(text: str) -> tuple:
+    """(앞 공백, 본문, 뒤 공백·구두점)."""
+    lead = _LEAD_RE.match(text).group()
+    rest = text[len(lead):]
+    trail = _TRAIL_RE.search(rest).group()
+    return lead, rest[:len(rest) - len(trail)], trail
+
+
+def _parse(core: str) -> tuple:
+    """본문 → (리터럴 조각 [n+1], 값 [n], 종류 [n]) — 종류: '%' 지정자, '#' 숫자."""
+    parts, values, kinds = [], [], []
+    pos = 0
+    for m in _TOKEN_RE.finditer(core):
+        parts.append(core[pos:m.start()])
+        values.append(m.group())
+        kinds.append('%' if m.group('spec') else '#')
+        pos = m.end()
+    parts.append(core[pos:])
+    return parts, values, kinds
+
+
+def _key(parts: list, kinds: list) -> str:
+    out = []
+    for i, kind in enumerate(kinds):
+        out.append(parts[i].replace('{', '{{').replace('}', '}}'))
+        out.append('{' + kind + '}')
+    out.append(parts[-1].replace('{', '{{').replace('}', '}}'))
+    return ''.join(out)
+
+
+def template_key(text: str):
+    """템플릿 키, 글자가 없는 문자열(숫자·기호뿐)은 None."""
+    _lead, core, _trail = split_affixes(text)
+    parts, _values, kinds = _parse(core)
+    key = _key(parts, kinds)
+    return key if _HAS_ALPHA.search(''.join(parts)) else None
+
+
+class TemplateIndex:
+    """
+    템플릿 키 → 번역 템플릿.
+        templates  키 → {번역 템플릿: [(원문, 번역, 사전 이름), …]}
+                   번역 템플릿 = 리터럴 문자열과 원문 슬롯 번호(int)의 튜플
+        sources    사전 원문 전체 (이미 번역된 문자열 판정)
+        skipped    번역이 원문과 앞/뒤 부분·지정자·숫자가 맞지 않아 템플릿으로 못 쓴 항목 수
+    """
+
+    def __init__(self, entries):
+        self.templates = defaultdict(dict)
+        self.sources = set()
+        self.skipped = 0
+        for source, translation, dict_name in entries:
+            self.sources.add(source)
+            parsed = self._translation_template(source, translation)
+            if parsed is None:
+                continue
+            key, t_template = parsed
+            self.templates[key].setdefault(t_template, []).append(
+                (source, translation, dict_name))
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> 'TemplateIndex':
+        return cls(dictionary_entries(cfg))
+
+    def _translation_template(self, source: str, translation: str):
+        lead, core, trail = split_affixes(source)
+        parts, values, kinds = _parse(core)
+        if not _HAS_ALPHA.search(''.join(parts)):
+            return None
+        if (len(translation) < len(lead) + len(trail) or not translation.startswith(lead)
+                or not translation.endswith(trail)):
+            self.skipped += 1
+            return None
+        t_core = translation[len(lead):len(translation) - len(trail)]
+        t_parts, t_values, t_kinds = _parse(t_core)
+        if len(t_values) != len(values):
+            self.skipped += 1
+            return None
+        # 번역의 지정자·숫자를 원문 슬롯에 대응 (같은 값이 여러 번이면 앞에서부터)
+        used = [False] * len(values)
+        t_template = []
+        for j, (value, kind) in enumerate(zip(t_values, t_kinds)):
+            for i in range(len(values)):
+                if not used[i] and values[i] == value and kinds[i] == kind:
+                    used[i] = True
+                    break
+            else:
+                self.skipped += 1
+                return None
+            t_template.append(t_parts[j])
+            t_template.append(i)
+        t_template.append(t_parts[-1])
+        return _key(parts, kinds), tuple(t_template)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def propose(self, text: str):
+        """
+        번역 제안 {translation, template, from, dict, conflict} 또는 None.
+        번역 템플릿이 여럿이면 가장 많은 사전 항목이 쓰는 것 (같으면 사전 순서), conflict=True.
+        """
+        lead, core, trail = split_affixes(text)
+        parts, values, kinds = _parse(core)
+        key = _key(parts, kinds)
+        candidates = self.templates.get(key)
+        if not candidates:
+            return None
+        t_template, examples = max(candidates.items(), key=lambda kv: len(kv[1]))
+        filled = ''.join(p if isinstance(p, str) else values[p] for p in t_template)
+        source, _translation, dict_name = examples[0]
+        return {'translation': lead + filled + trail, 'template': key,
+                'from': source, 'dict': dict_name, 'conflict': len(candidates) > 1}
+
+    def conflicts(self) -> dict:
+        """{템플릿 키: [{source, translation, dict}, …]} — 번역 템플릿이 2개 이상인 키."""
+        result = {}
+        for key, candidates in self.templates.items():
+            if len(candidates) > 1:
+                result[key] = [{'source': s, 'translation': t, 'dict': d}
+                               for examples in candidates.values() for s, t, d in examples]
+        return result
+
+
+def _db_untranslated() -> list:
+    from string_db import DB_PATH, connect, update
+    fresh = not DB_PATH.exists()
+    conn = connect()
+    try:
+        if fresh:
+            update(conn, load_config())
+        return [row[0] for row in
+                conn.execute("SELECT text FROM strings WHERE status = 'untranslated'")]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='서식 템플릿 색인')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('propose', help='미번역 후보에 템플릿 번역 제안')
+    p.add_argument('--input', default=str(INTERMEDIATE / 'untranslated.json'))
+    p.add_argument('--db', action='store_true', help='strings.sqlite 의 미번역 문자열 전체')
+    p.add_argument('--out', default=str(INTERMEDIATE / 'template_proposals.json'))
+    c = sub.add_parser('conflicts', help='번역이 갈리는 템플릿')
+    c.add_argument('--out', default=str(INTERMEDIATE / 'template_conflicts.json'))
+    s = sub.add_parser('show', help='문자열의 템플릿 키와 제안')
+    s.add_argument('text', nargs='+')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = TemplateIndex.from_config(load_config())
+    print(f"템플릿 색인: {len(index)}개 (사전 원문 {len(index.sources)}개, "
+          f"서식 불일치로 제외 {index.skipped}개, {time.perf_counter() - start:.2f}s)")
+
+    if args.command == 'show':
+        for text in args.text:
+            print(f"\n{text!r}\n  키: {template_key(text)!r}")
+            proposal = index.propose(text)
+            if proposal:
+                mark = '  (충돌)' if proposal['conflict'] else ''
+                print(f"  제안: {proposal['translation']!r}  ← {proposal['from']!r} "
+                      f"[{proposal['dict']}]{mark}")
+        return
+
+    if args.command == 'conflicts':
+        result = index.conflicts()
+        print(f"충돌 템플릿: {len(result)}개")
+    else:
+        if args.db:
+            texts = _db_untranslated()
+        else:
+            with open(args.input, encoding='utf-8') as f:
+                texts = list(json.load(f))
+        start = time.perf_counter()
+        result = {}
+        for text in texts:
+            if text in index.sources:
+                continue
+            proposal = index.propose(text)
+            if proposal is not None:
+                result[text] = proposal
+        conflicts = sum(1 for p in result.values() if p['conflict'])
+        print(f"후보 {len(texts)}개 중 {len(result)}개 제안 (충돌 템플릿 {conflicts}개, "
+              f"{time.perf_counter() - start:.2f}s)")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"저장: {out}")
+
+
+if __name__ == '__main__':
+    main()
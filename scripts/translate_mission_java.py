@@ -9,28 +9,18 @@ MissionDefinition.java의 브리핑 항목 및 함대 태그라인을 번역한
 사용법:
     python translate_mission_java.py [--mod <mod_id>]
     기본값: starsectorkorean
+
+post_build 훅: build_mods.py 가 run(ctx) 를 같은 프로세스에서 호출.
 """
 
 import argparse
-import json
 import os
 import shutil
+import sys
 from pathlib import Path
 
-SCRIPT_DIR = Path(__file__).parent.parent
-
-
-def _resolve(p, base=SCRIPT_DIR):
-    if isinstance(p, str) and (p.startswith('./') or p.startswith('../') or p == '.'):
-        return str((base / p).resolve())
-    return p
-
-
-with open(SCRIPT_DIR / 'config.json', encoding='utf-8') as _f:
-    _paths = json.load(_f)['paths']
-
-CORE = os.path.join(_resolve(_paths['game_core']), 'data', 'missions')
-OUTPUT_MODS = _resolve(_paths['output_mods'])
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import HookContext, write_text_private
 
 # 번역 매핑: 정확한 문자열 리터럴 기준
 translations = {
@@ -189,19 +179,16 @@ missions = [
 ]
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--mod', default='starsectorkorean', help='모드 ID')
-    args = parser.parse_args()
-    mod_id = args.mod
-
-    mod_dir = os.path.join(OUTPUT_MODS, mod_id, 'data', 'missions')
+def run(ctx: HookContext):
+    core = ctx.path('game_core') / 'data' / 'missions'
+    mod_dir = ctx.output_dir / 'data' / 'missions'
 
     processed = 0
     skipped = 0
     for mission in missions:
-        src_dir = os.path.join(CORE, mission)
+        src_dir = os.path.join(core, mission)
         dst_dir = os.path.join(mod_dir, mission)
+        rel_dir = f'data/missions/{mission}'
 
         if not os.path.isdir(src_dir):
             print(f'SKIP (no src): {mission}')
@@ -213,12 +200,13 @@ def main():
         for fname in os.listdir(src_dir):
             src_file = os.path.join(src_dir, fname)
             dst_file = os.path.join(dst_dir, fname)
-            if os.path.isfile(src_file) and not os.path.exists(dst_file):
+            if os.path.isfile(src_file) and not ctx.has_file(f'{rel_dir}/{fname}'):
                 shutil.copy2(src_file, dst_file)
+                ctx.add_file(f'{rel_dir}/{fname}')
 
         # MissionDefinition.java 번역 적용
         java_dst = os.path.join(dst_dir, 'MissionDefinition.java')
-        if not os.path.exists(java_dst):
+        if not ctx.has_file(f'{rel_dir}/MissionDefinition.java'):
             print(f'SKIP (no java): {mission}')
             skipped += 1
             continue
@@ -234,8 +222,8 @@ def main():
                 content = content.replace(old, new)
                 changed += 1
 
-        with open(java_dst, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # output/mods/ 는 하드링크 스테이징 — 원본 공유 파일에 직접 쓰지 않음
+        write_text_private(java_dst, content)
 
         print(f'OK ({changed:2d} 치환): {mission}')
         processed += 1
@@ -243,5 +231,12 @@ def main():
     print(f'\n처리 완료: {processed}개 / 건너뜀: {skipped}개')
 
 
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mod', default='starsectorkorean', help='모드 ID')
+    args = parser.parse_args()
+    run(HookContext.from_config(args.mod))
+
+
 if __name__ == '__main__':
     main()
@@ -5,20 +5,20 @@ translate_nex_rules_options.py — Nexerelin rules.csv options 컬럼 번역
 rules.csv의 options 컬럼은 각 줄이 [priority:]id:text 형식이므로
 일반적인 CSV 셀 교체로는 번역 불가능. 전용 파서로 text 부분만 번역.
 
-post_build 훅으로 실행:
+post_build 훅 (build_mods.py 가 run(ctx) 호출, 빌드에서 만든 모드 사전 재사용).
+단독 실행:
     python translate_nex_rules_options.py --mod Nexerelin
 """
 
 import argparse
 import csv
 import io
-import json
 import re
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from patch_utils import load_config, load_exclusions, resolve_path
+from patch_utils import HookContext, write_text_private
 
 
 def _split_option_line(line: str):
@@ -91,47 +91,22 @@ def translate_options_cell(cell: str, translations: dict):
     return '\n'.join(new_lines), changed
 
 
-def main():
-    parser = argparse.ArgumentParser(add_help=False)
-    parser.add_argument('--mod', required=True)
-    args, _ = parser.parse_known_args()
-
-    cfg = load_config()
-    paths = cfg['paths']
-
-    output_mods = Path(resolve_path(paths['output_mods']))
-    mod_dir = output_mods / args.mod
-    patches = Path(resolve_path(paths['patches']))
-
-    # Load translations
-    trans_file = patches / args.mod / 'translations.json'
-    if not trans_file.exists():
-        print(f'  [{args.mod}] translations.json 없음 — 건너뜀')
+def run(ctx: HookContext):
+    # 모드 전용 사전 − blocked_strings (빌드 중이면 build_mods 가 이미 만든 사전)
+    translations = ctx.mod_translations
+    if not translations:
+        print(f'  [{ctx.mod_id}] 모드 번역 사전 없음 — 건너뜀')
         return
+    if hasattr(translations, 'to_dict'):
+        translations = translations.to_dict()   # 셀마다 조회 — mmap 탐사 대신 dict
 
-    with open(trans_file, encoding='utf-8') as f:
-        translations = json.load(f)
-
-    # Apply exclusions
-    _, blocked_strings, _ = load_exclusions(paths, args.mod)
-    if blocked_strings:
-        before = len(translations)
-        translations = {k: v for k, v in translations.items() if k not in blocked_strings}
-        removed = before - len(translations)
-        if removed:
-            print(f'  [{args.mod}] blocked_strings {removed}개 제외')
-
-    print(f'  [{args.mod}] options 번역 사전: {len(translations)}개')
+    print(f'  [{ctx.mod_id}] options 번역 사전: {len(translations)}개')
 
     # Process rules.csv (and UNGP_rules.csv if present)
-    target_files = [
-        mod_dir / 'data/campaign/rules.csv',
-        mod_dir / 'data/campaign/UNGP_rules.csv',
-    ]
-
-    for rules_path in target_files:
-        if not rules_path.exists():
+    for rel in ('data/campaign/rules.csv', 'data/campaign/UNGP_rules.csv'):
+        if not ctx.has_file(rel):
             continue
+        rules_path = ctx.output_dir / rel
 
         try:
             text = rules_path.read_text(encoding='utf-8')
@@ -170,11 +145,18 @@ def main():
             out = io.StringIO()
             writer = csv.writer(out, lineterminator='\n')
             writer.writerows(new_rows)
-            rules_path.write_text(out.getvalue(), encoding='utf-8')
+            write_text_private(rules_path, out.getvalue())
             print(f'  {rules_path.name}: {changed_cells}개 options 셀 번역 완료')
         else:
             print(f'  {rules_path.name}: 변경 없음')
 
 
+def main():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--mod', required=True)
+    args, _ = parser.parse_known_args()
+    run(HookContext.from_config(args.mod))
+
+
 if __name__ == '__main__':
     main()
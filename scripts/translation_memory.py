@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+translation_memory.py - 번역 메모리: 미번역 문자열에 비슷한 기존 번역 제안
+
+모든 사전(common, api_jar, obf_jar, 모드별 translations.json)의 원문 키를 문자 3-gram
+집합으로 보고 MinHash 서명 → LSH 밴드 버킷으로 색인. 조회 문자열과 같은 버킷에 걸린
+키만 후보로 삼아 3-gram Jaccard 를 정확히 계산하고 상위 k개를 돌려줌 (전체 비교 없음).
+
+유사도 = |A ∩ B| / |A ∪ B| (A, B: 소문자·공백 정리 후 앞뒤 공백을 붙인 문자 3-gram 집합).
+LSH 는 근사 — 유사도 0.5 이상 쌍은 약 94%, 0.7 이상은 거의 항상 후보에 걸림.
+
+사용법:
+    python scripts/translation_memory.py "Combat readiness: %s"        # 단건 조회
+    python scripts/translation_memory.py --batch                        # untranslated.json 전체
+    python scripts/translation_memory.py --batch intermediate/consistency_gaps.json
+
+옵션:
+    -k N              문자열당 제안 수 (기본 5)
+    --threshold T     최소 유사도 (기본 0.4)
+    --batch [FILE]    {문자열: …} 또는 [문자열, …] JSON 일괄 처리
+                      (기본 intermediate/untranslated.json)
+    --out FILE        일괄 결과 경로 (기본: 입력 옆 {이름}.suggestions.json)
+
+일괄 결과:
+    {"미번역 문자열": [{"source": 원문, "translation": 번역, "dict": 사전, "score": 0.83}, …], …}
+    제안이 하나도 없는 문자열은 생략.
+"""
+
+import argparse
+import heapq
+import json
+import random
+import re
+import sys
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import load_config, resolve_path
+
+_BASE = Path(__file__).parent.parent  # kr_work/ 루트
+DEFAULT_BATCH = _BASE / 'intermediate' / 'untranslated.json'
+
+BANDS = 20
+ROWS = 3             # 밴드당 해시 수 — 유사도 s 쌍이 후보가 될 확률 1 − (1 − s³)²⁰
+_PRIME = (1 << 31) - 1
+_SEED = 0x5EED
+
+_WS_RE = re.compile(r'\s+')
+
+
+def char_grams(text: str) -> frozenset:
+    """소문자·공백 정리 후 앞뒤 공백을 붙인 문자 3-gram 집합."""
+    s = ' ' + _WS_RE.sub(' ', text.lower()).strip() + ' '
+    if len(s) < 3:
+        return frozenset((s,))
+    return frozenset(s[i:i + 3] for i in range(len(s) - 2))
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter) if inter else 0.0
+
+
+def dictionary_entries(cfg: dict):
+    """(원문, 번역, 사전 이름) 생성기 — common → api_jar → obf_jar → 활성 모드 순."""
+    paths = cfg['paths']
+    layers = [(name, Path(resolve_path(paths[key])))
+              for name, key in (('common', 'translations'), ('api_jar', 'api_trans'),
+                                ('obf_jar', 'obf_trans'))
+              if paths.get(key)]
+    patches = Path(resolve_path(paths['patches']))
+    for mod in cfg.get('mods', []):
+        if mod.get('enabled', True):
+            layers.append((mod['id'], patches / mod['id'] / 'translations.json'))
+    for name, path in layers:
+        if not path.is_file():
+            continue
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for source, translation in data.items():
+            if isinstance(translation, str):
+                yield source, translation, name
+
+
+class TranslationMemory:
+    """
+    사전 원문 키 MinHash/LSH 색인.
+        entries   [(원문, 번역, 사전 이름)] — 같은 원문은 먼저 나온 사전의 것 하나만
+        grams     항목별 3-gram 집합
+        buckets   (밴드 번호, 밴드 서명) → 항목 번호 목록
+    """
+
+    def __init__(self, entries):
+        rng = random.Random(_SEED)
+        self._coef = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME))
+                      for _ in range(BANDS * ROWS)]
+        self._gram_hashes = {}
+        self.entries = []
+        self.grams = []
+        self.buckets = defaultdict(list)
+        seen = set()
+        for source, translation, dict_name in entries:
+            if source in seen or not source.strip():
+                continue
+            seen.add(source)
+            idx = len(self.entries)
+            self.entries.append((source, translation, dict_name))
+            grams = char_grams(source)
+            self.grams.append(grams)
+            for band in self._bands(grams):
+                self.buckets[band].append(idx)
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> 'TranslationMemory':
+        """config.json 기준 사전 전체 (common → api_jar → obf_jar → 활성 모드 순)."""
+        return cls(dictionary_entries(cfg))
+
+    def _signature(self, grams: frozenset) -> list:
+        # 3-gram 마다 해시 BANDS×ROWS 개를 한 번만 계산해 두고, 열별 최솟값 = MinHash 서명
+        cache, coef = self._gram_hashes, self._coef
+        columns = []
+        for g in grams:
+            h = cache.get(g)
+            if h is None:
+                v = zlib.crc32(g.encode('utf-8', 'surrogatepass'))
+                h = cache[g] = tuple((a * v + b) % _PRIME for a, b in coef)
+            columns.append(h)
+        return [min(col) for col in zip(*columns)]
+
+    def _bands(self, grams: frozenset):
+        sig = self._signature(grams)
+        for band in range(BANDS):
+            yield band, tuple(sig[band * ROWS:(band + 1) * ROWS])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def suggest(self, text: str, k: int = 5, threshold: float = 0.4) -> list:
+        """[{source, translation, dict, score}, …] — 유사도 내림차순, 같으면 사전 순서."""
+        grams = char_grams(text)
+        candidates = set()
+        for band in self._bands(grams):
+            bucket = self.buckets.get(band)
+            if bucket:
+                candidates.update(bucket)
+        scored = []
+        for idx in candidates:
+            score = similarity(grams, self.grams[idx])
+            if score >= threshold:
+                scored.append((score, -idx))
+        result = []
+        for score, neg_idx in heapq.nlargest(k, scored):
+            source, translation, dict_name = self.entries[-neg_idx]
+            result.append({'source': source, 'translation': translation,
+                           'dict': dict_name, 'score': round(score, 3)})
+        return result
+
+
+def suggest_batch(tm: TranslationMemory, texts, k: int = 5, threshold: float = 0.4) -> dict:
+    """{문자열: [제안, …]} — 제안이 없는 문자열은 생략."""
+    result = {}
+    for text in texts:
+        found = tm.suggest(text, k, threshold)
+        if found:
+            result[text] = found
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='번역 메모리 — 비슷한 기존 번역 제안')
+    parser.add_argument('text', nargs='*', help='조회할 문자열')
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.4)
+    parser.add_argument('--batch', nargs='?', const=str(DEFAULT_BATCH), default=None)
+    parser.add_argument('--out')
+    args = parser.parse_args()
+    if not args.text and args.batch is None:
+        parser.error('조회할 문자열 또는 --batch 가 필요함')
+
+    start = time.perf_counter()
+    tm = TranslationMemory.from_config(load_config())
+    print(f"번역 메모리: 원문 {len(tm)}개 색인 ({time.perf_counter() - start:.2f}s)")
+
+    for text in args.text:
+        print(f"\n{text!r}")
+        found = tm.suggest(text, args.k, args.threshold)
+        for s in found:
+            print(f"  {s['score']:.2f}  {s['source']!r} → {s['translation']!r}  [{s['dict']}]")
+        if not found:
+            print("  (제안 없음)")
+
+    if args.batch is not None:
+        batch = Path(args.batch)
+        with open(batch, encoding='utf-8') as f:
+            data = json.load(f)
+        texts = list(data) if isinstance(data, (dict, list)) else []
+        start = time.perf_counter()
+        result = suggest_batch(tm, texts, args.k, args.threshold)
+        elapsed = time.perf_counter() - start
+        out = Path(args.out) if args.out else batch.with_name(f"{batch.stem}.suggestions.json")
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"{len(texts)}개 중 {len(result)}개에 제안 ({elapsed:.2f}s) → {out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,8 @@ output/mods/{mod_id}/mod_info.json의 gameVersion 필드를 자동으로 갱신
 사용법:
     python update_mod_version.py [--mod <mod_id>]
     기본값: starsectorkorean
+
+post_build 훅: build_mods.py 가 run(ctx) 를 같은 프로세스에서 호출.
 """
 
 import argparse
@@ -18,13 +20,8 @@ import sys
 import zipfile
 from pathlib import Path
 
-SCRIPT_DIR = Path(__file__).parent.parent
-
-
-def _resolve(p, base=SCRIPT_DIR):
-    if isinstance(p, str) and (p.startswith('./') or p.startswith('../') or p == '.'):
-        return str((base / p).resolve())
-    return p
+sys.path.insert(0, str(Path(__file__).parent))
+from patch_utils import HookContext, write_text_private
 
 
 def detect_game_version(jar_path: str) -> str:
@@ -63,24 +60,15 @@ def update_mod_info(mod_info_path: str, version: str) -> bool:
 
     mod_info['gameVersion'] = version
 
-    with open(mod_info_path, 'w', encoding='utf-8') as f:
-        json.dump(mod_info, f, indent='\t', ensure_ascii=False)
-        f.write('\n')
+    # output/mods/ 는 하드링크 스테이징 — 원본 공유 파일에 직접 쓰지 않음
+    write_text_private(mod_info_path,
+                       json.dumps(mod_info, indent='\t', ensure_ascii=False) + '\n')
 
     return True
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--mod', default='starsectorkorean', help='모드 ID')
-    args = parser.parse_args()
-    mod_id = args.mod
-
-    with open(SCRIPT_DIR / 'config.json', encoding='utf-8') as f:
-        paths = json.load(f)['paths']
-
-    game_core = _resolve(paths['game_core'])
-    output_mods = _resolve(paths['output_mods'])
+def run(ctx: HookContext):
+    game_core = ctx.path('game_core')
 
     # 버전 감지: 라이브 JAR → .bak 순서로 시도
     version = None
@@ -99,8 +87,8 @@ def main():
 
     print(f"감지된 게임 버전: {version}")
 
-    mod_info_path = os.path.join(output_mods, mod_id, 'mod_info.json')
-    if not os.path.exists(mod_info_path):
+    mod_info_path = ctx.output_dir / 'mod_info.json'
+    if not ctx.has_file('mod_info.json'):
         print(f"ERROR: mod_info.json 없음: {mod_info_path}", file=sys.stderr)
         sys.exit(1)
 
@@ -111,5 +99,12 @@ def main():
         print(f"mod_info.json 변경 없음 (이미 {version})")
 
 
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mod', default='starsectorkorean', help='모드 ID')
+    args = parser.parse_args()
+    run(HookContext.from_config(args.mod))
+
+
 if __name__ == '__main__':
     main()
@@ -19,12 +19,11 @@ class TestModFiles(BaseTestCase):
         """한국어가 포함된 JSON 파일이 _load_json_lazy로 파싱 가능.
 
         우리 파이프라인이 수정한 파일(한국어 포함)만 검사:
-          - 번역 파이프라인이 json.dump()로 재기록한 파일 → 표준 JSON
+          - 번역 파이프라인이 문자열 구간만 교체한 파일 → 원본 형식(비표준 JSON) 유지
           - patches/에서 복사한 overlay 파일 → Starsector 비표준 JSON 허용
         두 경우 모두 _load_json_lazy가 파싱 가능해야 함.
 
-        한국어가 없는 파일은 원본 게임 파일일 수 있으며, Java float 리터럴 등
-        미지원 문법을 포함할 수 있으므로 건너뜀 (파이프라인도 건드리지 않음).
+        한국어가 없는 파일은 원본 게임 파일이므로 건너뜀 (파이프라인도 건드리지 않음).
         """
         errors = []
         for f in self.output_mods.rglob('*.json'):